@@ -5,6 +5,7 @@ Flask backend API for generating BriteCo's internal employee newsletter
 
 import os
 import sys
+import importlib.util
 import json
 import html as html_mod
 import secrets
@@ -13,6 +14,7 @@ import traceback
 import requests as http_requests
 import uuid
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import pytz
@@ -20,20 +22,11 @@ import pytz
 # Chicago timezone for timestamps
 CHICAGO_TZ = pytz.timezone('America/Chicago')
 
-from flask import Flask, request, jsonify, send_from_directory, redirect, session, url_for, Response
+from flask import Flask, request, jsonify, send_from_directory, redirect, session, url_for, Response, stream_with_context
 from flask_cors import CORS
 from authlib.integrations.flask_client import OAuth
 from werkzeug.middleware.proxy_fix import ProxyFix
 
-# SendGrid for email
-try:
-    import sendgrid
-    from sendgrid.helpers.mail import Mail
-    SENDGRID_AVAILABLE = True
-except ImportError:
-    SENDGRID_AVAILABLE = False
-    print("[WARNING] SendGrid not installed. Email functionality disabled.")
-
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
@@ -43,10 +36,61 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
 # Import Claude client
 from backend.integrations.claude_client import ClaudeClient
+from backend.integrations.response_cache import ResponseCache, FirestoreResponseStore
 
 # Import BigQuery employee sync
 from backend.integrations import user_sync
 
+# Per-worker employee roster cache
+from backend.roster_cache import RosterCache, RosterIndex
+
+# Cloud clients and heavy optional modules, built on first use
+from backend.lazy_clients import LazyClient, lazy_import, client_status
+
+# Pre-compiled newsletter email templates
+from backend.email_templates import TemplateRegistry, SectionCache
+
+# SPA shell, cached and precompressed per worker
+from backend.app_shell import AppShell
+
+# Content-hashed static asset URLs
+from backend.static_assets import StaticAssets, IMMUTABLE_MAX_AGE
+
+# gzip / brotli response compression (WSGI middleware)
+from backend.compression import CompressionMiddleware
+
+# orjson-backed JSON provider
+from backend.fast_json import FastJSONProvider
+
+# Batched SendGrid delivery (personalizations + pooled session + retries)
+from backend.integrations.sendgrid_delivery import SendGridDelivery, SENDGRID_API_BASE
+
+# Background send jobs (Firestore-persisted, resumable)
+from backend.send_jobs import SendJobs
+
+# Dependency-ordered concurrent stages (auto-build fan-out)
+from backend.stage_graph import StageGraph
+
+# Indexed, paginated queries over the submission queues
+from backend.queue_queries import (query_submissions, iter_submissions, InvalidCursor,
+                                    CONTENT_TYPE_COLLECTIONS)
+
+# Draft listing from object metadata (no per-draft downloads)
+from backend.draft_index import DraftIndex
+from backend.json_blobs import upload_json, download_json
+from backend.draft_store import DraftStore, DraftConflict, DraftNotFound, InvalidPatch, diff_fields
+
+# Concurrent GCS reads for full-bucket scans
+from backend.integrations.gcs_bulk import BulkBlobReader, widen_connection_pool
+
+# Streamed (resumable) video uploads
+from backend.integrations.gcs_stream import ResumableUpload, UploadTooLarge, iter_chunks
+from backend.integrations.gcs_signing import signed_upload, sweep_signed_uploads
+
+# Image optimization in a process pool, off the request threads
+from backend.media_pipeline import (MediaJobs, output_format, rendition_url, unrendered_url,
+                                    NO_RENDITIONS, PRIMARY_WIDTH)
+
 # Import config
 from config.briteside_config import (
     EMPLOYEES as CONFIG_EMPLOYEES,
@@ -67,6 +111,8 @@ from config.briteside_config import (
 # ============================================================================
 
 app = Flask(__name__, static_folder=None)
+# jsonify / request.get_json through orjson (see backend/fast_json.py)
+app.json = FastJSONProvider(app)
 # CORS is intentionally NOT enabled app-wide: the SPA is served from the same
 # origin as the API, and wide-open CORS combined with cookie auth invites
 # cross-origin calls. Add specific trusted origins here only if a separate
@@ -75,6 +121,11 @@ app = Flask(__name__, static_folder=None)
 # Fix for running behind Cloud Run's proxy
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
+# gzip / brotli for JSON and HTML responses (see backend/compression.py).
+# Bodies under COMPRESS_MIN_BYTES aren't worth the CPU.
+app.wsgi_app = CompressionMiddleware(
+    app.wsgi_app, min_size=int(os.environ.get('COMPRESS_MIN_BYTES', '1024')))
+
 # Session configuration for OAuth
 flask_key = os.environ.get('FLASK_SECRET_KEY')
 if flask_key:
@@ -206,16 +257,26 @@ def is_editor(user):
 
 
 # ============================================================================
-# INITIALIZE CLAUDE CLIENT
+# CLOUD CLIENTS (built on first use)
 # ============================================================================
+# claude_client, gcs_client and firestore_client are LazyClients (see
+# backend/lazy_clients.py): nothing is constructed, and no credential lookup
+# or API call happens, until a request first uses one. `if not gcs_client:`
+# and gcs_client.bucket(...) work as they always did. The one-off startup work
+# that used to run here (the media bucket IAM grant, the employee seed) is the
+# bootstrap job: POST /api/jobs/bootstrap, or `flask --app app bootstrap`.
+
+def _build_claude_client():
+    # The response cache (see backend/integrations/response_cache.py): a per-
+    # worker LRU in front of the shared `ai_cache` collection. Without
+    # Firestore it's in-process only.
+    return ClaudeClient(cache=ResponseCache(
+        store=FirestoreResponseStore(firestore_client, AI_CACHE_COLLECTION) if firestore_client else None,
+        ttl=AI_CACHE_TTL_HOURS * 3600,
+    ))
 
-claude_client = None
 
-try:
-    claude_client = ClaudeClient()
-    print("[OK] Claude initialized")
-except Exception as e:
-    print(f"[WARNING] Claude not available: {e}")
+claude_client = LazyClient('Claude', _build_claude_client)
 
 
 # ============================================================================
@@ -233,59 +294,96 @@ GCS_DRAFTS_BUCKET = GCS_CONFIG['drafts_bucket']
 # bucket instead of becoming an empty bucket name — which broke media uploads
 # and skipped photo caching during the sync.
 GCS_MEDIA_BUCKET = os.environ.get('GCS_MEDIA_BUCKET') or GCS_DRAFTS_BUCKET
-gcs_client = None
+# Concurrent object reads when a whole prefix must be downloaded (draft index
+# healing / rebuild); the client's connection pool is sized to match.
+GCS_BULK_READ_WORKERS = int(os.environ.get('GCS_BULK_READ_WORKERS', '16'))
 
-try:
+
+def _build_gcs_client():
     from google.cloud import storage as gcs_storage
-    gcs_client = gcs_storage.Client()
-    print("[OK] GCS initialized")
-
-    # Grant public read ONLY on a dedicated media bucket. We never auto-grant
-    # public access on the drafts bucket (it holds drafts + employee PII), and we
-    # never re-apply a public grant the app previously forced (the old
-    # "self-healing" misconfig). When no dedicated media bucket is configured,
-    # media stays in the drafts bucket and we do NOT touch its IAM — move media
-    # to a public bucket and make the drafts bucket private to close the exposure.
-    if GCS_MEDIA_BUCKET != GCS_DRAFTS_BUCKET:
-        try:
-            _mb = gcs_client.bucket(GCS_MEDIA_BUCKET)
-            _policy = _mb.get_iam_policy(requested_policy_version=3)
-            _has_public = any(
-                b.get('role') == 'roles/storage.objectViewer' and 'allUsers' in b.get('members', set())
-                for b in _policy.bindings
-            )
-            if not _has_public:
-                _policy.bindings.append({'role': 'roles/storage.objectViewer', 'members': {'allUsers'}})
-                _mb.set_iam_policy(_policy)
-                print(f"[OK] Public read enabled on media bucket '{GCS_MEDIA_BUCKET}'")
-        except Exception as iam_err:
-            print(f"[WARNING] Could not set media bucket IAM policy: {iam_err}")
-    else:
-        print(
-            "[WARNING] GCS_MEDIA_BUCKET not set: media shares the drafts bucket. "
-            "Set a dedicated public media bucket so drafts and employee PII stay private."
+    client = gcs_storage.Client()
+    widen_connection_pool(client, GCS_BULK_READ_WORKERS)
+    return client
+
+
+gcs_client = LazyClient('GCS', _build_gcs_client)
+
+if GCS_MEDIA_BUCKET == GCS_DRAFTS_BUCKET:
+    print(
+        "[WARNING] GCS_MEDIA_BUCKET not set: media shares the drafts bucket. "
+        "Set a dedicated public media bucket so drafts and employee PII stay private."
+    )
+
+
+def ensure_media_bucket_public():
+    """Grant public read ONLY on a dedicated media bucket. Part of the
+    bootstrap job. We never auto-grant public access on the drafts bucket (it
+    holds drafts + employee PII), and we never re-apply a public grant the app
+    previously forced (the old "self-healing" misconfig). When no dedicated
+    media bucket is configured, media stays in the drafts bucket and we do NOT
+    touch its IAM — move media to a public bucket and make the drafts bucket
+    private to close the exposure.
+
+    Returns 'granted', 'already public', 'skipped' or 'failed'."""
+    if GCS_MEDIA_BUCKET == GCS_DRAFTS_BUCKET:
+        return 'skipped'
+    if not gcs_client:
+        return 'failed'
+    try:
+        bucket = gcs_client.bucket(GCS_MEDIA_BUCKET)
+        policy = bucket.get_iam_policy(requested_policy_version=3)
+        has_public = any(
+            b.get('role') == 'roles/storage.objectViewer' and 'allUsers' in b.get('members', set())
+            for b in policy.bindings
         )
-except Exception as e:
-    print(f"[WARNING] GCS not available: {e}")
+        if has_public:
+            return 'already public'
+        policy.bindings.append({'role': 'roles/storage.objectViewer', 'members': {'allUsers'}})
+        bucket.set_iam_policy(policy)
+        print(f"[OK] Public read enabled on media bucket '{GCS_MEDIA_BUCKET}'")
+        return 'granted'
+    except Exception as iam_err:
+        print(f"[WARNING] Could not set media bucket IAM policy: {iam_err}")
+        return 'failed'
 
 
 # ============================================================================
 # EMPLOYEE DATA LAYER (Firestore-backed)
 # ============================================================================
 # Single source of truth. Each employee is one doc in the `employees`
-# collection, keyed by lowercased email. No in-memory cache — every read
-# hits Firestore so multi-instance Cloud Run stays consistent.
+# collection, keyed by lowercased email. Roster-wide reads (list_employees) go
+# through a per-worker RosterCache kept fresh by a Firestore listener, falling
+# back to TTL + version-stamp polling (see backend/roster_cache.py), so
+# multi-instance Cloud Run stays consistent without a collection scan per
+# request. Single-record reads (get_employee) always hit Firestore.
 
 EMPLOYEES_COLLECTION = 'employees'
 EMPLOYEES_GCS_KEY = 'config/employees.json'  # kept only for initial seed
+ROSTER_VERSION_DOC = ('app_config', 'roster_version')
+ROSTER_CACHE_TTL = float(os.environ.get('ROSTER_CACHE_TTL', '30'))  # seconds
+# Set ROSTER_CACHE_LISTEN=false to force polling (e.g. where gRPC streaming
+# is blocked).
+ROSTER_CACHE_LISTEN = os.environ.get('ROSTER_CACHE_LISTEN', 'true').lower() != 'false'
 
-firestore_client = None
-try:
+def _build_firestore_client():
     from google.cloud import firestore
-    firestore_client = firestore.Client()
-    print("[OK] Firestore initialized")
-except Exception as e:
-    print(f"[WARNING] Firestore not available: {e}")
+    return firestore.Client()
+
+
+firestore_client = LazyClient('Firestore', _build_firestore_client)
+
+# Only used behind a firestore_client check, which builds the client first;
+# the cache itself does no I/O until its first read.
+roster_cache = RosterCache(
+    firestore_client, EMPLOYEES_COLLECTION,
+    version_doc=ROSTER_VERSION_DOC,
+    ttl=ROSTER_CACHE_TTL,
+    listen=ROSTER_CACHE_LISTEN,
+)
+
+# Claude response cache settings (the cache is attached in _build_claude_client).
+AI_CACHE_COLLECTION = 'ai_cache'
+AI_CACHE_TTL_HOURS = float(os.environ.get('AI_CACHE_TTL_HOURS', '168'))
 
 
 def _emp_key(email):
@@ -293,18 +391,18 @@ def _emp_key(email):
 
 
 def list_employees(strict=False):
-    """Return all employees sorted by name (case-insensitive).
-
-    On a Firestore error: raise DataUnavailable when strict=True (so read
-    endpoints can return 503 rather than an empty roster that reads as "no
-    employees"); otherwise return [] so internal callers degrade gracefully."""
+    """Return all employees sorted by name (case-insensitive), from the
+    per-worker roster cache. The dicts are shared with the cache: read them,
+    don't edit them (use get_employee for a record you mean to change).
+
+    On a Firestore error with no cached roster to fall back on: raise
+    DataUnavailable when strict=True (so read endpoints can return 503 rather
+    than an empty roster that reads as "no employees"); otherwise return [] so
+    internal callers degrade gracefully."""
     if not firestore_client:
         return list(CONFIG_EMPLOYEES)
     try:
-        docs = firestore_client.collection(EMPLOYEES_COLLECTION).stream()
-        employees = [doc.to_dict() for doc in docs if doc.exists]
-        employees.sort(key=lambda e: (e.get('name') or '').lower())
-        return employees
+        return roster_cache.get()
     except Exception as e:
         print(f"[WARNING] Firestore list failed: {e}")
         if strict:
@@ -312,6 +410,27 @@ def list_employees(strict=False):
         return []
 
 
+_config_roster_index = None
+
+
+def roster_index(strict=False):
+    """Month-keyed birthday/anniversary index over the roster, rebuilt only
+    when the cached roster snapshot changes. Errors behave like
+    list_employees (DataUnavailable when strict, else an empty index)."""
+    global _config_roster_index
+    if not firestore_client:
+        if _config_roster_index is None:
+            _config_roster_index = RosterIndex(CONFIG_EMPLOYEES)
+        return _config_roster_index
+    try:
+        return roster_cache.derived('month_index', RosterIndex)
+    except Exception as e:
+        print(f"[WARNING] Roster index unavailable: {e}")
+        if strict:
+            raise DataUnavailable("Employee directory is temporarily unavailable") from e
+        return RosterIndex([])
+
+
 def get_employee(email):
     if not firestore_client:
         return None
@@ -328,6 +447,7 @@ def upsert_employee(email, data):
         return False
     try:
         firestore_client.collection(EMPLOYEES_COLLECTION).document(_emp_key(email)).set(data)
+        roster_cache.bump()
         return True
     except Exception as e:
         print(f"[WARNING] Firestore upsert failed: {e}")
@@ -339,6 +459,7 @@ def delete_employee(email):
         return False
     try:
         firestore_client.collection(EMPLOYEES_COLLECTION).document(_emp_key(email)).delete()
+        roster_cache.bump()
         return True
     except Exception as e:
         print(f"[WARNING] Firestore delete failed: {e}")
@@ -352,7 +473,7 @@ def _seed_from_gcs_or_config():
             bucket = gcs_client.bucket(GCS_DRAFTS_BUCKET)
             blob = bucket.blob(EMPLOYEES_GCS_KEY)
             if blob.exists():
-                raw = json.loads(blob.download_as_text())
+                raw = download_json(blob)
                 if isinstance(raw, dict) and 'employees' in raw:
                     return raw['employees']
                 if isinstance(raw, list):
@@ -364,16 +485,18 @@ def _seed_from_gcs_or_config():
 
 def seed_employees_if_empty():
     """If the Firestore collection is empty, populate it from GCS (preferred)
-    or from the config defaults. Runs once on startup."""
+    or from the config defaults. Part of the bootstrap job. Returns the number
+    of employees written (0 when already seeded), or None if Firestore is
+    unavailable or the check failed."""
     if not firestore_client:
-        return
+        return None
     try:
         existing = list(firestore_client.collection(EMPLOYEES_COLLECTION).limit(1).stream())
         if existing:
-            return
+            return 0
     except Exception as e:
         print(f"[WARNING] Could not check Firestore seed state: {e}")
-        return
+        return None
 
     seed = _seed_from_gcs_or_config()
     print(f"[SEED] Populating Firestore with {len(seed)} employees...")
@@ -388,10 +511,25 @@ def seed_employees_if_empty():
         written += 1
     if written:
         batch.commit()
+        roster_cache.bump()
     print(f"[SEED] Seeded {written} employees into Firestore")
+    return written
 
 
-seed_employees_if_empty()
+def run_bootstrap():
+    """The one-shot setup that used to run on every worker start: the media
+    bucket's public-read grant and the first-run employee seed. Both are
+    idempotent, so running it again (every deploy, say) is harmless."""
+    return {
+        'media_bucket_iam': ensure_media_bucket_public(),
+        'employees_seeded': seed_employees_if_empty(),
+    }
+
+
+@app.cli.command('bootstrap')
+def bootstrap_command():
+    """Run the one-shot setup (media bucket IAM, employee seed)."""
+    print(f"[BOOTSTRAP] {run_bootstrap()}")
 
 
 # ============================================================================
@@ -442,6 +580,16 @@ def safe_url(url):
     return ''
 
 
+# Email images are picked for 2x displays (most phones and laptops): a slot
+# `px` CSS pixels wide gets the smallest rendition at least twice that.
+EMAIL_IMAGE_DENSITY = 2
+
+
+def email_image_url(url, slot_px):
+    """The rendition of an uploaded image to send in a slot_px-wide email slot."""
+    return rendition_url(url, EMAIL_IMAGE_DENSITY * slot_px)
+
+
 def _as_bday_int(value):
     """Coerce a birthday month/day to a plain int, mapping null / '' / bad input
     to 0 (= unknown). Guards the birthdays endpoint against a TypeError when a
@@ -535,12 +683,13 @@ def _auth_gate():
 
     if path.startswith('/api/'):
         # Contributor-accessible surface: any signed-in @brite.co user.
-        # (upload-media is shared so contributors can attach files to
-        # submissions and feed posts; og-preview powers feed link cards and is
+        # (upload-media, the direct-upload pair and the media/status poll are
+        # shared so contributors can attach files to submissions and feed posts; og-preview powers feed link cards and is
         # SSRF-guarded by _safe_fetch; /api/feed/* and /api/directory do their
         # own editor checks internally where needed.)
         if (path == '/api/me' or path.startswith('/api/me/')
                 or path.startswith('/api/submit') or path == '/api/upload-media'
+                or path in ('/api/media/status', '/api/media/upload-url', '/api/media/finalize')
                 or path.startswith('/api/feed/') or path == '/api/directory'
                 or path == '/api/media/og-preview'):
             return
@@ -637,6 +786,25 @@ def auth_logout():
 # ROUTES - STATIC FILES & HEALTH
 # ============================================================================
 
+# Files under static/ are content-hashed once per worker; the shell and the
+# email templates reference them by fingerprinted, immutable URLs (see
+# backend/static_assets.py).
+static_assets = StaticAssets(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'),
+    log=safe_print,
+)
+
+# The SPA shell is read once per worker and served gzip-spliced around the
+# per-user script (see backend/app_shell.py). In local dev (FLASK_DEBUG=true)
+# edits to index.html are picked up by mtime without a restart.
+app_shell = AppShell(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'index.html'),
+    hot_reload=os.environ.get('FLASK_DEBUG', 'false').lower() == 'true',
+    transform=static_assets.rewrite,
+    log=safe_print,
+)
+
+
 def _serve_app(entry_mode=False):
     """Serve the SPA. '/' is the newsletter builder; '/entry' shows the
     submission form. Auth is enforced by the _auth_gate before_request."""
@@ -644,12 +812,6 @@ def _serve_app(entry_mode=False):
     if not user:
         return redirect('/auth/login')
 
-    try:
-        with open('index.html', 'r', encoding='utf-8') as f:
-            html = f.read()
-    except FileNotFoundError:
-        return 'index.html not found', 404
-
     auth_user = {
         'email': user.get('email', ''),
         'name': user.get('name', ''),
@@ -660,10 +822,17 @@ def _serve_app(entry_mode=False):
         '<script>\n'
         '    window.AUTH_USER = ' + json.dumps(auth_user) + ';\n'
         '    window.SUBMIT_ENTRY_MODE = ' + ('true' if entry_mode else 'false') + ';\n'
-        '    </script>\n</head>'
+        '    </script>\n'
     )
-    html = html.replace('</head>', user_script, 1)
-    return Response(html, mimetype='text/html')
+    try:
+        body, encoding = app_shell.render(user_script, gzip=request.accept_encodings.quality('gzip') > 0)
+    except FileNotFoundError:
+        return 'index.html not found', 404
+    response = Response(body, mimetype='text/html')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 @app.route('/')
@@ -681,13 +850,20 @@ def serve_entry():
 
 @app.route('/health')
 def health_check():
-    """Simple health check endpoint"""
+    """Simple health check endpoint. Reports on the cloud clients without
+    building them: a client no request has used yet is "not initialized"
+    (claude_available is null until then)."""
+    claude = client_status(claude_client)
     return jsonify({
         "status": "healthy",
         "app": "The BriteSide - Internal Newsletter",
         "timestamp": datetime.now(CHICAGO_TZ).isoformat(),
-        "claude_available": claude_client is not None,
-        "sendgrid_available": SENDGRID_AVAILABLE,
+        "claude_available": None if claude == 'not initialized' else claude == 'ready',
+        "sendgrid_configured": bool(_sendgrid_api_key()),
+        "clients": {"claude": claude, "gcs": client_status(gcs_client),
+                    "firestore": client_status(firestore_client)},
+        "roster_cache": roster_cache.stats() if client_status(firestore_client) == 'ready' else None,
+        "ai_cache": claude_client.cache.stats() if claude == 'ready' and claude_client.cache else None,
     })
 
 
@@ -730,22 +906,8 @@ def get_birthdays():
         if not month or month < 1 or month > 12:
             return jsonify({"success": False, "error": "Valid month parameter (1-12) required"}), 400
 
-        birthday_employees = [
-            {
-                "name": emp.get("name", ""),
-                "email": emp.get("email", ""),
-                "department": emp.get("department", ""),
-                "title": emp.get("title", ""),
-                "birthday_day": _as_bday_int(emp.get("birthday_day")),
-                "birthday_month": _as_bday_int(emp.get("birthday_month")),
-                "image_url": emp.get("photo_url", ""),
-            }
-            for emp in list_employees(strict=True)
-            if _as_bday_int(emp.get("birthday_month")) == month and emp.get("active", True)
-        ]
-
-        # Sort by day of month (values coerced to int above, so no None/str crash)
-        birthday_employees.sort(key=lambda x: x["birthday_day"])
+        # Day-sorted, with month/day already coerced to int by the index.
+        birthday_employees = roster_index(strict=True).birthdays(month)
 
         month_name = MONTH_NAMES.get(month, str(month))
         safe_print(f"[API] Found {len(birthday_employees)} birthdays in {month_name}")
@@ -778,24 +940,7 @@ def get_anniversaries():
             return jsonify({"success": False, "error": "Valid month parameter (1-12) required"}), 400
 
         current_year = datetime.now(CHICAGO_TZ).year
-        anniversary_employees = []
-        for emp in list_employees(strict=True):
-            if _as_bday_int(emp.get("anniversary_month")) != month or not emp.get("active", True):
-                continue
-            yr = _as_bday_int(emp.get("anniversary_year"))
-            anniversary_employees.append({
-                "name": emp.get("name", ""),
-                "email": emp.get("email", ""),
-                "department": emp.get("department", ""),
-                "title": emp.get("title", ""),
-                "anniversary_day": _as_bday_int(emp.get("anniversary_day")),
-                "anniversary_month": _as_bday_int(emp.get("anniversary_month")),
-                "anniversary_year": yr,
-                "years": (current_year - yr) if yr else 0,
-                "image_url": emp.get("photo_url", ""),
-            })
-
-        anniversary_employees.sort(key=lambda x: x["anniversary_day"])
+        anniversary_employees = roster_index(strict=True).anniversaries(month, current_year)
         month_name = MONTH_NAMES.get(month, str(month))
         safe_print(f"[API] Found {len(anniversary_employees)} anniversaries in {month_name}")
         return jsonify({
@@ -1003,6 +1148,103 @@ def set_editor():
 # ROUTES - AI GENERATION
 # ============================================================================
 
+class AIRequestError(Exception):
+    """Bad input to an AI endpoint; carries the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+# Each _prepare_* takes the request JSON and returns (generate kwargs, finish):
+# the kwargs go to ClaudeClient.generate_content / stream_content, and
+# finish(response) turns the model output into the endpoint's own fields.
+# The JSON endpoints and their /api/stream/* twins share them.
+#
+# Spotlight, rewrite and game completions are served from the response cache
+# for identical inputs; send "cache": "bypass" to force a fresh one. Jokes are
+# never cached (variety is the point of regenerating them).
+
+def _prepare_joke(data):
+    month = data.get('month', datetime.now(CHICAGO_TZ).strftime('%B'))
+    theme = data.get('theme', 'jewelry and insurance')
+
+    safe_print(f"[API] Generating jokes for {month}, theme: {theme}")
+
+    prompt = AI_PROMPTS['generate_joke'].format(month=month, theme=theme)
+
+    def finish(response):
+        return {"jokes": response.get('content', '').strip()}
+
+    return dict(prompt=prompt, max_tokens=400, temperature=0.85), finish
+
+
+def _prepare_spotlight(data):
+    name = data.get('name', '')
+    fun_facts = data.get('fun_facts', '')
+
+    if not name:
+        raise AIRequestError("Employee name is required")
+
+    # Look up employee in the EMPLOYEES list
+    employee = find_employee(name)
+    if not employee:
+        raise AIRequestError(f"Employee '{name}' not found", 404)
+
+    safe_print(f"[API] Generating spotlight for {employee['name']} ({employee['department']})")
+
+    prompt = AI_PROMPTS['generate_spotlight'].format(
+        name=employee['name'],
+        title=employee['title'],
+        department=employee['department'],
+        fun_facts=fun_facts if fun_facts else 'No fun facts provided',
+    )
+
+    def finish(response):
+        return {
+            "spotlight": response.get('content', '').strip(),
+            "employee": {
+                "name": employee['name'],
+                "title": employee['title'],
+                "department": employee['department'],
+            },
+        }
+
+    return dict(prompt=prompt, max_tokens=300, temperature=0.7,
+                cache=True, fresh=data.get('cache') == 'bypass'), finish
+
+
+def _prepare_rewrite(data):
+    content = data.get('content', '')
+    tone = data.get('tone', 'fun and punny')
+
+    if not content:
+        raise AIRequestError("Content is required")
+
+    safe_print(f"[API] Rewriting content ({len(content)} chars, tone: {tone})")
+
+    prompt = (
+        f"Rewrite the following text in a {tone} tone, keeping the same meaning and key information.\n\n"
+        f"Original text:\n{content}\n\n"
+        f"Requirements:\n"
+        f"- Maintain the core message and facts\n"
+        f"- Apply the requested tone consistently\n"
+        f"- Keep it concise — aim for 2-3 sentences max, no filler\n"
+        f"- Return ONLY the rewritten text, nothing else"
+    )
+
+    def finish(response):
+        rewritten = response.get('content', content).strip()
+        return {
+            "rewritten": rewritten,
+            "original_length": len(content),
+            "rewritten_length": len(rewritten),
+        }
+
+    return dict(prompt=prompt, max_tokens=500, temperature=0.7,
+                cache=True, fresh=data.get('cache') == 'bypass'), finish
+
+
 @app.route('/api/generate-joke', methods=['POST'])
 def generate_joke():
     """Generate 3 joke/pun options for the newsletter opener"""
@@ -1010,32 +1252,23 @@ def generate_joke():
         if not claude_client:
             return jsonify({"success": False, "error": "Claude AI is not available"}), 503
 
-        data = request.json
-        month = data.get('month', datetime.now(CHICAGO_TZ).strftime('%B'))
-        theme = data.get('theme', 'jewelry and insurance')
-
-        safe_print(f"[API] Generating jokes for {month}, theme: {theme}")
+        generate, finish = _prepare_joke(request.json)
 
-        prompt = AI_PROMPTS['generate_joke'].format(month=month, theme=theme)
-
-        response = claude_client.generate_content(
-            prompt=prompt,
-            system_prompt=BRITESIDE_SYSTEM_PROMPT,
-            max_tokens=400,
-            temperature=0.85,
-        )
+        response = claude_client.generate_content(system_prompt=BRITESIDE_SYSTEM_PROMPT, **generate)
 
-        jokes_text = response.get('content', '').strip()
+        fields = finish(response)
 
         safe_print(f"[API] Jokes generated ({response.get('tokens', 0)} tokens, {response.get('latency_ms', 0)}ms)")
 
         return jsonify({
             "success": True,
-            "jokes": jokes_text,
+            **fields,
             "model": response.get('model', ''),
             "tokens": response.get('tokens', 0),
             "cost_estimate": response.get('cost_estimate', ''),
             "latency_ms": response.get('latency_ms', 0),
+            "cached": response.get('cached', False),
+            "cost_saved": response.get('cost_saved', '$0.0000'),
         })
 
     except Exception as e:
@@ -1051,52 +1284,27 @@ def generate_spotlight():
         if not claude_client:
             return jsonify({"success": False, "error": "Claude AI is not available"}), 503
 
-        data = request.json
-        name = data.get('name', '')
-        fun_facts = data.get('fun_facts', '')
-
-        if not name:
-            return jsonify({"success": False, "error": "Employee name is required"}), 400
-
-        # Look up employee in the EMPLOYEES list
-        employee = find_employee(name)
-        if not employee:
-            return jsonify({"success": False, "error": f"Employee '{name}' not found"}), 404
-
-        safe_print(f"[API] Generating spotlight for {employee['name']} ({employee['department']})")
-
-        prompt = AI_PROMPTS['generate_spotlight'].format(
-            name=employee['name'],
-            title=employee['title'],
-            department=employee['department'],
-            fun_facts=fun_facts if fun_facts else 'No fun facts provided',
-        )
+        generate, finish = _prepare_spotlight(request.json)
 
-        response = claude_client.generate_content(
-            prompt=prompt,
-            system_prompt=BRITESIDE_SYSTEM_PROMPT,
-            max_tokens=300,
-            temperature=0.7,
-        )
+        response = claude_client.generate_content(system_prompt=BRITESIDE_SYSTEM_PROMPT, **generate)
 
-        spotlight_text = response.get('content', '').strip()
+        fields = finish(response)
 
         safe_print(f"[API] Spotlight generated ({response.get('tokens', 0)} tokens, {response.get('latency_ms', 0)}ms)")
 
         return jsonify({
             "success": True,
-            "spotlight": spotlight_text,
-            "employee": {
-                "name": employee['name'],
-                "title": employee['title'],
-                "department": employee['department'],
-            },
+            **fields,
             "model": response.get('model', ''),
             "tokens": response.get('tokens', 0),
             "cost_estimate": response.get('cost_estimate', ''),
             "latency_ms": response.get('latency_ms', 0),
+            "cached": response.get('cached', False),
+            "cost_saved": response.get('cost_saved', '$0.0000'),
         })
 
+    except AIRequestError as e:
+        return jsonify({"success": False, "error": str(e)}), e.status
     except Exception as e:
         safe_print(f"[API] Error generating spotlight: {e}")
         traceback.print_exc()
@@ -1110,47 +1318,27 @@ def rewrite_content():
         if not claude_client:
             return jsonify({"success": False, "error": "Claude AI is not available"}), 503
 
-        data = request.json
-        content = data.get('content', '')
-        tone = data.get('tone', 'fun and punny')
-
-        if not content:
-            return jsonify({"success": False, "error": "Content is required"}), 400
-
-        safe_print(f"[API] Rewriting content ({len(content)} chars, tone: {tone})")
-
-        prompt = (
-            f"Rewrite the following text in a {tone} tone, keeping the same meaning and key information.\n\n"
-            f"Original text:\n{content}\n\n"
-            f"Requirements:\n"
-            f"- Maintain the core message and facts\n"
-            f"- Apply the requested tone consistently\n"
-            f"- Keep it concise — aim for 2-3 sentences max, no filler\n"
-            f"- Return ONLY the rewritten text, nothing else"
-        )
+        generate, finish = _prepare_rewrite(request.json)
 
-        response = claude_client.generate_content(
-            prompt=prompt,
-            system_prompt=BRITESIDE_SYSTEM_PROMPT,
-            max_tokens=500,
-            temperature=0.7,
-        )
+        response = claude_client.generate_content(system_prompt=BRITESIDE_SYSTEM_PROMPT, **generate)
 
-        rewritten = response.get('content', content).strip()
+        fields = finish(response)
 
         safe_print(f"[API] Content rewritten ({response.get('tokens', 0)} tokens, {response.get('latency_ms', 0)}ms)")
 
         return jsonify({
             "success": True,
-            "rewritten": rewritten,
-            "original_length": len(content),
-            "rewritten_length": len(rewritten),
+            **fields,
             "model": response.get('model', ''),
             "tokens": response.get('tokens', 0),
             "cost_estimate": response.get('cost_estimate', ''),
             "latency_ms": response.get('latency_ms', 0),
+            "cached": response.get('cached', False),
+            "cost_saved": response.get('cost_saved', '$0.0000'),
         })
 
+    except AIRequestError as e:
+        return jsonify({"success": False, "error": str(e)}), e.status
     except Exception as e:
         safe_print(f"[API] Error rewriting content: {e}")
         traceback.print_exc()
@@ -1166,27 +1354,32 @@ ALLOWED_VIDEO_TYPES = {'video/mp4', 'video/quicktime', 'video/webm'}
 MAX_IMAGE_SIZE = 10 * 1024 * 1024   # 10MB
 MAX_VIDEO_SIZE = 50 * 1024 * 1024   # 50MB
 MAX_GIF_SIZE = 3 * 1024 * 1024      # 3MB hard cap for GIFs (no resize)
+MEDIA_SNIFF_BYTES = 2048             # what _detect_mime looks at
+# Resumable-upload chunk for streamed videos: the most an upload holds in
+# memory. Must be a multiple of 256KiB.
+MEDIA_UPLOAD_CHUNK = int(os.environ.get('MEDIA_UPLOAD_CHUNK_KB', '2048')) * 1024
+
+# Pillow + python-magic for the media section pipeline. Neither is imported at
+# startup: backend/media_pipeline.py imports Pillow inside its render calls,
+# and python-magic (which loads libmagic) loads on the first upload.
+PIL_AVAILABLE = importlib.util.find_spec('PIL') is not None
+if not PIL_AVAILABLE:
+    print("[WARNING] Pillow not available: not installed")
 
-# Pillow + python-magic for the media section pipeline
-try:
-    from PIL import Image
-    import io as _io
-    PIL_AVAILABLE = True
-except Exception as _pil_err:
-    PIL_AVAILABLE = False
-    print(f"[WARNING] Pillow not available: {_pil_err}")
+_magic = lazy_import('python-magic', 'magic')
 
-try:
-    import magic as _magic
-    MAGIC_AVAILABLE = True
-except Exception as _magic_err:
-    MAGIC_AVAILABLE = False
-    print(f"[WARNING] python-magic not available: {_magic_err}")
+# Pillow processes per worker that render image renditions (see
+# backend/media_pipeline.py). 0 renders inline on the request thread.
+MEDIA_PROCESS_WORKERS = int(os.environ.get('MEDIA_PROCESS_WORKERS', '2'))
+media_jobs = None
+if PIL_AVAILABLE:
+    media_jobs = MediaJobs(lambda: gcs_client.bucket(GCS_MEDIA_BUCKET),
+                           processes=MEDIA_PROCESS_WORKERS, log=safe_print)
 
 
 def _detect_mime(file_bytes):
     """Detect MIME from magic bytes. Returns content-type header as fallback."""
-    if MAGIC_AVAILABLE:
+    if _magic:
         try:
             return _magic.from_buffer(file_bytes[:2048], mime=True)
         except Exception:
@@ -1194,62 +1387,108 @@ def _detect_mime(file_bytes):
     return None
 
 
-def _optimize_image(file_bytes, detected_mime):
-    """Resize static images to max 1200x800, strip EXIF, re-encode.
-    GIFs are passed through untouched (to preserve animation).
-    Returns (processed_bytes, output_mime, ext).
-    """
-    if not PIL_AVAILABLE:
-        return file_bytes, detected_mime, None
-
-    if detected_mime == 'image/gif':
-        return file_bytes, 'image/gif', '.gif'
-
+def _read_up_to(stream, limit, data=b''):
+    """Read from `stream` until `limit` more bytes or EOF (one read() may
+    return less than asked for on a socket)."""
+    data = bytearray(data)
+    want = len(data) + limit
+    while len(data) < want:
+        chunk = stream.read(min(want - len(data), 1024 * 1024))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+
+def _stream_video(stream, head, detected, filename, month_prefix, too_large):
+    """Stream a video body into a resumable upload session, MEDIA_UPLOAD_CHUNK
+    at a time, cancelling it past MAX_VIDEO_SIZE."""
+    final_ext = os.path.splitext(filename)[1].lower() or '.mp4'
+    unique_name = f"{uuid.uuid4().hex}{final_ext}"
+    blob_path = f"media/{month_prefix}/{unique_name}"
+    blob = gcs_client.bucket(GCS_MEDIA_BUCKET).blob(blob_path)
+    session_url = blob.create_resumable_upload_session(content_type=detected)
+    upload = ResumableUpload(session_url, chunk_size=MEDIA_UPLOAD_CHUNK)
     try:
-        img = Image.open(_io.BytesIO(file_bytes))
-        img.load()
-        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        stored = upload.upload(iter_chunks(stream, head), max_size=MAX_VIDEO_SIZE)
+    except UploadTooLarge:
+        return jsonify({'success': False, 'error': too_large}), 400
+    size = int(stored.get('size') or upload.offset)
+    safe_print(f"[MEDIA] Streamed {blob_path} ({size} bytes)")
+    return jsonify({
+        'success': True,
+        'url': f"https://storage.googleapis.com/{GCS_MEDIA_BUCKET}/{blob_path}",
+        'filename': unique_name,
+        'type': 'video',
+        'size': size,
+        'original_size': size,
+        'mime': detected,
+    })
 
-        # Resize if larger than 1200x800 (preserve aspect)
-        max_w, max_h = 1200, 800
-        if img.width > max_w or img.height > max_h:
-            img.thumbnail((max_w, max_h), Image.LANCZOS)
 
-        out = _io.BytesIO()
-        if has_alpha:
-            img.save(out, format='PNG', optimize=True)
-            return out.getvalue(), 'image/png', '.png'
-        else:
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            img.save(out, format='JPEG', quality=85, optimize=True, progressive=True)
-            return out.getvalue(), 'image/jpeg', '.jpg'
-    except Exception as e:
-        safe_print(f"[MEDIA] Pillow optimize failed, using original: {e}")
-        return file_bytes, detected_mime, None
+def _publish_renditions(month_prefix, media_id, rendition_format, detected, original_size,
+                        data=None, source=None):
+    """Render one image's rendition set under media/{month}/{id}/. With the
+    process pool, answer now (202, pending) with the primary's URL and let
+    the builder poll /api/media/status; without it, render inline. `source`
+    is a signed upload to read the image from (and delete afterwards)."""
+    final_mime, final_ext = rendition_format
+    prefix = f"media/{month_prefix}/{media_id}"
+    blob_path = f"{prefix}/{PRIMARY_WIDTH}{final_ext}"
+    result = {
+        'success': True,
+        'url': f"https://storage.googleapis.com/{GCS_MEDIA_BUCKET}/{blob_path}",
+        'path': blob_path,
+        'filename': f"{media_id}/{PRIMARY_WIDTH}{final_ext}",
+        'type': 'image',
+        'original_size': original_size,
+        'mime': final_mime,
+    }
+    if media_jobs.processes:
+        media_jobs.submit(prefix, final_ext, data, detected, source)
+        return jsonify(dict(result, pending=True)), 202
+    result['size'], rendered = media_jobs.publish(prefix, final_ext, data, detected, source)
+    if not rendered:
+        result.update(url=unrendered_url(result['url'], NO_RENDITIONS), mime=detected)
+    return jsonify(result)
 
 
 @app.route('/api/upload-media', methods=['POST'])
 def upload_media():
     """Upload an image, gif, or video to GCS and return its public URL.
-    Images are auto-resized and re-encoded via Pillow; GIFs are capped at
-    3MB and passed through untouched; videos are stored as-is."""
+    Static images become a rendition set (media/{yyyy-mm}/{id}/, see
+    backend/media_pipeline.py) and the URL is its 1200px primary. With the
+    media process pool the answer is 202 with pending: true until the set
+    lands (poll /api/media/status). GIFs are capped at 3MB and passed through
+    untouched; videos are streamed to GCS as-is (see _stream_video).
+
+    Takes multipart form data ('file') or, from the builder, the raw file as
+    the body with ?filename=; only the raw body streams end to end."""
     if not gcs_client:
         return jsonify({'success': False, 'error': 'GCS not available'}), 503
     try:
-        if 'file' not in request.files:
-            return jsonify({'success': False, 'error': 'No file provided'}), 400
-
-        file = request.files['file']
-        if not file.filename:
-            return jsonify({'success': False, 'error': 'Empty filename'}), 400
-
-        file_data = file.read()
-        if not file_data:
+        if request.mimetype == 'multipart/form-data':
+            if 'file' not in request.files:
+                return jsonify({'success': False, 'error': 'No file provided'}), 400
+            file = request.files['file']
+            if not file.filename:
+                return jsonify({'success': False, 'error': 'Empty filename'}), 400
+            stream, filename, client_type = file.stream, file.filename, file.content_type
+        else:
+            # Raw body (the builder's uploader): read straight off the socket,
+            # never parsed into a form or spooled to /tmp (memory on Cloud Run).
+            filename = request.args.get('filename') or ''
+            stream, client_type = request.stream, request.mimetype
+            if (request.content_length or 0) > MAX_VIDEO_SIZE:
+                limit_mb = MAX_VIDEO_SIZE // (1024 * 1024)
+                return jsonify({'success': False, 'error': f'File too large. Max {limit_mb}MB.'}), 400
+
+        head = _read_up_to(stream, MEDIA_SNIFF_BYTES)
+        if not head:
             return jsonify({'success': False, 'error': 'Empty file'}), 400
 
         # Prefer magic-bytes detection over client-supplied content type
-        detected = _detect_mime(file_data) or (file.content_type or '')
+        detected = _detect_mime(head) or (client_type or '')
         is_image = detected in ALLOWED_IMAGE_TYPES
         is_video = detected in ALLOWED_VIDEO_TYPES
         is_gif = detected == 'image/gif'
@@ -1257,27 +1496,35 @@ def upload_media():
         if not is_image and not is_video:
             return jsonify({'success': False, 'error': f'Unsupported file type: {detected}'}), 400
 
-        # Size gates
-        if is_gif and len(file_data) > MAX_GIF_SIZE:
-            return jsonify({'success': False, 'error': f'GIF too large. Max {MAX_GIF_SIZE // (1024*1024)}MB.'}), 400
-        max_size = MAX_IMAGE_SIZE if is_image else MAX_VIDEO_SIZE
+        # Size gates, enforced as the body is read
+        max_size = MAX_GIF_SIZE if is_gif else (MAX_IMAGE_SIZE if is_image else MAX_VIDEO_SIZE)
+        too_large = (f'GIF too large. Max {MAX_GIF_SIZE // (1024*1024)}MB.' if is_gif
+                     else f'File too large. Max {max_size // (1024 * 1024)}MB.')
+
+        month_prefix = datetime.now(CHICAGO_TZ).strftime('%Y-%m')
+
+        if is_video:
+            return _stream_video(stream, head, detected, filename, month_prefix, too_large)
+
+        # Images are decoded whole anyway (and capped at 10MB): read the rest
+        file_data = _read_up_to(stream, max_size + 1 - len(head), head)
         if len(file_data) > max_size:
-            limit_mb = max_size // (1024 * 1024)
-            return jsonify({'success': False, 'error': f'File too large. Max {limit_mb}MB.'}), 400
+            return jsonify({'success': False, 'error': too_large}), 400
+
+        media_type = 'gif' if is_gif else 'image'
+
+        # Static images: render the rendition set (see _publish_renditions).
+        rendition_format = None
+        if media_jobs and is_image and not is_gif:
+            rendition_format = output_format(file_data)
+        if rendition_format:
+            return _publish_renditions(month_prefix, uuid.uuid4().hex, rendition_format,
+                                       detected, len(file_data), data=file_data)
 
-        # Pillow optimize for static images (not gifs, not videos)
         final_data = file_data
         final_mime = detected
-        final_ext = None
-        if is_image and not is_gif:
-            final_data, final_mime, final_ext = _optimize_image(file_data, detected)
+        final_ext = os.path.splitext(filename)[1].lower() or '.jpg'
 
-        if not final_ext:
-            final_ext = os.path.splitext(file.filename)[1].lower()
-            if not final_ext:
-                final_ext = '.jpg' if is_image else '.mp4'
-
-        month_prefix = datetime.now(CHICAGO_TZ).strftime('%Y-%m')
         unique_name = f"{uuid.uuid4().hex}{final_ext}"
         blob_path = f"media/{month_prefix}/{unique_name}"
 
@@ -1292,7 +1539,7 @@ def upload_media():
             'success': True,
             'url': public_url,
             'filename': unique_name,
-            'type': 'gif' if is_gif else ('image' if is_image else 'video'),
+            'type': media_type,
             'size': len(final_data),
             'original_size': len(file_data),
             'mime': final_mime,
@@ -1304,6 +1551,169 @@ def upload_media():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/media/status')
+def media_status():
+    """Poll a pending upload: ready once the optimized object is in the bucket,
+    failed only while it isn't and this worker saw the job fail."""
+    if not gcs_client:
+        return jsonify({'success': False, 'error': 'GCS not available'}), 503
+    path = _validate_gcs_key(request.args.get('path'), ('media/',))
+    if not path:
+        return jsonify({'success': False, 'error': 'Invalid path'}), 400
+    try:
+        # The object is the truth: a failed duplicate job doesn't undo a
+        # rendition set that did land.
+        blob = gcs_client.bucket(GCS_MEDIA_BUCKET).get_blob(path)
+        if blob is None:
+            error = media_jobs.failure(path) if media_jobs else None
+            if error:
+                return jsonify({'success': False, 'status': 'failed', 'error': error}), 500
+            return jsonify({'success': True, 'status': 'processing'})
+        return jsonify({
+            'success': True,
+            'status': 'ready',
+            'url': unrendered_url(f"https://storage.googleapis.com/{GCS_MEDIA_BUCKET}/{path}",
+                                  blob.metadata),
+            'size': blob.size,
+            'mime': blob.content_type,
+        })
+    except Exception as e:
+        safe_print(f"[MEDIA STATUS ERROR] {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ---------------------------------------------------------------------------
+# Direct-to-GCS uploads (signed URLs): the browser PUTs the file to the
+# bucket itself, then calls finalize. See backend/integrations/gcs_signing.py.
+# ---------------------------------------------------------------------------
+
+SIGNED_UPLOAD_TTL = int(os.environ.get('SIGNED_UPLOAD_TTL', '900'))   # seconds
+_UPLOAD_EXTENSIONS = {
+    'image/jpeg': '.jpg', 'image/png': '.png', 'image/gif': '.gif', 'image/webp': '.webp',
+    'video/mp4': '.mp4', 'video/quicktime': '.mov', 'video/webm': '.webm',
+}
+_SIGNED_UPLOAD_KEY = re.compile(r'^media/(\d{4}-\d{2})/([0-9a-f]{32})\.(jpg|png|gif|webp|mp4|mov|webm)$')
+_FINALIZE_SNIFF_BYTES = 64 * 1024   # enough for _detect_mime and an image header
+
+
+def _media_size_cap(mime):
+    if mime == 'image/gif':
+        return MAX_GIF_SIZE
+    return MAX_IMAGE_SIZE if mime in ALLOWED_IMAGE_TYPES else MAX_VIDEO_SIZE
+
+
+@app.route('/api/media/upload-url', methods=['POST'])
+def media_upload_url():
+    """Issue a short-lived V4 signed PUT URL for one media file.
+    Body: {contentType, size}. Returns {uploadUrl, headers, path}."""
+    if not gcs_client:
+        return jsonify({'success': False, 'error': 'GCS not available'}), 503
+    data = request.json or {}
+    content_type = (data.get('contentType') or '').lower()
+    ext = _UPLOAD_EXTENSIONS.get(content_type)
+    if not ext:
+        return jsonify({'success': False, 'error': f'Unsupported file type: {content_type}'}), 400
+    try:
+        size = int(data.get('size') or 0)
+    except (TypeError, ValueError):
+        size = 0
+    cap = _media_size_cap(content_type)
+    if size <= 0:
+        return jsonify({'success': False, 'error': 'Empty file'}), 400
+    if size > cap:
+        return jsonify({'success': False, 'error': f'File too large. Max {cap // (1024 * 1024)}MB.'}), 400
+    try:
+        month_prefix = datetime.now(CHICAGO_TZ).strftime('%Y-%m')
+        path = f"media/{month_prefix}/{uuid.uuid4().hex}{ext}"
+        user = get_current_user() or {}
+        url, headers = signed_upload(
+            gcs_client.bucket(GCS_MEDIA_BUCKET).blob(path), content_type, cap,
+            metadata={'upload': 'signed', 'uploaded-by': user.get('email', '')},
+            ttl=SIGNED_UPLOAD_TTL)
+        return jsonify({'success': True, 'uploadUrl': url, 'headers': headers, 'path': path})
+    except Exception as e:
+        # e.g. credentials that can't sign: the builder falls back to /api/upload-media
+        safe_print(f"[MEDIA SIGN ERROR] {str(e)}")
+        return jsonify({'success': False, 'error': 'Direct upload not available'}), 503
+
+
+@app.route('/api/media/finalize', methods=['POST'])
+def media_finalize():
+    """Check a signed upload and publish it: sniff the real type, enforce its
+    size cap, then start the image rendition set or accept the video/GIF as
+    is. Answers like /api/upload-media. A rejected upload is deleted."""
+    if not gcs_client:
+        return jsonify({'success': False, 'error': 'GCS not available'}), 503
+    path = (request.json or {}).get('path')
+    m = _SIGNED_UPLOAD_KEY.match(path) if isinstance(path, str) else None
+    if not m:
+        return jsonify({'success': False, 'error': 'Invalid path'}), 400
+    month_prefix, media_id = m.group(1), m.group(2)
+    try:
+        blob = gcs_client.bucket(GCS_MEDIA_BUCKET).get_blob(path)
+        if blob is None:
+            return jsonify({'success': False, 'error': 'Upload not found'}), 404
+        meta = blob.metadata or {}
+        if meta.get('upload') not in ('signed', 'done', 'consumed'):
+            return jsonify({'success': False, 'error': 'Not a direct upload'}), 400
+        user = get_current_user() or {}
+        if meta.get('uploaded-by') != user.get('email') and not is_editor(user):
+            return jsonify({'success': False, 'error': 'Not your upload'}), 403
+
+        def kept(mime):
+            return jsonify({
+                'success': True,
+                'url': f"https://storage.googleapis.com/{GCS_MEDIA_BUCKET}/{path}",
+                'filename': path.rsplit('/', 1)[1],
+                'type': ('video' if mime in ALLOWED_VIDEO_TYPES
+                         else 'gif' if mime == 'image/gif' else 'image'),
+                'size': blob.size,
+                'original_size': blob.size,
+                'mime': mime,
+            })
+
+        if meta.get('upload') == 'done':     # finalize retried
+            return kept(blob.content_type)
+        if meta.get('upload') == 'consumed':
+            return jsonify({'success': False, 'error': 'Upload already finalized'}), 409
+
+        head = blob.download_as_bytes(start=0, end=_FINALIZE_SNIFF_BYTES - 1)
+        detected = _detect_mime(head) or blob.content_type or ''
+        is_image = detected in ALLOWED_IMAGE_TYPES
+        is_video = detected in ALLOWED_VIDEO_TYPES
+        error = None
+        if not is_image and not is_video:
+            error = f'Unsupported file type: {detected}'
+        elif blob.size > _media_size_cap(detected):
+            error = f'File too large. Max {_media_size_cap(detected) // (1024 * 1024)}MB.'
+        if error:
+            blob.delete()
+            return jsonify({'success': False, 'error': error}), 400
+
+        rendition_format = data = None
+        if media_jobs and is_image and detected != 'image/gif':
+            rendition_format = output_format(head)
+            if not rendition_format and blob.size > len(head):
+                # Big EXIF/XMP/MPF segments can push the image header past
+                # the sniffed head; the whole file is at most MAX_IMAGE_SIZE.
+                data = blob.download_as_bytes()
+                rendition_format = output_format(data)
+        if rendition_format:
+            return _publish_renditions(month_prefix, media_id, rendition_format, detected,
+                                       blob.size, data=data, source=path)
+
+        # Videos, GIFs (and images Pillow can't read) are kept as uploaded.
+        blob.metadata = dict(meta, upload='done')
+        blob.content_type = detected
+        blob.patch()
+        safe_print(f"[MEDIA] Finalized direct upload {path} ({blob.size} bytes)")
+        return kept(detected)
+    except Exception as e:
+        safe_print(f"[MEDIA FINALIZE ERROR] {str(e)}")
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # ---------------------------------------------------------------------------
 # Helpers for OG / YouTube preview (SSRF-safe URL fetching)
 # ---------------------------------------------------------------------------
@@ -1312,12 +1722,8 @@ import ipaddress as _ipaddress
 import socket as _socket
 from urllib.parse import urlparse as _urlparse, parse_qs as _parse_qs
 
-try:
-    from bs4 import BeautifulSoup as _BeautifulSoup
-    BS4_AVAILABLE = True
-except Exception as _bs4_err:
-    BS4_AVAILABLE = False
-    print(f"[WARNING] beautifulsoup4 not available: {_bs4_err}")
+# Imported on the first preview fetch (lxml, its parser, loads on first parse).
+_bs4 = lazy_import('beautifulsoup4', 'bs4')
 
 MEDIA_FETCH_TIMEOUT = 5
 MEDIA_FETCH_MAX_BYTES = 2 * 1024 * 1024
@@ -1382,12 +1788,12 @@ def _safe_fetch(url):
 def _extract_og(html_text, base_url):
     """Extract Open Graph and basic metadata tags from an HTML page."""
     result = {'title': '', 'description': '', 'image': '', 'site_name': '', 'url': base_url}
-    if not BS4_AVAILABLE:
+    if not _bs4:
         return result
     try:
-        soup = _BeautifulSoup(html_text, 'lxml')
+        soup = _bs4.BeautifulSoup(html_text, 'lxml')
     except Exception:
-        soup = _BeautifulSoup(html_text, 'html.parser')
+        soup = _bs4.BeautifulSoup(html_text, 'html.parser')
 
     def meta(prop_or_name):
         tag = soup.find('meta', attrs={'property': prop_or_name}) or soup.find('meta', attrs={'name': prop_or_name})
@@ -1497,33 +1903,20 @@ def media_youtube():
 # ROUTES - GAME / PUZZLE
 # ============================================================================
 
-@app.route('/api/generate-game', methods=['POST'])
-def generate_game():
-    """Generate a monthly game/puzzle using AI"""
-    try:
-        if not claude_client:
-            return jsonify({"success": False, "error": "Claude AI is not available"}), 503
-
-        data = request.json
-        game_type = data.get('type', 'word_scramble')
-        context = data.get('context', '')
-        month = data.get('month', datetime.now(CHICAGO_TZ).strftime('%B'))
+def _prepare_game(data):
+    game_type = data.get('type', 'word_scramble')
+    context = data.get('context', '')
+    month = data.get('month', datetime.now(CHICAGO_TZ).strftime('%B'))
 
-        safe_print(f"[API] Generating {game_type} game for {month}")
-
-        prompt = AI_PROMPTS.get('generate_game', '').format(
-            game_type=game_type,
-            context=context,
-            month=month,
-        )
+    safe_print(f"[API] Generating {game_type} game for {month}")
 
-        response = claude_client.generate_content(
-            prompt=prompt,
-            system_prompt=BRITESIDE_SYSTEM_PROMPT,
-            max_tokens=800,
-            temperature=0.8,
-        )
+    prompt = AI_PROMPTS.get('generate_game', '').format(
+        game_type=game_type,
+        context=context,
+        month=month,
+    )
 
+    def finish(response):
         game_text = response.get('content', '').strip()
 
         # The model is asked for raw JSON but sometimes wraps it in ```json fences
@@ -1538,17 +1931,35 @@ def generate_game():
             parse_ok = True
         except (ValueError, TypeError):
             pass
+        return {"game_content": cleaned, "game": parsed, "parse_ok": parse_ok}
+
+    return dict(prompt=prompt, max_tokens=800, temperature=0.8,
+                cache=True, fresh=data.get('cache') == 'bypass'), finish
+
+
+@app.route('/api/generate-game', methods=['POST'])
+def generate_game():
+    """Generate a monthly game/puzzle using AI"""
+    try:
+        if not claude_client:
+            return jsonify({"success": False, "error": "Claude AI is not available"}), 503
+
+        generate, finish = _prepare_game(request.json)
 
-        safe_print(f"[API] Game generated ({response.get('tokens', 0)} tokens, parse_ok={parse_ok})")
+        response = claude_client.generate_content(system_prompt=BRITESIDE_SYSTEM_PROMPT, **generate)
+
+        fields = finish(response)
+
+        safe_print(f"[API] Game generated ({response.get('tokens', 0)} tokens, parse_ok={fields['parse_ok']})")
 
         return jsonify({
             "success": True,
-            "game_content": cleaned,
-            "game": parsed,
-            "parse_ok": parse_ok,
+            **fields,
             "model": response.get('model', ''),
             "tokens": response.get('tokens', 0),
             "cost_estimate": response.get('cost_estimate', ''),
+            "cached": response.get('cached', False),
+            "cost_saved": response.get('cost_saved', '$0.0000'),
         })
 
     except Exception as e:
@@ -1557,16 +1968,100 @@ def generate_game():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@app.route('/api/save-game-answer', methods=['POST'])
-def save_game_answer():
-    """Save game answer to GCS for next month's reveal"""
-    if not gcs_client:
-        return jsonify({'success': False, 'error': 'GCS not available'}), 503
-    try:
-        data = request.json
-        month = data.get('month', '').lower()
-        year = data.get('year', datetime.now(CHICAGO_TZ).year)
-        answer = data.get('answer', '')
+# ============================================================================
+# ROUTES - AI STREAMING (server-sent events)
+# ============================================================================
+# Same prompts as the JSON endpoints above, but text is forwarded as the model
+# produces it so the editor sees output within a second instead of waiting for
+# the whole completion. Event stream:
+#   event: delta  data: {"text": "..."}          (repeated)
+#   event: done   data: {<the JSON endpoint's fields>, tokens, cost, timings}
+#   event: error  data: {"success": false, "error": "..."}
+# `done` is authoritative: e.g. a refusal can end with empty content even
+# after some deltas were sent.
+
+_STREAM_TASKS = {
+    'joke': _prepare_joke,
+    'spotlight': _prepare_spotlight,
+    'rewrite': _prepare_rewrite,
+    'game': _prepare_game,
+}
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@app.route('/api/stream/<task>', methods=['POST'])
+def stream_ai(task):
+    """Streaming twin of /api/generate-joke, -spotlight, -game and /api/rewrite-content"""
+    prepare = _STREAM_TASKS.get(task)
+    if not prepare:
+        return jsonify({"success": False, "error": f"Unknown stream task: {task}"}), 404
+    if not claude_client:
+        return jsonify({"success": False, "error": "Claude AI is not available"}), 503
+    try:
+        generate, finish = prepare(request.json or {})
+    except AIRequestError as e:
+        return jsonify({"success": False, "error": str(e)}), e.status
+    except Exception as e:
+        safe_print(f"[API] Error preparing {task} stream: {e}")
+        traceback.print_exc()
+        return jsonify({"success": False, "error": str(e)}), 500
+
+    def events():
+        try:
+            response = None
+            for kind, value in claude_client.stream_content(system_prompt=BRITESIDE_SYSTEM_PROMPT, **generate):
+                if kind == 'delta':
+                    yield _sse('delta', {"text": value})
+                else:
+                    response = value
+
+            fields = finish(response)
+
+            safe_print(f"[API] Streamed {task} ({response.get('tokens', 0)} tokens, "
+                       f"{response.get('cache_read_input_tokens', 0)} from prompt cache, "
+                       f"first token {response.get('first_token_ms')}ms, {response.get('latency_ms', 0)}ms)")
+
+            yield _sse('done', {
+                "success": True,
+                **fields,
+                "model": response.get('model', ''),
+                "tokens": response.get('tokens', 0),
+                "input_tokens": response.get('input_tokens', 0),
+                "cache_creation_input_tokens": response.get('cache_creation_input_tokens', 0),
+                "cache_read_input_tokens": response.get('cache_read_input_tokens', 0),
+                "output_tokens": response.get('output_tokens', 0),
+                "cost_estimate": response.get('cost_estimate', ''),
+                "latency_ms": response.get('latency_ms', 0),
+                "first_token_ms": response.get('first_token_ms'),
+                "cached": response.get('cached', False),
+                "cost_saved": response.get('cost_saved', '$0.0000'),
+            })
+        except Exception as e:
+            safe_print(f"[API] Error streaming {task}: {e}")
+            traceback.print_exc()
+            yield _sse('error', {"success": False, "error": str(e)})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        # No caching, and tell any buffering proxy to pass chunks straight through.
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@app.route('/api/save-game-answer', methods=['POST'])
+def save_game_answer():
+    """Save game answer to GCS for next month's reveal"""
+    if not gcs_client:
+        return jsonify({'success': False, 'error': 'GCS not available'}), 503
+    try:
+        data = request.json
+        month = data.get('month', '').lower()
+        year = data.get('year', datetime.now(CHICAGO_TZ).year)
+        answer = data.get('answer', '')
         game_type = data.get('type', '')
 
         blob_name = f"games/{month}-{year}.json"
@@ -1580,7 +2075,7 @@ def save_game_answer():
 
         bucket = gcs_client.bucket(GCS_DRAFTS_BUCKET)
         blob = bucket.blob(blob_name)
-        blob.upload_from_string(json.dumps(game_data), content_type='application/json')
+        upload_json(blob, game_data)
 
         safe_print(f"[GAME] Saved answer for {month} {year}")
         return jsonify({'success': True, 'file': blob_name})
@@ -1619,7 +2114,7 @@ def get_previous_game():
         if not blob.exists():
             return jsonify({'success': True, 'game': None})
 
-        game_data = json.loads(blob.download_as_text())
+        game_data = download_json(blob)
         return jsonify({'success': True, 'game': game_data})
 
     except Exception as e:
@@ -1631,6 +2126,27 @@ def get_previous_game():
 # ROUTES - EMAIL RENDERING & SENDING
 # ============================================================================
 
+EMAIL_TEMPLATES = (
+    'briteside-email.html',
+    'briteside-email-playful.html',
+    'briteside-email-teal.html',
+)
+DEFAULT_EMAIL_TEMPLATE = 'briteside-email.html'
+# Host-relative asset paths in the templates that must be absolute so they
+# work in iframe previews and email clients.
+EMAIL_ABSOLUTE_PATHS = (static_assets.url('briteco-logo-white.png'),)
+
+# Templates are compiled once per worker (see backend/email_templates.py). In
+# local dev (FLASK_DEBUG=true) edits are picked up by mtime without a restart.
+email_templates = TemplateRegistry(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates'),
+    EMAIL_TEMPLATES,
+    absolute_paths=EMAIL_ABSOLUTE_PATHS,
+    hot_reload=os.environ.get('FLASK_DEBUG', 'false').lower() == 'true',
+    transform=static_assets.rewrite,
+)
+
+
 def _build_media_html(media, FONT):
     """Render the optional Intro-addon media block.
     Returns a full <tr>...</tr> block, or '' if disabled/empty."""
@@ -1680,7 +2196,7 @@ def _build_media_html(media, FONT):
 
     # Simple image/gif/meme/social-screenshot — full-width responsive image
     if kind in ('image', 'gif', 'meme', 'social'):
-        safe_image = safe_url(image_url)
+        safe_image = safe_url(email_image_url(image_url, 600))
         if not safe_image:
             return ''
         href = safe_url(link_url or source_url)
@@ -1735,9 +2251,405 @@ def _build_media_html(media, FONT):
     return ''
 
 
+# Consistent font family for all dynamically generated email HTML
+EMAIL_FONT = "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif"
+
+# Stable palette for initials circles
+_AVATAR_COLORS = ['#31D7CA', '#5B6CF7', '#F59E0B', '#EF4444', '#8B5CF6', '#10B981', '#EC4899']
+
+# Rendered section fragments, memoized by a hash of each section's inputs
+# (see SectionCache). Sized for a few templates x a few drafts in flight.
+EMAIL_SECTION_CACHE_SIZE = int(os.environ.get('EMAIL_SECTION_CACHE_SIZE', '512'))
+email_sections = SectionCache(max_entries=EMAIL_SECTION_CACHE_SIZE)
+
+
+# ---------------------------------------------------------------------------
+# Section fragment builders. Each one is a pure function of its arguments
+# (render_email memoizes them via email_sections), returning strings/tuples.
+# ---------------------------------------------------------------------------
+
+def _month_abbrev(month_num, fallback_full):
+    full = MONTH_NAMES.get(int(month_num)) if month_num else None
+    full = full or fallback_full
+    return (full or '')[:3]
+
+
+def _initials(name):
+    parts = [p for p in (name or '').strip().split() if p]
+    if not parts:
+        return '?'
+    if len(parts) == 1:
+        return parts[0][0].upper()
+    return (parts[0][0] + parts[-1][0]).upper()
+
+
+def _avatar_cell(person):
+    FONT = EMAIL_FONT
+    img_url = email_image_url((person.get('image_url') or '').strip(), 60)
+    name = person.get('name', '')
+    if img_url:
+        avatar = (
+            f'<img src="{esc(img_url)}" width="60" height="60" alt="{esc(name)}" '
+            f'style="display:block; width:60px; height:60px; border-radius:50%; object-fit:cover; border:0;">'
+        )
+    else:
+        initials = esc(_initials(name))
+        color = _AVATAR_COLORS[(sum(ord(c) for c in name) if name else 0) % len(_AVATAR_COLORS)]
+        avatar = (
+            f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="60" height="60" '
+            f'style="width:60px; height:60px; border-radius:50%; background-color:{color};">'
+            f'<tr><td align="center" valign="middle" '
+            f'style="font-family:{FONT}; font-size:22px; font-weight:700; color:#ffffff; line-height:60px;">{initials}</td></tr>'
+            f'</table>'
+        )
+    return (
+        f'<td width="76" valign="middle" style="width:76px; padding: 10px 12px 10px 0;">{avatar}</td>'
+    )
+
+
+def _render_birthdays(birthdays, birthday_headings, primary_month_display, primary_month_num):
+    """Birthday rows, grouped by month when more than one month is supplied."""
+    FONT = EMAIL_FONT
+
+    def _row_for(bday, month_num_for_row):
+        bday_name = esc(bday.get('name', ''))
+        bday_day = esc(bday.get('birthday_day', ''))
+        bday_dept = esc(bday.get('department', ''))
+        mon_abbrev = esc(_month_abbrev(month_num_for_row, primary_month_display))
+        meta_bits = []
+        if mon_abbrev and bday_day:
+            meta_bits.append(f'{mon_abbrev} {bday_day}')
+        if bday_dept:
+            meta_bits.append(bday_dept)
+        meta = ' &middot; '.join(meta_bits)
+        return (
+            '<tr>'
+            + _avatar_cell(bday)
+            + f'<td valign="middle" style="padding: 10px 0;">'
+            f'<div style="font-family:{FONT}; font-size:15px; font-weight:600; color:#272D3F; text-align:left;">{bday_name}</div>'
+            f'<div style="font-family:{FONT}; font-size:14px; color:#6b7280; text-align:left;">{meta}</div>'
+            f'</td>'
+            '</tr>'
+        )
+
+    def _subheading_row(label):
+        return (
+            f'<tr><td colspan="2" style="padding: 18px 0 6px 0; '
+            f'font-family:{FONT}; font-size:15px; font-weight:700; color:#272D3F; text-align:center;">{esc(label)}</td></tr>'
+        )
+
+    # Group by month_num; treat missing month_num as primary
+    primary_group = []
+    secondary_groups = {}  # month_num -> list
+    for bday in birthdays:
+        m = bday.get('month_num') or primary_month_num or 0
+        if not primary_month_num or m == primary_month_num:
+            primary_group.append(bday)
+        else:
+            secondary_groups.setdefault(int(m), []).append(bday)
+
+    has_secondary = any(secondary_groups.values())
+    user_primary_heading = (birthday_headings.get('primary') or '').strip()
+    user_secondary_heading = (birthday_headings.get('secondary') or '').strip()
+
+    items = []
+    if has_secondary and primary_group:
+        primary_label = user_primary_heading or f'{primary_month_display} Birthdays'
+        items.append(_subheading_row(primary_label))
+    for bday in primary_group:
+        items.append(_row_for(bday, primary_month_num))
+    for sec_month_num in sorted(secondary_groups.keys()):
+        sec_name = MONTH_NAMES.get(sec_month_num, '')
+        # Only use the user's secondary heading for the first secondary month;
+        # subsequent ones (rare — user can only pick one in the UI today) fall back to the default.
+        if has_secondary and sec_month_num == sorted(secondary_groups.keys())[0]:
+            sec_label = user_secondary_heading or f'Also celebrating in {sec_name}'
+        else:
+            sec_label = f'Also celebrating in {sec_name}'
+        items.append(_subheading_row(sec_label))
+        for bday in secondary_groups[sec_month_num]:
+            items.append(_row_for(bday, sec_month_num))
+
+    return '\n'.join(items)
+
+
+def _render_anniversaries(anniversaries, primary_month_display, primary_month_num):
+    """Work anniversary rows (auto-pulled for the issue month)."""
+    FONT = EMAIL_FONT
+    ann_items = []
+    for a in anniversaries:
+        a_name = esc(a.get('name', ''))
+        a_dept = esc(a.get('department', ''))
+        try:
+            yrs = int(a.get('years') or 0)
+        except (TypeError, ValueError):
+            yrs = 0
+        a_day = esc(a.get('anniversary_day', ''))
+        mon_abbrev = esc(_month_abbrev(a.get('anniversary_month') or primary_month_num, primary_month_display))
+        bits = []
+        if yrs >= 1:
+            bits.append(f"{yrs} year" + ("s" if yrs != 1 else ""))
+        if mon_abbrev and a_day:
+            bits.append(f"{mon_abbrev} {a_day}")
+        if a_dept:
+            bits.append(a_dept)
+        meta = ' &middot; '.join(bits)
+        ann_items.append(
+            '<tr>'
+            + _avatar_cell(a)
+            + f'<td valign="middle" style="padding: 10px 0;">'
+            f'<div style="font-family:{FONT}; font-size:15px; font-weight:600; color:#272D3F; text-align:left;">{a_name}</div>'
+            f'<div style="font-family:{FONT}; font-size:14px; color:#6b7280; text-align:left;">&#127881; {meta}</div>'
+            f'</td>'
+            '</tr>'
+        )
+    return '\n'.join(ann_items)
+
+
+def _render_welcome(welcome_hires):
+    """Welcome rows for new hires."""
+    FONT = EMAIL_FONT
+    hire_items = []
+    for hire in welcome_hires:
+        h_name = esc(hire.get('name', ''))
+        h_role = esc(hire.get('role', ''))
+        h_fact = esc(hire.get('fun_fact', ''))
+        hire_items.append(
+            f'<tr><td align="center" style="padding: 14px 0; border-bottom: 1px solid #e8f5f5; font-family: {FONT}; text-align: center;">'
+            f'<p style="margin: 0 0 2px 0; font-family: {FONT}; font-size: 17px; font-weight: 700; color: #272D3F;">{h_name}</p>'
+            f'<p style="margin: 0; font-family: {FONT}; font-size: 14px; color: #31D7CA; font-style: italic;">{h_role}</p>'
+            + (f'<p style="margin: 4px 0 0 0; font-family: {FONT}; font-size: 13px; color: #6b7280;">Fun fact: {h_fact}</p>' if h_fact else '')
+            + '</td></tr>'
+        )
+    return '\n'.join(hire_items)
+
+
+def _render_spotlights(valid_spotlights):
+    """Spotlight tables (1-3 spotlights) with dashed separators between them."""
+    FONT = EMAIL_FONT
+    spotlight_section_html = ''
+    for sp_idx, sp in enumerate(valid_spotlights):
+        sp_name = esc(sp.get('name', ''))
+        sp_title = esc(sp.get('title', ''))
+        sp_blurb = esc(sp.get('blurb', ''))
+        sp_fun_facts = esc(sp.get('fun_facts', ''))
+        sp_image_url = safe_url(email_image_url(sp.get('image_url', ''), 120))
+
+        # Add separator between multiple spotlights
+        if sp_idx > 0:
+            spotlight_section_html += (
+                f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
+                f'<tr><td style="height: 1px; padding: 28px 0; font-size: 1px; line-height: 1px;">'
+                f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
+                f'<tr><td style="height: 0; border-top: 2px dashed #31D7CA; font-size: 1px; line-height: 1px;">&nbsp;</td></tr>'
+                f'</table></td></tr></table>'
+            )
+
+        spotlight_section_html += '<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
+
+        if sp_image_url:
+            spotlight_section_html += (
+                f'<tr><td align="center" style="padding-bottom: 16px;">'
+                f'<!--[if !mso]><!-->'
+                f'<img src="{sp_image_url}" width="120" alt="{sp_name}" '
+                f'style="width: 120px; height: 120px; border-radius: 50%; object-fit: cover; display: block;">'
+                f'<!--<![endif]-->'
+                f'<!--[if mso]>'
+                f'<img src="{sp_image_url}" width="120" alt="{sp_name}" '
+                f'style="width: 120px; height: auto; display: block;">'
+                f'<![endif]-->'
+                f'</td></tr>'
+            )
+
+        # Name and title
+        spotlight_section_html += (
+            f'<tr><td align="center" style="padding-bottom: 2px;">'
+            f'<p style="margin: 0; font-family: {FONT}; font-size: 20px; font-weight: 800; color: #272D3F;">{sp_name}</p>'
+            f'</td></tr>'
+            f'<tr><td align="center" style="padding-bottom: 16px;">'
+            f'<p style="margin: 0; font-family: {FONT}; font-size: 13px; font-weight: 700; color: #31D7CA; text-transform: uppercase; letter-spacing: 1px;">{sp_title}</p>'
+            f'</td></tr>'
+        )
+
+        # Build Q&A HTML if present — centered
+        sp_qa = sp.get('qa', [])
+        qa_html = ''
+        for pair in sp_qa:
+            q_text = esc(pair.get('q', ''))
+            a_text = esc(pair.get('a', ''))
+            if q_text and a_text:
+                qa_html += (
+                    f'<tr><td align="center" style="padding: 6px 0; text-align: center;">'
+                    f'<p style="margin: 0; font-family: {FONT}; font-size: 14px; color: #272D3F; font-weight: 700;">{q_text}</p>'
+                    f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; color: #444444;">{a_text}</p>'
+                    f'</td></tr>'
+                )
+
+        if qa_html:
+            spotlight_section_html += (
+                f'<tr><td style="padding: 0 0 16px 0;">'
+                f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
+                f'{qa_html}</table></td></tr>'
+            )
+
+        # Show blurb if present
+        if sp_blurb:
+            spotlight_section_html += (
+                f'<tr><td align="center" style="padding-bottom: 8px; text-align: center;">'
+                f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; line-height: 25px; color: #444444; font-style: italic;">{sp_blurb}</p>'
+                f'</td></tr>'
+            )
+        # Show fun facts below blurb (or on its own if no blurb)
+        if sp_fun_facts:
+            spotlight_section_html += (
+                f'<tr><td align="center" style="padding-bottom: 8px; text-align: center;">'
+                f'<p style="margin: 0; font-family: {FONT}; font-size: 14px; line-height: 22px; color: #6b7280;">Fun fact: {sp_fun_facts}</p>'
+                f'</td></tr>'
+            )
+
+        spotlight_section_html += '</table>'
+    return spotlight_section_html
+
+
+def _render_update(u):
+    """One company update -> (title, body, photos_html)."""
+    FONT = EMAIL_FONT
+    title = esc(u.get('title', ''))
+    # Preserve paragraph breaks from feed posts / textareas — a bare
+    # <p> collapses newlines, which mashed multi-line updates together.
+    body = esc(u.get('body', '')).replace('\n', '<br>')
+    update_from = esc((u.get('from') or '').strip())
+    photos = [s for s in (safe_url(p) for p in u.get('photos', [])) if s]
+    # Rendition sized for the slot: one full-width photo or a grid cell
+    photos = [email_image_url(p, 516 if len(photos) == 1 else 248) for p in photos]
+    photos_html = ''
+    if len(photos) == 1:
+        # Single photo: full width, fixed height with drag-position
+        photo_positions = u.get('photo_positions', [])
+        pos_y = photo_positions[0] if photo_positions else 50
+        photos_html = (
+            f'<img src="{photos[0]}" width="516" '
+            f'style="width: 100%; height: 242px; object-fit: cover; '
+            f'object-position: center {pos_y}%; border-radius: 8px; '
+            f'margin-top: 12px; display: block;" '
+            f'alt="Update photo" class="mobile-img-full">'
+        )
+    elif len(photos) >= 2:
+        # Multiple photos: side-by-side in a 2-column table
+        photos_html = (
+            '<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%" style="margin-top: 12px;">'
+            '<tr>'
+        )
+        for p_idx, photo_url in enumerate(photos):
+            # Start a new row every 2 photos
+            if p_idx > 0 and p_idx % 2 == 0:
+                photos_html += '</tr><tr>'
+            cell_width = '50%' if (len(photos) - p_idx) >= 2 or p_idx % 2 == 1 else '100%'
+            pad_right = '4px' if p_idx % 2 == 0 and (p_idx + 1) < len(photos) else '0'
+            pad_left = '4px' if p_idx % 2 == 1 else '0'
+            colspan = ' colspan="2"' if cell_width == '100%' else ''
+            photos_html += (
+                f'<td{colspan} width="{cell_width}" style="padding-right: {pad_right}; padding-left: {pad_left}; padding-bottom: 8px;" valign="top">'
+                f'<img src="{photo_url}" width="248" '
+                f'style="width: 100%; height: auto; border-radius: 8px; display: block;" '
+                f'alt="Update photo" class="mobile-img-full">'
+                f'</td>'
+            )
+        photos_html += '</tr></table>'
+    # Attribution rides in the photos slot (raw-HTML placeholder
+    # right after the body in every template), so all three
+    # templates get the credit line without new placeholders.
+    if update_from:
+        photos_html += (
+            f'<p style="margin: 10px 0 0 0; font-family: {FONT}; '
+            f'font-size: 12.5px; color: #9ca3af;">&mdash; {update_from}</p>'
+        )
+    return title, body, photos_html
+
+
+def _render_shoutouts(shoutouts):
+    """Shout-outs block (heading + cards), or '' when there is nothing to show.
+    Only called when the section is enabled — some email clients (Outlook)
+    ignore display:none, so a hidden row must also be empty."""
+    FONT = EMAIL_FONT
+    shoutout_items_html = ''
+    for so in shoutouts:
+        if not isinstance(so, dict):
+            continue
+        so_text = esc((so.get('text') or '').strip()).replace('\n', '<br>')
+        so_from = esc((so.get('from') or '').strip())
+        if not so_text:
+            continue
+        shoutout_items_html += (
+            f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%" '
+            f'style="border-radius: 10px; overflow: hidden; margin-bottom: 10px;">'
+            f'<tr><td style="border-left: 4px solid #FE8916; padding: 14px 20px; background-color: #fffaf3;" class="card-padding">'
+            f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; line-height: 23px; color: #4b4b4b;">'
+            f'&#128079; {so_text}</p>'
+            + (f'<p style="margin: 6px 0 0 0; font-family: {FONT}; font-size: 12.5px; color: #9ca3af;">&mdash; {so_from}</p>' if so_from else '')
+            + '</td></tr></table>'
+        )
+    if not shoutout_items_html:
+        return ''
+    return (
+        f'<p style="margin: 0 0 14px 0; font-family: {FONT}; font-size: 20px; font-weight: 800; color: #272D3F;">'
+        f'Shout-outs &#128079;</p>' + shoutout_items_html
+    )
+
+
+def _render_game(game):
+    """Brain-teaser block, or '' when there is no game content or image."""
+    FONT = EMAIL_FONT
+    game_content = sanitize_basic_html(game.get('content', ''))
+    game_image_url = safe_url(email_image_url(game.get('image_url', ''), 460))
+    game_previous_answer = esc(game.get('previous_answer', ''))
+
+    game_section_html = ''
+    if game_content or game_image_url:
+        game_section_html += '<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
+        if game_image_url:
+            game_section_html += (
+                f'<tr><td align="center" style="padding-bottom: 10px; text-align: center;">'
+                f'<img src="{game_image_url}" width="460" '
+                f'style="width: 100%; max-width: 460px; height: auto; border-radius: 8px; display: block; margin: 0 auto;" '
+                f'alt="BriteSide Brain Teaser">'
+                f'</td></tr>'
+            )
+        if game_content:
+            game_section_html += (
+                f'<tr><td align="center" style="padding-bottom: 10px; text-align: center;">'
+                f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; line-height: 24px; color: #444444; text-align: center;">{game_content}</p>'
+                f'</td></tr>'
+            )
+        game_section_html += (
+            f'<tr><td align="center" style="text-align: center;">'
+            f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; font-weight: 700; color: #018181; text-align: center;">'
+            'Email Dove your answer &mdash; the winner gets 100 BriteCo Bucks!</p>'
+            f'</td></tr>'
+        )
+        if game_previous_answer:
+            game_section_html += (
+                f'<tr><td align="center" style="padding-top: 10px; text-align: center;">'
+                f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" style="margin: 0 auto;">'
+                f'<tr><td style="padding: 10px 14px; background-color: #f0fdf4; border-radius: 8px; border: 1px solid #86efac; text-align: center;">'
+                f'<p style="margin: 0 0 2px 0; font-family: {FONT}; font-size: 12px; font-weight: 700; text-transform: uppercase; color: #059669; letter-spacing: 1px;">Last Month\'s Answer</p>'
+                f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; color: #272D3F;">{game_previous_answer}</p>'
+                f'</td></tr></table>'
+                f'</td></tr>'
+            )
+        game_section_html += '</table>'
+    return game_section_html
+
+
 @app.route('/api/render-email', methods=['POST'])
 def render_email():
-    """Render the newsletter email template with provided content"""
+    """Render the newsletter email template with provided content.
+
+    Each section (birthdays, anniversaries, welcome, spotlights, updates 1-5,
+    shout-outs, game, media) is built by its own fragment builder and memoized
+    in email_sections, so a preview re-render after a one-field edit only
+    rebuilds the section that changed. meta.section_cache reports, per
+    section, whether this render hit the cache and the running hit rate."""
     try:
         data = request.json
 
@@ -1760,270 +2672,55 @@ def render_email():
         media = data.get('media', {}) or {}
 
         # Template selection (default to classic)
-        template_file = data.get('template', 'briteside-email.html')
-        allowed_templates = [
-            'briteside-email.html',
-            'briteside-email-playful.html',
-            'briteside-email-teal.html',
-        ]
-        if template_file not in allowed_templates:
-            template_file = 'briteside-email.html'
+        template_file = data.get('template', DEFAULT_EMAIL_TEMPLATE)
+        if template_file not in EMAIL_TEMPLATES:
+            template_file = DEFAULT_EMAIL_TEMPLATE
 
         safe_print(f"[API] Rendering email template '{template_file}' for {month} {year}")
 
-        # Read the email template
-        template_path = os.path.join(os.path.dirname(__file__), 'templates', template_file)
+        # Compiled email template (parsed once at startup)
         try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                html = f.read()
+            template = email_templates.get(template_file)
         except FileNotFoundError:
+            template_path = email_templates.path(template_file)
             return jsonify({"success": False, "error": f"Template not found: {template_path}"}), 404
 
-        # Consistent font family for all dynamically generated HTML
-        FONT = "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif"
+        section_hits = {}
+
+        def _fragment(section, build, *args):
+            value, hit = email_sections.fragment(section, template_file, build, *args)
+            section_hits[section] = hit
+            return value
 
-        # Build birthday HTML rows (grouped by month if multiple months supplied)
-        birthday_html = ''
         primary_month_display = str(month).capitalize() if month else ''
         primary_month_num = data.get('month_num') or 0
 
-        def _month_abbrev(month_num, fallback_full):
-            full = MONTH_NAMES.get(int(month_num)) if month_num else None
-            full = full or fallback_full
-            return (full or '')[:3]
-
-        def _initials(name):
-            parts = [p for p in (name or '').strip().split() if p]
-            if not parts:
-                return '?'
-            if len(parts) == 1:
-                return parts[0][0].upper()
-            return (parts[0][0] + parts[-1][0]).upper()
-
-        # Stable palette for initials circles
-        _AVATAR_COLORS = ['#31D7CA', '#5B6CF7', '#F59E0B', '#EF4444', '#8B5CF6', '#10B981', '#EC4899']
-
-        def _avatar_cell(bday):
-            img_url = (bday.get('image_url') or '').strip()
-            name = bday.get('name', '')
-            if img_url:
-                avatar = (
-                    f'<img src="{esc(img_url)}" width="60" height="60" alt="{esc(name)}" '
-                    f'style="display:block; width:60px; height:60px; border-radius:50%; object-fit:cover; border:0;">'
-                )
-            else:
-                initials = esc(_initials(name))
-                color = _AVATAR_COLORS[(sum(ord(c) for c in name) if name else 0) % len(_AVATAR_COLORS)]
-                avatar = (
-                    f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="60" height="60" '
-                    f'style="width:60px; height:60px; border-radius:50%; background-color:{color};">'
-                    f'<tr><td align="center" valign="middle" '
-                    f'style="font-family:{FONT}; font-size:22px; font-weight:700; color:#ffffff; line-height:60px;">{initials}</td></tr>'
-                    f'</table>'
-                )
-            return (
-                f'<td width="76" valign="middle" style="width:76px; padding: 10px 12px 10px 0;">{avatar}</td>'
-            )
-
-        def _row_for(bday, month_num_for_row):
-            bday_name = esc(bday.get('name', ''))
-            bday_day = esc(bday.get('birthday_day', ''))
-            bday_dept = esc(bday.get('department', ''))
-            mon_abbrev = esc(_month_abbrev(month_num_for_row, primary_month_display))
-            meta_bits = []
-            if mon_abbrev and bday_day:
-                meta_bits.append(f'{mon_abbrev} {bday_day}')
-            if bday_dept:
-                meta_bits.append(bday_dept)
-            meta = ' &middot; '.join(meta_bits)
-            return (
-                '<tr>'
-                + _avatar_cell(bday)
-                + f'<td valign="middle" style="padding: 10px 0;">'
-                f'<div style="font-family:{FONT}; font-size:15px; font-weight:600; color:#272D3F; text-align:left;">{bday_name}</div>'
-                f'<div style="font-family:{FONT}; font-size:14px; color:#6b7280; text-align:left;">{meta}</div>'
-                f'</td>'
-                '</tr>'
-            )
-
-        def _subheading_row(label):
-            return (
-                f'<tr><td colspan="2" style="padding: 18px 0 6px 0; '
-                f'font-family:{FONT}; font-size:15px; font-weight:700; color:#272D3F; text-align:center;">{esc(label)}</td></tr>'
-            )
-
+        # Birthday rows (grouped by month if multiple months supplied)
+        birthday_html = ''
         if birthdays:
-            # Group by month_num; treat missing month_num as primary
-            primary_group = []
-            secondary_groups = {}  # month_num -> list
-            for bday in birthdays:
-                m = bday.get('month_num') or primary_month_num or 0
-                if not primary_month_num or m == primary_month_num:
-                    primary_group.append(bday)
-                else:
-                    secondary_groups.setdefault(int(m), []).append(bday)
-
-            has_secondary = any(secondary_groups.values())
-            user_primary_heading = (birthday_headings.get('primary') or '').strip()
-            user_secondary_heading = (birthday_headings.get('secondary') or '').strip()
+            birthday_html = _fragment('birthdays', _render_birthdays, birthdays, birthday_headings,
+                                      primary_month_display, primary_month_num)
 
-            items = []
-            if has_secondary and primary_group:
-                primary_label = user_primary_heading or f'{primary_month_display} Birthdays'
-                items.append(_subheading_row(primary_label))
-            for bday in primary_group:
-                items.append(_row_for(bday, primary_month_num))
-            for sec_month_num in sorted(secondary_groups.keys()):
-                sec_name = MONTH_NAMES.get(sec_month_num, '')
-                # Only use the user's secondary heading for the first secondary month;
-                # subsequent ones (rare — user can only pick one in the UI today) fall back to the default.
-                if has_secondary and sec_month_num == sorted(secondary_groups.keys())[0]:
-                    sec_label = user_secondary_heading or f'Also celebrating in {sec_name}'
-                else:
-                    sec_label = f'Also celebrating in {sec_name}'
-                items.append(_subheading_row(sec_label))
-                for bday in secondary_groups[sec_month_num]:
-                    items.append(_row_for(bday, sec_month_num))
-
-            birthday_html = '\n'.join(items)
-
-        # Build work anniversary rows (auto-pulled for the issue month)
+        # Work anniversary rows (auto-pulled for the issue month)
         anniversaries = data.get('anniversaries', [])
         anniversaries_enabled = data.get('anniversaries_enabled', True)
         anniversary_html = ''
         if anniversaries_enabled and anniversaries:
-            ann_items = []
-            for a in anniversaries:
-                a_name = esc(a.get('name', ''))
-                a_dept = esc(a.get('department', ''))
-                try:
-                    yrs = int(a.get('years') or 0)
-                except (TypeError, ValueError):
-                    yrs = 0
-                a_day = esc(a.get('anniversary_day', ''))
-                mon_abbrev = esc(_month_abbrev(a.get('anniversary_month') or primary_month_num, primary_month_display))
-                bits = []
-                if yrs >= 1:
-                    bits.append(f"{yrs} year" + ("s" if yrs != 1 else ""))
-                if mon_abbrev and a_day:
-                    bits.append(f"{mon_abbrev} {a_day}")
-                if a_dept:
-                    bits.append(a_dept)
-                meta = ' &middot; '.join(bits)
-                ann_items.append(
-                    '<tr>'
-                    + _avatar_cell(a)
-                    + f'<td valign="middle" style="padding: 10px 0;">'
-                    f'<div style="font-family:{FONT}; font-size:15px; font-weight:600; color:#272D3F; text-align:left;">{a_name}</div>'
-                    f'<div style="font-family:{FONT}; font-size:14px; color:#6b7280; text-align:left;">&#127881; {meta}</div>'
-                    f'</td>'
-                    '</tr>'
-                )
-            anniversary_html = '\n'.join(ann_items)
+            anniversary_html = _fragment('anniversaries', _render_anniversaries, anniversaries,
+                                         primary_month_display, primary_month_num)
 
-        # Build welcome hires HTML
+        # Welcome hires
         welcome_html = ''
         if welcome_enabled and welcome_hires:
-            hire_items = []
-            for hire in welcome_hires:
-                h_name = esc(hire.get('name', ''))
-                h_role = esc(hire.get('role', ''))
-                h_fact = esc(hire.get('fun_fact', ''))
-                hire_items.append(
-                    f'<tr><td align="center" style="padding: 14px 0; border-bottom: 1px solid #e8f5f5; font-family: {FONT}; text-align: center;">'
-                    f'<p style="margin: 0 0 2px 0; font-family: {FONT}; font-size: 17px; font-weight: 700; color: #272D3F;">{h_name}</p>'
-                    f'<p style="margin: 0; font-family: {FONT}; font-size: 14px; color: #31D7CA; font-style: italic;">{h_role}</p>'
-                    + (f'<p style="margin: 4px 0 0 0; font-family: {FONT}; font-size: 13px; color: #6b7280;">Fun fact: {h_fact}</p>' if h_fact else '')
-                    + '</td></tr>'
-                )
-            welcome_html = '\n'.join(hire_items)
+            welcome_html = _fragment('welcome', _render_welcome, welcome_hires)
 
-        # Build spotlight section HTML (supports 1-3 spotlights)
+        # Spotlight section (supports 1-3 spotlights)
         # Use spotlights array if available, fall back to single spotlight
         spotlight_list = spotlights if spotlights else ([spotlight] if spotlight and spotlight.get('name') else [])
-        spotlight_section_html = ''
         valid_spotlights = [sp for sp in spotlight_list if sp and sp.get('name')]
-        for sp_idx, sp in enumerate(valid_spotlights):
-            sp_name = esc(sp.get('name', ''))
-            sp_title = esc(sp.get('title', ''))
-            sp_blurb = esc(sp.get('blurb', ''))
-            sp_fun_facts = esc(sp.get('fun_facts', ''))
-            sp_image_url = safe_url(sp.get('image_url', ''))
-
-            # Add separator between multiple spotlights
-            if sp_idx > 0:
-                spotlight_section_html += (
-                    f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
-                    f'<tr><td style="height: 1px; padding: 28px 0; font-size: 1px; line-height: 1px;">'
-                    f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
-                    f'<tr><td style="height: 0; border-top: 2px dashed #31D7CA; font-size: 1px; line-height: 1px;">&nbsp;</td></tr>'
-                    f'</table></td></tr></table>'
-                )
-
-            spotlight_section_html += '<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
-
-            sp_image_html = ''
-            if sp_image_url:
-                spotlight_section_html += (
-                    f'<tr><td align="center" style="padding-bottom: 16px;">'
-                    f'<!--[if !mso]><!-->'
-                    f'<img src="{sp_image_url}" width="120" alt="{sp_name}" '
-                    f'style="width: 120px; height: 120px; border-radius: 50%; object-fit: cover; display: block;">'
-                    f'<!--<![endif]-->'
-                    f'<!--[if mso]>'
-                    f'<img src="{sp_image_url}" width="120" alt="{sp_name}" '
-                    f'style="width: 120px; height: auto; display: block;">'
-                    f'<![endif]-->'
-                    f'</td></tr>'
-                )
-
-            # Name and title
-            spotlight_section_html += (
-                f'<tr><td align="center" style="padding-bottom: 2px;">'
-                f'<p style="margin: 0; font-family: {FONT}; font-size: 20px; font-weight: 800; color: #272D3F;">{sp_name}</p>'
-                f'</td></tr>'
-                f'<tr><td align="center" style="padding-bottom: 16px;">'
-                f'<p style="margin: 0; font-family: {FONT}; font-size: 13px; font-weight: 700; color: #31D7CA; text-transform: uppercase; letter-spacing: 1px;">{sp_title}</p>'
-                f'</td></tr>'
-            )
-
-            # Build Q&A HTML if present — centered
-            sp_qa = sp.get('qa', [])
-            qa_html = ''
-            for pair in sp_qa:
-                q_text = esc(pair.get('q', ''))
-                a_text = esc(pair.get('a', ''))
-                if q_text and a_text:
-                    qa_html += (
-                        f'<tr><td align="center" style="padding: 6px 0; text-align: center;">'
-                        f'<p style="margin: 0; font-family: {FONT}; font-size: 14px; color: #272D3F; font-weight: 700;">{q_text}</p>'
-                        f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; color: #444444;">{a_text}</p>'
-                        f'</td></tr>'
-                    )
-
-            if qa_html:
-                spotlight_section_html += (
-                    f'<tr><td style="padding: 0 0 16px 0;">'
-                    f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
-                    f'{qa_html}</table></td></tr>'
-                )
-
-            # Show blurb if present
-            if sp_blurb:
-                spotlight_section_html += (
-                    f'<tr><td align="center" style="padding-bottom: 8px; text-align: center;">'
-                    f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; line-height: 25px; color: #444444; font-style: italic;">{sp_blurb}</p>'
-                    f'</td></tr>'
-                )
-            # Show fun facts below blurb (or on its own if no blurb)
-            if sp_fun_facts:
-                spotlight_section_html += (
-                    f'<tr><td align="center" style="padding-bottom: 8px; text-align: center;">'
-                    f'<p style="margin: 0; font-family: {FONT}; font-size: 14px; line-height: 22px; color: #6b7280;">Fun fact: {sp_fun_facts}</p>'
-                    f'</td></tr>'
-                )
-
-            spotlight_section_html += '</table>'
+        spotlight_section_html = ''
+        if valid_spotlights:
+            spotlight_section_html = _fragment('spotlights', _render_spotlights, valid_spotlights)
 
         # For backward compat, also build single-spotlight placeholders
         if not spotlight:
@@ -2031,7 +2728,7 @@ def render_email():
         spotlight_name = spotlight.get('name', '')
         spotlight_title_val = spotlight.get('title', '')
         spotlight_blurb = spotlight.get('blurb', '')
-        spotlight_image_url = safe_url(spotlight.get('image_url', '')) if spotlight else ''
+        spotlight_image_url = safe_url(email_image_url(spotlight.get('image_url', ''), 120)) if spotlight else ''
         spotlight_image_html = ''
         if spotlight_image_url:
             spotlight_image_html = (
@@ -2040,174 +2737,36 @@ def render_email():
                 f'class="mobile-img-full">'
             )
 
-        # Build updates HTML with photos
+        # Updates with photos — one cached fragment per slot
         if not updates_enabled:
             updates = []
-
-        # Build individual update fields
-        update_1_title = ''
-        update_1_body = ''
-        update_1_photos_html = ''
-        update_2_title = ''
-        update_2_body = ''
-        update_2_photos_html = ''
-        update_3_title = ''
-        update_3_body = ''
-        update_3_photos_html = ''
-        update_4_title = ''
-        update_4_body = ''
-        update_4_photos_html = ''
-        update_5_title = ''
-        update_5_body = ''
-        update_5_photos_html = ''
-        if updates:
-            for i, u in enumerate(updates[:5]):
-                if not isinstance(u, dict):
-                    continue
-                title = esc(u.get('title', ''))
-                # Preserve paragraph breaks from feed posts / textareas — a bare
-                # <p> collapses newlines, which mashed multi-line updates together.
-                body = esc(u.get('body', '')).replace('\n', '<br>')
-                update_from = esc((u.get('from') or '').strip())
-                photos = [s for s in (safe_url(p) for p in u.get('photos', [])) if s]
-                photos_html = ''
-                if len(photos) == 1:
-                    # Single photo: full width, fixed height with drag-position
-                    photo_positions = u.get('photo_positions', [])
-                    pos_y = photo_positions[0] if photo_positions else 50
-                    photos_html = (
-                        f'<img src="{photos[0]}" width="516" '
-                        f'style="width: 100%; height: 242px; object-fit: cover; '
-                        f'object-position: center {pos_y}%; border-radius: 8px; '
-                        f'margin-top: 12px; display: block;" '
-                        f'alt="Update photo" class="mobile-img-full">'
-                    )
-                elif len(photos) >= 2:
-                    # Multiple photos: side-by-side in a 2-column table
-                    photos_html = (
-                        '<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%" style="margin-top: 12px;">'
-                        '<tr>'
-                    )
-                    for p_idx, photo_url in enumerate(photos):
-                        # Start a new row every 2 photos
-                        if p_idx > 0 and p_idx % 2 == 0:
-                            photos_html += '</tr><tr>'
-                        cell_width = '50%' if (len(photos) - p_idx) >= 2 or p_idx % 2 == 1 else '100%'
-                        pad_right = '4px' if p_idx % 2 == 0 and (p_idx + 1) < len(photos) else '0'
-                        pad_left = '4px' if p_idx % 2 == 1 else '0'
-                        colspan = ' colspan="2"' if cell_width == '100%' else ''
-                        photos_html += (
-                            f'<td{colspan} width="{cell_width}" style="padding-right: {pad_right}; padding-left: {pad_left}; padding-bottom: 8px;" valign="top">'
-                            f'<img src="{photo_url}" width="248" '
-                            f'style="width: 100%; height: auto; border-radius: 8px; display: block;" '
-                            f'alt="Update photo" class="mobile-img-full">'
-                            f'</td>'
-                        )
-                    photos_html += '</tr></table>'
-                # Attribution rides in the photos slot (raw-HTML placeholder
-                # right after the body in every template), so all three
-                # templates get the credit line without new placeholders.
-                if update_from:
-                    photos_html += (
-                        f'<p style="margin: 10px 0 0 0; font-family: {FONT}; '
-                        f'font-size: 12.5px; color: #9ca3af;">&mdash; {update_from}</p>'
-                    )
-                if i == 0:
-                    update_1_title = title
-                    update_1_body = body
-                    update_1_photos_html = photos_html
-                elif i == 1:
-                    update_2_title = title
-                    update_2_body = body
-                    update_2_photos_html = photos_html
-                elif i == 2:
-                    update_3_title = title
-                    update_3_body = body
-                    update_3_photos_html = photos_html
-                elif i == 3:
-                    update_4_title = title
-                    update_4_body = body
-                    update_4_photos_html = photos_html
-                elif i == 4:
-                    update_5_title = title
-                    update_5_body = body
-                    update_5_photos_html = photos_html
-
-        # Build shout-outs section (fed by feed shout-out posts + manual adds)
-        shoutout_items_html = ''
-        for so in shoutouts:
-            if not isinstance(so, dict):
-                continue
-            so_text = esc((so.get('text') or '').strip()).replace('\n', '<br>')
-            so_from = esc((so.get('from') or '').strip())
-            if not so_text:
+        update_fields = [('', '', '')] * 5  # (title, body, photos_html) per slot
+        for i, u in enumerate(updates[:5]):
+            if not isinstance(u, dict):
                 continue
-            shoutout_items_html += (
-                f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%" '
-                f'style="border-radius: 10px; overflow: hidden; margin-bottom: 10px;">'
-                f'<tr><td style="border-left: 4px solid #FE8916; padding: 14px 20px; background-color: #fffaf3;" class="card-padding">'
-                f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; line-height: 23px; color: #4b4b4b;">'
-                f'&#128079; {so_text}</p>'
-                + (f'<p style="margin: 6px 0 0 0; font-family: {FONT}; font-size: 12.5px; color: #9ca3af;">&mdash; {so_from}</p>' if so_from else '')
-                + '</td></tr></table>'
-            )
-        shoutouts_display = 'table-row' if (shoutouts_enabled and shoutout_items_html) else 'none'
+            update_fields[i] = _fragment(f'update_{i + 1}', _render_update, u)
+        (update_1_title, update_1_body, update_1_photos_html), \
+            (update_2_title, update_2_body, update_2_photos_html), \
+            (update_3_title, update_3_body, update_3_photos_html), \
+            (update_4_title, update_4_body, update_4_photos_html), \
+            (update_5_title, update_5_body, update_5_photos_html) = update_fields
+
+        # Shout-outs section (fed by feed shout-out posts + manual adds)
         shoutouts_section_html = ''
-        if shoutouts_enabled and shoutout_items_html:
-            # Only ship the markup when enabled — some email clients (Outlook)
-            # ignore display:none, so a hidden row must also be empty.
-            shoutouts_section_html = (
-                f'<p style="margin: 0 0 14px 0; font-family: {FONT}; font-size: 20px; font-weight: 800; color: #272D3F;">'
-                f'Shout-outs &#128079;</p>' + shoutout_items_html
-            )
+        if shoutouts_enabled and shoutouts:
+            shoutouts_section_html = _fragment('shoutouts', _render_shoutouts, shoutouts)
+        shoutouts_display = 'table-row' if shoutouts_section_html else 'none'
 
-        # Build special section HTML (frontend sends null if disabled)
+        # Special section (frontend sends null if disabled)
         if not special_section:
             special_section = {}
         special_title = esc(special_section.get('title', ''))
         special_body = esc(special_section.get('body', ''))
 
-        # Build game section HTML
+        # Game section
         if not game:
             game = {}
-        game_content = sanitize_basic_html(game.get('content', ''))
-        game_image_url = safe_url(game.get('image_url', ''))
-        game_previous_answer = esc(game.get('previous_answer', ''))
-
-        game_section_html = ''
-        if game_content or game_image_url:
-            game_section_html += '<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">'
-            if game_image_url:
-                game_section_html += (
-                    f'<tr><td align="center" style="padding-bottom: 10px; text-align: center;">'
-                    f'<img src="{game_image_url}" width="460" '
-                    f'style="width: 100%; max-width: 460px; height: auto; border-radius: 8px; display: block; margin: 0 auto;" '
-                    f'alt="BriteSide Brain Teaser">'
-                    f'</td></tr>'
-                )
-            if game_content:
-                game_section_html += (
-                    f'<tr><td align="center" style="padding-bottom: 10px; text-align: center;">'
-                    f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; line-height: 24px; color: #444444; text-align: center;">{game_content}</p>'
-                    f'</td></tr>'
-                )
-            game_section_html += (
-                f'<tr><td align="center" style="text-align: center;">'
-                f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; font-weight: 700; color: #018181; text-align: center;">'
-                'Email Dove your answer &mdash; the winner gets 100 BriteCo Bucks!</p>'
-                f'</td></tr>'
-            )
-            if game_previous_answer:
-                game_section_html += (
-                    f'<tr><td align="center" style="padding-top: 10px; text-align: center;">'
-                    f'<table role="presentation" cellspacing="0" cellpadding="0" border="0" style="margin: 0 auto;">'
-                    f'<tr><td style="padding: 10px 14px; background-color: #f0fdf4; border-radius: 8px; border: 1px solid #86efac; text-align: center;">'
-                    f'<p style="margin: 0 0 2px 0; font-family: {FONT}; font-size: 12px; font-weight: 700; text-transform: uppercase; color: #059669; letter-spacing: 1px;">Last Month\'s Answer</p>'
-                    f'<p style="margin: 0; font-family: {FONT}; font-size: 15px; color: #272D3F;">{game_previous_answer}</p>'
-                    f'</td></tr></table>'
-                    f'</td></tr>'
-                )
-            game_section_html += '</table>'
+        game_section_html = _fragment('game', _render_game, game) if game else ''
 
         # Joke setup/punchline split (delimiter: |)
         joke_setup = esc(str(joke))
@@ -2230,23 +2789,23 @@ def render_email():
         game_display = 'table-row' if game_section_html else 'none'
         punchline_display = 'table-row' if joke_punchline else 'none'
 
-        # Build media (optional Intro add-on) section — full <tr> block or ''
-        media_html = _build_media_html(media, FONT)
+        # Media (optional Intro add-on) section — full <tr> block or ''
+        media_html = _fragment('media', _build_media_html, media, EMAIL_FONT) if media else ''
 
         # Preheader text (short preview text for email clients)
         preheader = f"The BriteSide - {month} {year}"
         if joke_setup:
             preheader = joke_setup[:100]
 
-        # Make logo paths absolute so they work in iframe previews and email clients
+        # Logo paths are made absolute (base_url) so they work in iframe
+        # previews and email clients.
         base_url = request.host_url.rstrip('/')
-        html = html.replace('/static/briteco-logo-white.png', f'{base_url}/static/briteco-logo-white.png')
 
-        # Placeholder substitution in a SINGLE regex pass. Using one pass (rather
-        # than a chain of str.replace calls) means a replacement value that
-        # happens to contain a literal "{{TOKEN}}" — e.g. an update mentioning
-        # {{GAME_SECTION}} — is never itself re-expanded into a server-built
-        # block. Unknown placeholders are left untouched.
+        # Placeholder substitution in a SINGLE pass over the compiled template's
+        # slots. Values are dropped into slots and never rescanned, so a value
+        # that happens to contain a literal "{{TOKEN}}" — e.g. an update
+        # mentioning {{GAME_SECTION}} — is never itself re-expanded into a
+        # server-built block. Unknown placeholders are left untouched.
         month_cap = str(month).capitalize() if month else ''
         spotlight_display = 'table-row' if valid_spotlights else 'none'
         replacements = {
@@ -2300,11 +2859,7 @@ def render_email():
             'GAME_DISPLAY': game_display,
             'GAME_SECTION': game_section_html,
         }
-        html = re.sub(
-            r'\{\{(\w+)\}\}',
-            lambda m: replacements.get(m.group(1), m.group(0)),
-            html,
-        )
+        html = template.render(replacements, base_url=base_url)
 
         safe_print(f"[API] Email template rendered ({len(html)} chars)")
 
@@ -2318,6 +2873,10 @@ def render_email():
                 "update_count": len(updates),
                 "has_spotlight": bool(spotlight_name),
                 "has_special_section": bool(special_title),
+                "section_cache": {
+                    section: {'hit': hit, 'hit_rate': email_sections.hit_rate(section)}
+                    for section, hit in section_hits.items()
+                },
             }
         })
 
@@ -2327,9 +2886,57 @@ def render_email():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+# One engine per worker so the pooled HTTPS connections to SendGrid are reused
+# across sends. SENDGRID_API_BASE can point at a local fake for testing.
+newsletter_delivery = SendGridDelivery(
+    api_base=os.environ.get('SENDGRID_API_BASE') or SENDGRID_API_BASE,
+    batch_size=int(os.environ.get('SENDGRID_BATCH_SIZE', '1000')),
+    max_workers=int(os.environ.get('SENDGRID_MAX_WORKERS', '4')),
+    log=safe_print,
+)
+
+# Leave headroom under gunicorn's 120s timeout for the response itself.
+SENDGRID_SEND_DEADLINE = float(os.environ.get('SENDGRID_SEND_DEADLINE', '100'))
+
+# Job mode: the send is persisted in Firestore and drained by a per-worker
+# thread pool; the builder polls /api/send-newsletter/<job_id> for progress.
+SEND_JOBS_COLLECTION = 'send_jobs'
+
+
+def _sendgrid_api_key():
+    return os.environ.get('SENDGRID_API_KEY') or os.environ.get('_SENDGRID_API_KEY')
+
+
+def _build_send_jobs():
+    if not firestore_client:
+        return None
+    jobs = SendJobs(
+        firestore_client, newsletter_delivery, _sendgrid_api_key,
+        collection=SEND_JOBS_COLLECTION,
+        chunk_size=int(os.environ.get('SEND_JOB_CHUNK_SIZE', '250')),
+        workers=int(os.environ.get('SEND_JOB_WORKERS', '2')),
+        log=safe_print,
+    )
+    # Pick up sends interrupted by a crash or redeploy of another instance.
+    # This now runs on the worker's first send-job use; the Cloud Scheduler
+    # job on /api/jobs/resume-sends covers workers that never get one.
+    jobs.start_resume_sweep()
+    return jobs
+
+
+send_jobs = LazyClient('Send jobs', _build_send_jobs, log=safe_print)
+
+
 @app.route('/api/send-newsletter', methods=['POST'])
 def send_newsletter():
-    """Send rendered newsletter HTML via SendGrid"""
+    """Send rendered newsletter HTML via SendGrid.
+
+    Recipients go out in batches of up to 1000 personalizations per API call,
+    posted concurrently; the response still reports each failed recipient.
+
+    With "background": true (and Firestore available) the send becomes a job:
+    the response is a 202 with a job_id as soon as it's persisted, and
+    GET /api/send-newsletter/<job_id> reports progress."""
     try:
         data = request.json
         recipients = data.get('recipients', [])
@@ -2347,48 +2954,46 @@ def send_newsletter():
 
         safe_print(f"[API] Sending newsletter to {len(recipients)} recipient(s): {subject}")
 
-        if not SENDGRID_AVAILABLE:
-            return jsonify({"success": False, "error": "SendGrid library not installed"}), 500
-
-        sendgrid_api_key = os.environ.get('SENDGRID_API_KEY') or os.environ.get('_SENDGRID_API_KEY')
+        sendgrid_api_key = _sendgrid_api_key()
         from_email = os.environ.get('SENDGRID_FROM_EMAIL') or SENDGRID_CONFIG['from_email']
         from_name = os.environ.get('SENDGRID_FROM_NAME') or SENDGRID_CONFIG['from_name']
 
         if not sendgrid_api_key:
             return jsonify({"success": False, "error": "SendGrid API key not configured"}), 500
 
-        sg = sendgrid.SendGridAPIClient(api_key=sendgrid_api_key)
-
-        sent_count = 0
-        errors = []
-
-        for recipient in recipients:
-            try:
-                message = Mail(
-                    from_email=(from_email, from_name),
-                    to_emails=recipient,
-                    subject=subject,
-                    html_content=html_content
+        if data.get('background'):
+            if send_jobs:
+                user = get_current_user() or {}
+                job_id = send_jobs.create(
+                    recipients, subject, html_content, from_email, from_name,
+                    created_by=user.get('email', ''), created_at=_now_iso(),
                 )
-                response = sg.send(message)
-                if response.status_code in [200, 201, 202]:
-                    sent_count += 1
-                    safe_print(f"[API] Sent to {recipient}")
-                else:
-                    errors.append(f"Failed for {recipient}: status {response.status_code}")
-                    safe_print(f"[API] Failed for {recipient}: status {response.status_code}")
-            except Exception as email_error:
-                errors.append(f"Failed for {recipient}: {str(email_error)}")
-                safe_print(f"[API] Email error for {recipient}: {email_error}")
+                return jsonify({
+                    "success": True,
+                    "job_id": job_id,
+                    "status_url": f"/api/send-newsletter/{job_id}",
+                    "total_recipients": len(recipients),
+                }), 202
+            safe_print("[API] Background send requested but Firestore is unavailable; sending inline")
+
+        report = newsletter_delivery.deliver(
+            sendgrid_api_key, recipients, subject, html_content, from_email, from_name,
+            deadline=SENDGRID_SEND_DEADLINE,
+        )
+        sent_count = report.sent_count
+        errors = report.errors()
+        for failure in errors or []:
+            safe_print(f"[API] {failure}")
 
-        safe_print(f"[API] Newsletter sent: {sent_count}/{len(recipients)} successful")
+        safe_print(f"[API] Newsletter sent: {sent_count}/{len(recipients)} successful "
+                   f"({report.api_calls} API call(s), {report.retries} retries)")
 
         return jsonify({
             "success": sent_count > 0,
             "message": f"Newsletter sent to {sent_count} of {len(recipients)} recipient(s)",
             "sent_count": sent_count,
             "total_recipients": len(recipients),
-            "errors": errors if errors else None,
+            "errors": errors,
         })
 
     except Exception as e:
@@ -2397,6 +3002,90 @@ def send_newsletter():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/api/send-newsletter/<job_id>', methods=['GET'])
+def send_newsletter_status(job_id):
+    """Progress of a background send job: counts, throughput, ETA, failures."""
+    if not send_jobs:
+        return jsonify({"success": False, "error": "Firestore not available"}), 503
+    try:
+        status = send_jobs.status(job_id)
+        if status is None:
+            return jsonify({"success": False, "error": "Send job not found"}), 404
+        return jsonify({"success": True, **status})
+    except Exception as e:
+        safe_print(f"[API] Error reading send job {job_id}: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/jobs/resume-sends', methods=['POST'])
+def jobs_resume_sends():
+    """Cloud Scheduler entrypoint: resume send jobs whose worker died —
+    authenticated by the X-Job-Secret header."""
+    auth_error = require_job_secret()
+    if auth_error:
+        return auth_error
+    if not send_jobs:
+        return jsonify({"success": False, "error": "Firestore not available"}), 503
+    try:
+        return jsonify({"success": True, "resumed": send_jobs.resume_stale()})
+    except Exception as e:
+        safe_print(f"[SEND] Resume sweep failed: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/jobs/bootstrap', methods=['POST'])
+def jobs_bootstrap():
+    """One-shot setup (media bucket public-read grant, first-run employee
+    seed), run after a deploy instead of on every worker start —
+    authenticated by the X-Job-Secret header."""
+    auth_error = require_job_secret()
+    if auth_error:
+        return auth_error
+    result = run_bootstrap()
+    ok = result['media_bucket_iam'] != 'failed' and result['employees_seeded'] is not None
+    return jsonify({"success": ok, **result}), 200 if ok else 503
+
+
+@app.route('/api/jobs/cleanup-uploads', methods=['POST'])
+def jobs_cleanup_uploads():
+    """Delete signed media uploads that were never finalized, and the
+    tombstones of finalized images, once their URLs have long expired —
+    authenticated by the X-Job-Secret header."""
+    auth_error = require_job_secret()
+    if auth_error:
+        return auth_error
+    if not gcs_client:
+        return jsonify({"success": False, "error": "GCS not available"}), 503
+    try:
+        # Twice the TTL: a PUT that starts just before the URL expires, and
+        # its finalize, still finish first.
+        deleted = sweep_signed_uploads(gcs_client.bucket(GCS_MEDIA_BUCKET), 2 * SIGNED_UPLOAD_TTL,
+                                       log=safe_print)
+        return jsonify({"success": True, "deleted": deleted})
+    except Exception as e:
+        safe_print(f"[MEDIA] Upload sweep failed: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/jobs/reindex-drafts', methods=['POST'])
+def jobs_reindex_drafts():
+    """Rebuild every draft / published listing entry from the objects'
+    content — authenticated by the X-Job-Secret header. Listing already heals
+    missing entries on its own; this is for a full re-derive."""
+    auth_error = require_job_secret()
+    if auth_error:
+        return auth_error
+    if not gcs_client:
+        return jsonify({"success": False, "error": "GCS not available"}), 503
+    try:
+        return jsonify({"success": True,
+                        "drafts": draft_index.rebuild('drafts/'),
+                        "published": draft_index.rebuild('published/')})
+    except Exception as e:
+        safe_print(f"[DRAFT INDEX] Rebuild failed: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 # ============================================================================
 # SLACK INTEGRATION
 # ============================================================================
@@ -2484,6 +3173,10 @@ def _run_user_sync(triggered_by):
         safe_print(f"[SYNC] Employee sync failed: {exc}")
         traceback.print_exc()
         return jsonify({'success': False, 'status': 'failed', 'error': str(exc)}), 500
+    finally:
+        # The sync writes the collection directly (and commits creates/updates
+        # even when the breaker trips), so always advance the roster stamp.
+        roster_cache.bump()
 
 
 @app.route('/api/jobs/sync-users', methods=['POST'])
@@ -2576,6 +3269,7 @@ register_feed(app, {
     'now': lambda: datetime.now(CHICAGO_TZ),
     'safe_print': safe_print,
     'list_employees': list_employees,
+    'roster_index': roster_index,
 })
 
 
@@ -2587,17 +3281,14 @@ def _add_submission(collection, doc):
     return ref.id
 
 
-def _list_collection(collection):
-    """Return all docs in a collection, newest first, with their id attached."""
+def _list_collection(collection, statuses=None, content_type=None):
+    """Return a collection's docs, newest first, with their id attached.
+    Status / content-type filters and the ordering run in Firestore (see
+    backend/queue_queries.py)."""
     if not firestore_client:
         return []
-    out = []
-    for d in firestore_client.collection(collection).stream():
-        item = d.to_dict() or {}
-        item['id'] = d.id
-        out.append(item)
-    out.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-    return out
+    docs, _ = query_submissions(firestore_client, collection, statuses, content_type)
+    return docs
 
 
 # ---- Contributor submission endpoints (any signed-in @brite.co user) --------
@@ -2745,13 +3436,44 @@ def get_spotlight_submission(email):
     return jsonify({'success': True, 'submission': data})
 
 
+SUBMISSION_STATUSES = ('new', 'used', 'approved', 'archived')
+SUBMISSIONS_PAGE_MAX = 200
+
+
 @app.route('/api/submissions/<sub_type>', methods=['GET'])
 def list_queue_submissions(sub_type):
-    """List a curated queue (updates / culture / corrections / nominations)."""
+    """List a curated queue (updates / culture / corrections / nominations),
+    newest first. Optional query params, all applied in Firestore:
+    ?status=new[,approved]  ?content_type=Shout-out (culture only)  ?limit=50
+    ?cursor=<token>. With a limit, `next_cursor` fetches the following page
+    (null on the last)."""
     collection = _queue_collection(sub_type)
     if not collection:
         return jsonify({'success': False, 'error': 'Unknown submission type'}), 404
-    return jsonify({'success': True, 'submissions': _list_collection(collection)})
+    if not firestore_client:
+        return jsonify({'success': True, 'submissions': [], 'next_cursor': None})
+    statuses = [x.strip() for x in (request.args.get('status') or '').split(',') if x.strip()]
+    if any(x not in SUBMISSION_STATUSES for x in statuses):
+        return jsonify({'success': False, 'error': 'Invalid status'}), 400
+    limit = None
+    if request.args.get('limit'):
+        try:
+            limit = min(max(int(request.args['limit']), 1), SUBMISSIONS_PAGE_MAX)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid limit'}), 400
+    content_type = (request.args.get('content_type') or '').strip() or None
+    if content_type and collection not in CONTENT_TYPE_COLLECTIONS:
+        return jsonify({'success': False, 'error': 'content_type is only supported for culture'}), 400
+    try:
+        docs, next_cursor = query_submissions(
+            firestore_client, collection, statuses, content_type=content_type,
+            limit=limit, cursor=(request.args.get('cursor') or '').strip() or None)
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        safe_print(f"[SUBMIT] list {collection} error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    return jsonify({'success': True, 'submissions': docs, 'next_cursor': next_cursor})
 
 
 @app.route('/api/submissions/<sub_type>/<sub_id>/status', methods=['POST'])
@@ -2778,39 +3500,117 @@ def set_submission_status(sub_type, sub_id):
 # DRAFT SAVE / LOAD ROUTES
 # ============================================================================
 
+draft_index = DraftIndex(lambda: gcs_client.bucket(GCS_DRAFTS_BUCKET),
+                         reader=BulkBlobReader(max_workers=GCS_BULK_READ_WORKERS, log=safe_print),
+                         log=safe_print)
+
+
+draft_store = DraftStore(lambda: gcs_client.bucket(GCS_DRAFTS_BUCKET), log=safe_print)
+
+
+def _draft_target(data):
+    """(month, year, blob name) a save from the builder writes to."""
+    month = (data.get('month') or 'unknown').lower()
+    year = data.get('year', datetime.now(CHICAGO_TZ).year)
+    saved_by = (data.get('savedBy') or 'unknown').split('@')[0].replace('.', '-')
+    return month, year, f"drafts/{month}-{year}-{saved_by}.json"
+
+
+def _if_generation(value):
+    """A client's ifGeneration: None (unconditional) or an int ('0' = the
+    draft must not exist yet). Raises ValueError if malformed."""
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
+def _draft_conflict(blob_name, e):
+    """409 carrying the server copy so the editor can compare, keep theirs
+    or overwrite on purpose."""
+    body = {'success': False, 'conflict': True, 'file': blob_name,
+            'error': 'Someone else saved this draft since you loaded it',
+            'generation': str(e.generation or '0'), 'draft': None}
+    try:
+        body['draft'], generation = draft_store.read(blob_name)
+        body['generation'] = str(generation)
+    except DraftNotFound:
+        pass
+    safe_print(f"[DRAFT] Conflict on {blob_name} (server at {body['generation']})")
+    return jsonify(body), 409
+
+
 @app.route('/api/save-draft', methods=['POST'])
 def save_draft():
-    """Save newsletter draft to GCS"""
+    """Save newsletter draft to GCS. With `ifGeneration` (the generation the
+    editor loaded or last saved; '0' for a new draft) the save only lands if
+    nobody saved in between, otherwise 409 with the server copy."""
     if not gcs_client:
         return jsonify({'success': False, 'error': 'GCS not available'}), 503
     try:
         data = request.json or {}
-        month = (data.get('month') or 'unknown').lower()
-        year = data.get('year', datetime.now(CHICAGO_TZ).year)
-        saved_by = (data.get('savedBy') or 'unknown').split('@')[0].replace('.', '-')
-        blob_name = f"drafts/{month}-{year}-{saved_by}.json"
+        month, year, blob_name = _draft_target(data)
+        try:
+            if_generation = _if_generation(data.get('ifGeneration'))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'Invalid ifGeneration'}), 400
 
         # Persist the FULL editor state rather than a hand-maintained whitelist,
         # so every field (extra birthday months, custom headings, additional
         # special sections, ...) round-trips on resume instead of being silently
         # dropped. Media is stored as GCS URLs, so payloads stay small.
         draft = dict(data)
+        draft.pop('ifGeneration', None)
         draft['month'] = month
         draft['year'] = year
         draft['lastSavedBy'] = data.get('savedBy', 'unknown')
         draft['lastSavedAt'] = datetime.now(CHICAGO_TZ).isoformat()
 
-        bucket = gcs_client.bucket(GCS_DRAFTS_BUCKET)
-        blob = bucket.blob(blob_name)
-        blob.upload_from_string(json.dumps(draft), content_type='application/json')
+        try:
+            generation = draft_store.write(blob_name, draft, if_generation_match=if_generation)
+        except DraftConflict as e:
+            return _draft_conflict(blob_name, e)
         safe_print(f"[DRAFT] Saved {blob_name}")
-        return jsonify({'success': True, 'file': blob_name})
+        return jsonify({'success': True, 'file': blob_name, 'generation': str(generation)})
 
     except Exception as e:
         safe_print(f"[DRAFT SAVE ERROR] {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/save-draft/patch', methods=['POST'])
+def patch_draft():
+    """Autosave just the fields that changed (see backend/draft_store.py).
+    Body: month, year, savedBy (which draft), baseGeneration (the generation
+    the last save returned, as a string), set {field: value}, unset [field].
+    Generations are returned as strings (they can exceed 2^53). A stale base
+    returns 409 with the server copy, like save_draft."""
+    if not gcs_client:
+        return jsonify({'success': False, 'error': 'GCS not available'}), 503
+    data = request.json or {}
+    _, _, blob_name = _draft_target(data)
+    if not data.get('baseGeneration'):
+        return jsonify({'success': False, 'error': 'baseGeneration is required'}), 400
+    stamp = {
+        'lastSavedBy': data.get('savedBy', 'unknown'),
+        'lastSavedAt': datetime.now(CHICAGO_TZ).isoformat(),
+    }
+    try:
+        _, generation = draft_store.patch(blob_name, data['baseGeneration'],
+                                          data.get('set'), data.get('unset'), stamp=stamp)
+    except InvalidPatch as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except DraftNotFound:
+        return jsonify({'success': False, 'error': 'Draft not found'}), 404
+    except DraftConflict as e:
+        return _draft_conflict(blob_name, e)
+    except Exception as e:
+        safe_print(f"[DRAFT PATCH ERROR] {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    fields = sorted(set(data.get('set') or {}) | set(data.get('unset') or []))
+    safe_print(f"[DRAFT] Patched {blob_name}: {', '.join(fields) or 'no fields'}")
+    return jsonify({'success': True, 'file': blob_name, 'generation': str(generation)})
+
+
 # ---------------------------------------------------------------------------
 # One-shot AI newsletter build
 # ---------------------------------------------------------------------------
@@ -2836,6 +3636,118 @@ def _auto_split_update(summary):
     return 'Company Update', text
 
 
+# Auto-build stages run on this shared pool (see backend/stage_graph.py). The
+# Claude joke gets AUTO_BUILD_JOKE_DEADLINE seconds before the build moves on
+# with a canned joke; a late call finishes on its pool thread and is dropped.
+AUTO_BUILD_WORKERS = int(os.environ.get('AUTO_BUILD_WORKERS', '8'))
+AUTO_BUILD_JOKE_DEADLINE = float(os.environ.get('AUTO_BUILD_JOKE_DEADLINE', '8'))
+_auto_build_pool = ThreadPoolExecutor(max_workers=AUTO_BUILD_WORKERS, thread_name_prefix='auto-build')
+
+
+def _auto_roster(month_num, current_year):
+    """Birthdays / anniversaries — same shapes the step-3 endpoints return."""
+    index = roster_index()
+    return index.birthdays(month_num), index.anniversaries(month_num, current_year)
+
+
+def _auto_updates():
+    """Company updates: newest unused queue entries (feed twins included),
+    up to the 5 slots the builder now has. Photos carry over (images only)."""
+    if not firestore_client:
+        return []
+    updates = []
+    for sub in iter_submissions(firestore_client, UPDATE_SUBMISSIONS, ['new'], page_size=10):
+        title, body = _auto_split_update(sub.get('summary'))
+        if not body and not title:
+            continue
+        photos = [f for f in (sub.get('files') or [])
+                  if isinstance(f, str) and _AUTO_IMG_RE.search(f)][:3]
+        updates.append({
+            'title': title,
+            'body': body,
+            'photos': photos,
+            'photo_positions': [50] * len(photos),
+            'from': sub.get('submitter_name') or sub.get('submitted_by') or '',
+        })
+        if len(updates) >= 5:
+            break
+    return updates
+
+
+def _auto_shoutouts():
+    """Shout-outs: unused culture-queue entries tagged Shout-out (feed posts
+    made with the Shout-out chip land here via dual-write)."""
+    if not firestore_client:
+        return []
+    shoutouts = []
+    for sub in iter_submissions(firestore_client, CULTURE_SUBMISSIONS, ['new'],
+                                content_type='Shout-out', page_size=10):
+        text = (sub.get('content') or '').strip()
+        if text:
+            shoutouts.append({'text': text, 'from': sub.get('submitter_name') or sub.get('submitted_by') or ''})
+        if len(shoutouts) >= 8:
+            break
+    return shoutouts
+
+
+def _auto_spotlight_pick():
+    """The most recently updated submitted spotlight profile, or None."""
+    if not firestore_client:
+        return None
+    subs = []
+    for d in firestore_client.collection(SPOTLIGHT_COLLECTION).stream():
+        s = d.to_dict() or {}
+        if s.get('status') in ('submitted', None, ''):
+            subs.append(s)
+    subs.sort(key=lambda s: s.get('updated_at', ''), reverse=True)
+    return subs[0] if subs else None
+
+
+def _auto_spotlights(s):
+    """Builder spotlight list for the picked profile (roster-enriched)."""
+    if not s:
+        return []
+    qa = [q for q in (s.get('qa') or []) if isinstance(q, dict)][:3]
+    while len(qa) < 3:
+        qa.append({'q': '', 'a': ''})
+    emp_match = get_employee((s.get('email') or '').strip().lower()) or {}
+    return [{
+        'employee': {
+            'name': s.get('name') or emp_match.get('name', ''),
+            'title': s.get('job_title') or emp_match.get('title', ''),
+            'department': emp_match.get('department', ''),
+            'email': s.get('email', ''),
+        },
+        'display_title': s.get('job_title') or emp_match.get('title', ''),
+        'blurb': s.get('describe_work', ''),
+        'fun_facts': s.get('work_with_others', ''),
+        'image_url': s.get('photo_url') or emp_match.get('photo_url', ''),
+        'video_url': '',
+        'qa': qa,
+    }]
+
+
+def _auto_joke(month_name):
+    """One Claude pun in setup|punchline form -> (joke, is_ai). Raises (and the
+    stage falls back to the canned joke) when Claude is unavailable or the
+    reply isn't usable."""
+    if not claude_client:
+        raise RuntimeError('Claude AI is not available')
+    resp = claude_client.generate_content(
+        prompt=(f"Write one short, wholesome, workplace-safe pun for a company "
+                f"newsletter opener for the month of {month_name}. Theme: jewelry "
+                f"and insurance. Return EXACTLY this format with no other text: "
+                f"setup|punchline"),
+        system_prompt=BRITESIDE_SYSTEM_PROMPT,
+        max_tokens=120,
+        temperature=0.9,
+    )
+    text = (resp.get('content') or '').strip().strip('"')
+    if '|' in text and 10 < len(text) < 300 and '\n' not in text:
+        return text, True
+    raise ValueError(f'unusable joke reply: {text[:80]!r}')
+
+
 @app.route('/api/auto-build', methods=['POST'])
 def auto_build_newsletter():
     """Compose a complete draft for a month in one shot: birthdays and
@@ -2845,7 +3757,16 @@ def auto_build_newsletter():
     caller's draft for that month (same file the builder auto-saves to) and
     returned so the frontend can resume it straight into the preview step.
     Queue statuses are NOT touched — nothing is marked used until the editor
-    actually keeps it."""
+    actually keeps it.
+
+    The roster, queue and spotlight reads and the Claude call run concurrently
+    (a StageGraph); the response's `timings` has each stage's duration and
+    status. A joke that misses AUTO_BUILD_JOKE_DEADLINE is replaced by a canned
+    one instead of holding up the build.
+
+    `ifGeneration` works as in save_draft: '0' builds only if the caller has
+    no draft for the month yet, a generation replaces exactly that draft, and
+    anything else answers 409 with the server copy."""
     if not gcs_client:
         return jsonify({'success': False, 'error': 'GCS not available'}), 503
     data = request.json or {}
@@ -2858,185 +3779,93 @@ def auto_build_newsletter():
         month_num = 0
     if not month_name or not (1 <= month_num <= 12):
         return jsonify({'success': False, 'error': 'month and month_num (1-12) are required'}), 400
+    try:
+        if_generation = _if_generation(data.get('ifGeneration'))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Invalid ifGeneration'}), 400
 
     try:
+        build_start = time.monotonic()
         current_year = int(year)
-        employees = list_employees()
-
-        # Birthdays / anniversaries — same shapes the step-3 endpoints return.
-        birthdays = sorted([
-            {
-                'name': emp.get('name', ''),
-                'email': emp.get('email', ''),
-                'department': emp.get('department', ''),
-                'title': emp.get('title', ''),
-                'birthday_day': _as_bday_int(emp.get('birthday_day')),
-                'birthday_month': _as_bday_int(emp.get('birthday_month')),
-                'image_url': emp.get('photo_url', ''),
-            }
-            for emp in employees
-            if _as_bday_int(emp.get('birthday_month')) == month_num and emp.get('active', True)
-        ], key=lambda x: x['birthday_day'])
-
-        anniversaries = []
-        for emp in employees:
-            if _as_bday_int(emp.get('anniversary_month')) != month_num or not emp.get('active', True):
-                continue
-            yr = _as_bday_int(emp.get('anniversary_year'))
-            anniversaries.append({
-                'name': emp.get('name', ''),
-                'email': emp.get('email', ''),
-                'department': emp.get('department', ''),
-                'title': emp.get('title', ''),
-                'anniversary_day': _as_bday_int(emp.get('anniversary_day')),
-                'anniversary_month': _as_bday_int(emp.get('anniversary_month')),
-                'anniversary_year': yr,
-                'years': (current_year - yr) if yr else 0,
-                'image_url': emp.get('photo_url', ''),
-            })
-        anniversaries.sort(key=lambda x: x['anniversary_day'])
-
-        # Company updates: newest unused queue entries (feed twins included),
-        # up to the 5 slots the builder now has. Photos carry over (images only).
-        updates = []
-        for sub in _list_collection(UPDATE_SUBMISSIONS):
-            if (sub.get('status') or 'new') != 'new':
-                continue
-            title, body = _auto_split_update(sub.get('summary'))
-            if not body and not title:
-                continue
-            photos = [f for f in (sub.get('files') or [])
-                      if isinstance(f, str) and _AUTO_IMG_RE.search(f)][:3]
-            updates.append({
-                'title': title,
-                'body': body,
-                'photos': photos,
-                'photo_positions': [50] * len(photos),
-                'from': sub.get('submitter_name') or sub.get('submitted_by') or '',
-            })
-            if len(updates) >= 5:
-                break
-
-        # Shout-outs: unused culture-queue entries tagged Shout-out (feed posts
-        # made with the Shout-out chip land here via dual-write).
-        shoutouts = []
-        for sub in _list_collection(CULTURE_SUBMISSIONS):
-            if (sub.get('status') or 'new') != 'new':
-                continue
-            types = sub.get('content_types') or []
-            if 'Shout-out' not in types:
-                continue
-            text = (sub.get('content') or '').strip()
-            if text:
-                shoutouts.append({'text': text, 'from': sub.get('submitter_name') or sub.get('submitted_by') or ''})
-            if len(shoutouts) >= 8:
-                break
-
-        # Spotlight: the most recently updated submitted profile, if any.
-        spotlights = []
-        try:
-            if firestore_client:
-                subs = []
-                for d in firestore_client.collection(SPOTLIGHT_COLLECTION).stream():
-                    s = d.to_dict() or {}
-                    if s.get('status') in ('submitted', None, ''):
-                        subs.append(s)
-                subs.sort(key=lambda s: s.get('updated_at', ''), reverse=True)
-                if subs:
-                    s = subs[0]
-                    qa = [q for q in (s.get('qa') or []) if isinstance(q, dict)][:3]
-                    while len(qa) < 3:
-                        qa.append({'q': '', 'a': ''})
-                    emp_match = get_employee((s.get('email') or '').strip().lower()) or {}
-                    spotlights = [{
-                        'employee': {
-                            'name': s.get('name') or emp_match.get('name', ''),
-                            'title': s.get('job_title') or emp_match.get('title', ''),
-                            'department': emp_match.get('department', ''),
-                            'email': s.get('email', ''),
-                        },
-                        'display_title': s.get('job_title') or emp_match.get('title', ''),
-                        'blurb': s.get('describe_work', ''),
-                        'fun_facts': s.get('work_with_others', ''),
-                        'image_url': s.get('photo_url') or emp_match.get('photo_url', ''),
-                        'video_url': '',
-                        'qa': qa,
-                    }]
-        except Exception as spot_err:
-            safe_print(f"[AUTO-BUILD] Spotlight pick failed (continuing without): {spot_err}")
-        if not spotlights:
-            spotlights = [{'employee': None, 'fun_facts': '', 'blurb': '', 'image_url': '',
-                           'video_url': '', 'display_title': '',
-                           'qa': [{'q': '', 'a': ''}, {'q': '', 'a': ''}, {'q': '', 'a': ''}]}]
-
-        # Joke: one Claude pun in setup|punchline form, canned fallback offline.
-        joke = _AUTO_FALLBACK_JOKES[month_num % len(_AUTO_FALLBACK_JOKES)]
-        joke_is_ai = False
-        if claude_client:
-            try:
-                resp = claude_client.generate_content(
-                    prompt=(f"Write one short, wholesome, workplace-safe pun for a company "
-                            f"newsletter opener for the month of {month_name}. Theme: jewelry "
-                            f"and insurance. Return EXACTLY this format with no other text: "
-                            f"setup|punchline"),
-                    system_prompt=BRITESIDE_SYSTEM_PROMPT,
-                    max_tokens=120,
-                    temperature=0.9,
-                )
-                text = (resp.get('content') or '').strip().strip('"')
-                if '|' in text and 10 < len(text) < 300 and '\n' not in text:
-                    joke = text
-                    joke_is_ai = True
-            except Exception as joke_err:
-                safe_print(f"[AUTO-BUILD] Joke generation failed (using fallback): {joke_err}")
 
+        # Session-bound: resolve in the request thread, not on the pool.
         user = get_current_user() or {}
         saved_by = user.get('email', 'unknown')
         prefix = saved_by.split('@')[0].replace('.', '-')
         blob_name = f"drafts/{month_name.lower()}-{current_year}-{prefix}.json"
 
-        draft = {
-            'month': month_name.lower(),
-            'year': current_year,
-            'currentStep': 9,  # land on the preview
-            'joke': joke,
-            'jokeOptions': [joke],
-            'selectedJokeIndex': 0,
-            'birthdays': birthdays,
-            'secondary_month_num': 0,
-            'extra_month_nums': [],
-            'birthday_primary_heading': '',
-            'birthday_secondary_heading': '',
-            'spotlight': spotlights[0],
-            'spotlights': spotlights,
-            'updates': updates,
-            'updatesEnabled': bool(updates),
-            'shoutouts': shoutouts,
-            'shoutoutsEnabled': True,
-            'welcomeHires': [],
-            'welcomeEnabled': False,
-            'anniversaries': anniversaries,
-            'anniversariesEnabled': bool(anniversaries),
-            'game': {'enabled': False, 'type': '', 'data': None,
-                     'imageUrl': '', 'answer': '', 'previousAnswer': ''},
-            'specialSection': {'enabled': False, 'title': '', 'body': '',
-                               'image_url': '', 'placement': 'after-updates'},
-            'specialSections': [],
-            'media': {},
-            'subject': f"The BriteSide · {month_name} {current_year}",
-            'savedBy': saved_by,
-            'lastSavedBy': saved_by,
-            'lastSavedAt': datetime.now(CHICAGO_TZ).isoformat(),
-            'autoBuilt': True,
-        }
+        def _upload(roster, updates, shoutouts, spotlights, joke_result):
+            birthdays, anniversaries = roster
+            joke, _ = joke_result
+            if not spotlights:
+                spotlights = [{'employee': None, 'fun_facts': '', 'blurb': '', 'image_url': '',
+                               'video_url': '', 'display_title': '',
+                               'qa': [{'q': '', 'a': ''}, {'q': '', 'a': ''}, {'q': '', 'a': ''}]}]
+            draft = {
+                'month': month_name.lower(),
+                'year': current_year,
+                'currentStep': 9,  # land on the preview
+                'joke': joke,
+                'jokeOptions': [joke],
+                'selectedJokeIndex': 0,
+                'birthdays': birthdays,
+                'secondary_month_num': 0,
+                'extra_month_nums': [],
+                'birthday_primary_heading': '',
+                'birthday_secondary_heading': '',
+                'spotlight': spotlights[0],
+                'spotlights': spotlights,
+                'updates': updates,
+                'updatesEnabled': bool(updates),
+                'shoutouts': shoutouts,
+                'shoutoutsEnabled': True,
+                'welcomeHires': [],
+                'welcomeEnabled': False,
+                'anniversaries': anniversaries,
+                'anniversariesEnabled': bool(anniversaries),
+                'game': {'enabled': False, 'type': '', 'data': None,
+                         'imageUrl': '', 'answer': '', 'previousAnswer': ''},
+                'specialSection': {'enabled': False, 'title': '', 'body': '',
+                                   'image_url': '', 'placement': 'after-updates'},
+                'specialSections': [],
+                'media': {},
+                'subject': f"The BriteSide · {month_name} {current_year}",
+                'savedBy': saved_by,
+                'lastSavedBy': saved_by,
+                'lastSavedAt': datetime.now(CHICAGO_TZ).isoformat(),
+                'autoBuilt': True,
+            }
+            draft_store.write(blob_name, draft, if_generation_match=if_generation)
+            return spotlights
+
+        fallback_joke = (_AUTO_FALLBACK_JOKES[month_num % len(_AUTO_FALLBACK_JOKES)], False)
+        graph = StageGraph(_auto_build_pool, log=safe_print)
+        graph.add('roster', lambda: _auto_roster(month_num, current_year))
+        graph.add('updates', _auto_updates)
+        graph.add('shoutouts', _auto_shoutouts)
+        # A spotlight failure continues without one, as before.
+        graph.add('spotlight_pick', _auto_spotlight_pick, fallback=None)
+        graph.add('spotlight', _auto_spotlights, deps=('spotlight_pick',), fallback=[])
+        graph.add('joke', lambda: _auto_joke(month_name),
+                  deadline=AUTO_BUILD_JOKE_DEADLINE, fallback=fallback_joke)
+        graph.add('upload', _upload, deps=('roster', 'updates', 'shoutouts', 'spotlight', 'joke'))
+        try:
+            results, timings = graph.run()
+        except DraftConflict as e:
+            return _draft_conflict(blob_name, e)
+
+        birthdays, anniversaries = results['roster']
+        updates = results['updates']
+        shoutouts = results['shoutouts']
+        spotlights = results['upload']
+        joke_is_ai = results['joke'][1]
+        total_ms = int((time.monotonic() - build_start) * 1000)
 
-        bucket = gcs_client.bucket(GCS_DRAFTS_BUCKET)
-        bucket.blob(blob_name).upload_from_string(
-            json.dumps(draft), content_type='application/json')
         safe_print(f"[AUTO-BUILD] {blob_name}: {len(birthdays)} bdays, "
                    f"{len(anniversaries)} annivs, {len(updates)} updates, "
                    f"{len(shoutouts)} shoutouts, "
-                   f"spotlight={bool(spotlights[0].get('employee'))}, ai_joke={joke_is_ai}")
+                   f"spotlight={bool(spotlights[0].get('employee'))}, ai_joke={joke_is_ai}, "
+                   f"{total_ms}ms")
         return jsonify({
             'success': True,
             'file': blob_name,
@@ -3048,6 +3877,7 @@ def auto_build_newsletter():
                 'spotlight': bool(spotlights[0].get('employee')),
                 'ai_joke': joke_is_ai,
             },
+            'timings': {'total_ms': total_ms, 'stages': timings},
         })
     except Exception as e:
         safe_print(f"[AUTO-BUILD ERROR] {e}")
@@ -3056,31 +3886,11 @@ def auto_build_newsletter():
 
 @app.route('/api/list-drafts', methods=['GET'])
 def list_drafts():
-    """List all saved drafts from GCS"""
+    """List all saved drafts from GCS (one list call; see backend/draft_index.py)"""
     if not gcs_client:
         return jsonify({'success': True, 'drafts': []})
     try:
-        bucket = gcs_client.bucket(GCS_DRAFTS_BUCKET)
-        blobs = bucket.list_blobs(prefix='drafts/')
-        drafts = []
-        for blob in blobs:
-            if not blob.name.endswith('.json'):
-                continue
-            try:
-                data = json.loads(blob.download_as_text())
-            except Exception as blob_err:
-                # One corrupt/partial object must not blank the whole list.
-                safe_print(f"[DRAFT LIST] Skipping unreadable {blob.name}: {blob_err}")
-                continue
-            drafts.append({
-                'month': data.get('month'),
-                'year': data.get('year'),
-                'currentStep': data.get('currentStep'),
-                'lastSavedBy': data.get('lastSavedBy'),
-                'lastSavedAt': data.get('lastSavedAt'),
-                'filename': blob.name,
-            })
-        drafts.sort(key=lambda d: d.get('lastSavedAt', ''), reverse=True)
+        drafts = draft_index.list('drafts/', label='DRAFT LIST')
         return jsonify({'success': True, 'drafts': drafts})
     except Exception as e:
         safe_print(f"[DRAFT LIST ERROR] {str(e)}")
@@ -3089,24 +3899,85 @@ def list_drafts():
 
 @app.route('/api/load-draft', methods=['GET'])
 def load_draft():
-    """Load a specific draft from GCS"""
+    """Load a specific draft from GCS, with its generation (the ifGeneration
+    for the next save). ?generation= loads an older version from history."""
     if not gcs_client:
         return jsonify({'success': False, 'error': 'GCS not available'}), 503
     try:
         filename = _validate_gcs_key(request.args.get('file'), ('drafts/',))
         if not filename:
             return jsonify({'success': False, 'error': 'Invalid draft file'}), 400
-        bucket = gcs_client.bucket(GCS_DRAFTS_BUCKET)
-        blob = bucket.blob(filename)
-        if not blob.exists():
+        try:
+            data, generation = draft_store.read(filename, _if_generation(request.args.get('generation')))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid generation'}), 400
+        except DraftNotFound:
             return jsonify({'success': False, 'error': 'Draft not found'}), 404
-        data = json.loads(blob.download_as_text())
-        return jsonify({'success': True, 'draft': data})
+        return jsonify({'success': True, 'draft': data, 'generation': str(generation)})
     except Exception as e:
         safe_print(f"[DRAFT LOAD ERROR] {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/draft-history', methods=['GET'])
+def draft_history():
+    """Retained versions of a draft, newest first (see backend/draft_store.py).
+    ?compare=<generation> adds, per version, the top-level fields that differ
+    from that one."""
+    if not gcs_client:
+        return jsonify({'success': False, 'error': 'GCS not available'}), 503
+    filename = _validate_gcs_key(request.args.get('file'), ('drafts/',))
+    if not filename:
+        return jsonify({'success': False, 'error': 'Invalid draft file'}), 400
+    try:
+        versions, versioning = draft_store.history(filename)
+        compare = request.args.get('compare')
+        if compare:
+            base, _ = draft_store.read(filename, _if_generation(compare))
+            for v in versions:
+                other, _ = draft_store.read(filename, v['generation'])
+                v['changed'] = diff_fields(base, other)
+        return jsonify({'success': True, 'file': filename, 'versions': versions,
+                        'versioning_enabled': versioning})
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid generation'}), 400
+    except DraftNotFound:
+        return jsonify({'success': False, 'error': 'Version not found'}), 404
+    except Exception as e:
+        safe_print(f"[DRAFT HISTORY ERROR] {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/restore-draft', methods=['POST'])
+def restore_draft():
+    """Make an older version the live draft: {file, generation, ifGeneration}.
+    The copy being replaced stays in history."""
+    if not gcs_client:
+        return jsonify({'success': False, 'error': 'GCS not available'}), 503
+    data = request.json or {}
+    filename = _validate_gcs_key(data.get('file'), ('drafts/',))
+    if not filename:
+        return jsonify({'success': False, 'error': 'Invalid draft file'}), 400
+    try:
+        source = _if_generation(data.get('generation'))
+        if_generation = _if_generation(data.get('ifGeneration'))
+        if not source:
+            raise ValueError('generation is required')
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Invalid generation'}), 400
+    try:
+        generation = draft_store.restore(filename, source, if_generation_match=if_generation)
+    except DraftConflict as e:
+        return _draft_conflict(filename, e)
+    except DraftNotFound:
+        return jsonify({'success': False, 'error': 'Version not found'}), 404
+    except Exception as e:
+        safe_print(f"[DRAFT RESTORE ERROR] {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    safe_print(f"[DRAFT] Restored {filename} from generation {source}")
+    return jsonify({'success': True, 'file': filename, 'generation': str(generation)})
+
+
 @app.route('/api/delete-draft', methods=['DELETE'])
 def delete_draft():
     """Delete a draft from GCS"""
@@ -3144,6 +4015,7 @@ def publish_draft():
         # is always distinct — no risk of copying an object onto itself and then
         # deleting it (which previously destroyed non-drafts files).
         published_name = 'published/' + filename[len('drafts/'):]
+        # copy_blob carries the listing metadata over with the content.
         bucket.copy_blob(source_blob, bucket, published_name)
         source_blob.delete()
         safe_print(f"[DRAFT] Published {filename} -> {published_name}")
@@ -3155,29 +4027,14 @@ def publish_draft():
 
 @app.route('/api/list-published', methods=['GET'])
 def list_published():
-    """List all published newsletters from GCS"""
+    """List all published newsletters from GCS (one list call)"""
     if not gcs_client:
         return jsonify({'success': True, 'newsletters': []})
     try:
-        bucket = gcs_client.bucket(GCS_DRAFTS_BUCKET)
-        blobs = list(bucket.list_blobs(prefix='published/'))
-        newsletters = []
-        for blob in blobs:
-            if not blob.name.endswith('.json'):
-                continue
-            try:
-                data = json.loads(blob.download_as_text())
-            except Exception as blob_err:
-                safe_print(f"[PUBLISHED LIST] Skipping unreadable {blob.name}: {blob_err}")
-                continue
-            newsletters.append({
-                'filename': blob.name,
-                'month': data.get('month'),
-                'year': data.get('year'),
-                'lastSavedBy': data.get('lastSavedBy'),
-                'lastSavedAt': data.get('lastSavedAt'),
-            })
-        newsletters.sort(key=lambda d: d.get('lastSavedAt', ''), reverse=True)
+        newsletters = [
+            {k: row[k] for k in ('filename', 'month', 'year', 'lastSavedBy', 'lastSavedAt')}
+            for row in draft_index.list('published/', label='PUBLISHED LIST')
+        ]
         return jsonify({'success': True, 'newsletters': newsletters})
     except Exception as e:
         safe_print(f"[PUBLISHED LIST ERROR] {str(e)}")
@@ -3197,7 +4054,7 @@ def load_published():
         blob = bucket.blob(filename)
         if not blob.exists():
             return jsonify({'success': False, 'error': 'Not found'}), 404
-        data = json.loads(blob.download_as_text())
+        data = download_json(blob)
         return jsonify({'success': True, 'draft': data})
     except Exception as e:
         safe_print(f"[PUBLISHED LOAD ERROR] {str(e)}")
@@ -3229,8 +4086,18 @@ def delete_published():
 
 @app.route('/static/<path:filename>')
 def serve_static(filename):
-    """Serve static files"""
-    return send_from_directory('static', filename)
+    """Serve static files. Fingerprinted names (static_assets.url) are
+    cached for a year as immutable; plain names revalidate by ETag."""
+    asset = static_assets.resolve(filename)
+    if asset is None:
+        return send_from_directory(static_assets.directory, filename)
+    path, etag, immutable = asset
+    response = send_from_directory(static_assets.directory, path, etag=etag,
+                                   max_age=IMMUTABLE_MAX_AGE if immutable else None)
+    if immutable:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+    return response
 
 
 @app.route('/templates/<path:filename>')
@@ -3247,12 +4114,15 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5002))
     debug = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
 
+    # No Cloud Scheduler locally: run the one-shot setup at startup as before.
+    run_bootstrap()
+
     print(f"\n{'='*60}")
     print(f"  The BriteSide - Internal Newsletter Generator")
     print(f"  Running on http://localhost:{port}")
     print(f"{'='*60}")
     print(f"  Claude:   {'Available' if claude_client else 'Not available'}")
-    print(f"  SendGrid: {'Available' if SENDGRID_AVAILABLE else 'Not available'}")
+    print(f"  SendGrid: {'Configured' if _sendgrid_api_key() else 'No API key'}")
     print(f"  GCS:      {'Available' if gcs_client else 'Not available'}")
     print(f"  OAuth:    {'Configured' if not is_local_dev() else 'Skipped (local dev)'}")
     print(f"{'='*60}\n")
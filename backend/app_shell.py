@@ -0,0 +1,125 @@
+"""The SPA shell (index.html), loaded once per worker and served precompressed.
+
+_serve_app used to open and read the ~400KB index.html on every hit to / and
+/entry, str.replace a per-user <script> in front of </head>, and send the
+whole thing uncompressed. AppShell reads the file once and splits it at that
+marker. A page is then a three-part join: head + user script + tail.
+
+Compression. The user script sits between two large static halves, so a
+gzip body can't simply be cached. It can be spliced, though. Each half is
+deflated ONCE, by its own compressor, into raw DEFLATE blocks: the head ends
+with a sync flush (byte-aligned, not final) and the tail with the final
+block. Because every segment starts from an empty window, none of them
+refers back into another. Per request only the few hundred bytes of the user
+script are deflated between the two, and the gzip header and trailer go
+around them. The trailer's CRC-32 is the only part that depends on the whole
+body. CRC-32 is affine in its starting value, so crc32(tail, c) is a fixed
+XOR of per-bit columns of c, precomputed when the tail is built. The
+per-request cost doesn't grow with the page.
+
+Brotli streams can't be spliced like this: every brotli body would mean
+recompressing the whole page. Clients that only take br get the plain join.
+
+With hot_reload on (local dev), each render stats the file and rebuilds when
+its mtime changes, like the email TemplateRegistry. An optional `transform`
+runs over the text first (app.py fingerprints /static/ URLs with it).
+"""
+
+import os
+import struct
+import threading
+import zlib
+
+# gzip member header: magic, CM=deflate, no flags, no mtime, XFL=2 (best
+# compression), OS=255 (unknown).
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\xff'
+
+
+def _deflate(data, final, level=9):
+    co = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return co.compress(data) + co.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _Compiled:
+    """One version of the shell: the split text plus its gzip pieces."""
+
+    def __init__(self, text, marker):
+        head, found, tail = text.partition(marker)
+        if not found:
+            raise ValueError(f'{marker!r} not found in the app shell')
+        self.head = head.encode('utf-8')
+        self.tail = (marker + tail).encode('utf-8')
+        self.size = len(self.head) + len(self.tail)
+        self.gz_head = _GZIP_HEADER + _deflate(self.head, final=False)
+        self.gz_tail = _deflate(self.tail, final=True)
+        self.crc_head = zlib.crc32(self.head)
+        # crc32(tail, c) == crc_tail_base ^ XOR of crc_columns[i] for each set bit i of c
+        self.crc_tail_base = zlib.crc32(self.tail, 0)
+        self.crc_columns = [zlib.crc32(self.tail, 1 << i) ^ self.crc_tail_base for i in range(32)]
+
+    def crc_through_tail(self, crc):
+        out = self.crc_tail_base
+        i = 0
+        while crc:
+            if crc & 1:
+                out ^= self.crc_columns[i]
+            crc >>= 1
+            i += 1
+        return out
+
+    def gzip(self, insert):
+        """One gzip member for head + insert + tail."""
+        crc = self.crc_through_tail(zlib.crc32(insert, self.crc_head))
+        length = (self.size + len(insert)) & 0xffffffff
+        return b''.join((self.gz_head, _deflate(insert, final=False, level=6),
+                         self.gz_tail, struct.pack('<II', crc, length)))
+
+
+class AppShell:
+    """The SPA shell, with a per-request insert placed just before `marker`.
+
+    render(insert, gzip=...) returns (body bytes, content encoding or None).
+    Raises FileNotFoundError if the file is missing."""
+
+    def __init__(self, path, marker='</head>', hot_reload=False, transform=None, log=print):
+        self.path = path
+        self._marker = marker
+        self._transform = transform or (lambda text: text)
+        self._hot_reload = hot_reload
+        self._log = log
+        self._lock = threading.Lock()
+        self._entry = None      # (mtime, _Compiled)
+        try:
+            self._compile()
+        except OSError as e:
+            self._log(f"[WARNING] App shell '{path}' not loaded: {e}")
+
+    def _compile(self):
+        mtime = os.path.getmtime(self.path)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            compiled = _Compiled(self._transform(f.read()), self._marker)
+        with self._lock:
+            self._entry = (mtime, compiled)
+        return compiled
+
+    def _current(self):
+        entry = self._entry
+        if entry is None:
+            # Missing at startup (or removed): retry so a restored file heals.
+            return self._compile()
+        if self._hot_reload:
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                return entry[1]
+            if mtime != entry[0]:
+                self._log(f"[APP SHELL] Reloading changed {self.path}")
+                return self._compile()
+        return entry[1]
+
+    def render(self, insert, gzip=False):
+        compiled = self._current()
+        insert = insert.encode('utf-8')
+        if gzip:
+            return compiled.gzip(insert), 'gzip'
+        return b''.join((compiled.head, insert, compiled.tail)), None
@@ -0,0 +1,195 @@
+"""gzip / brotli response compression, as WSGI middleware.
+
+Every JSON API and the rendered newsletter went out uncompressed. That
+includes /api/render-email, which wraps the full email HTML in JSON, and the
+feed, directory, employee and draft listings. Those are text, and they shrink
+several times over. CompressionMiddleware wraps app.wsgi_app next to ProxyFix
+and compresses on the way out.
+
+Encoding choice: whichever of br and gzip the client ranks higher by q-value
+(br on a tie, and only when the `brotli` package is installed); the body is
+sent unchanged when it accepts neither. Compressible
+responses always get Vary: Accept-Encoding.
+
+A response is left alone when:
+  - its type isn't text-like (images, video, and PDFs are already compressed),
+  - it is text/event-stream (an SSE stream must reach the client event by
+    event, unbuffered),
+  - it already has a Content-Encoding (e.g. the gzip-spliced app shell),
+  - it is smaller than `min_size`, carries no-transform, is a HEAD/204/304/206.
+
+Two modes. A response with a Content-Length is compressed whole, and is sent
+with its new Content-Length. One without (a streamed generator) is compressed
+chunk by chunk, each chunk flushed, so the client still sees every chunk as
+soon as the app yields it.
+
+Never imports app.py.
+"""
+
+import zlib
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+SKIP_TYPES = ('text/event-stream',)
+_SKIP_STATUS = ('204', '206', '304')
+
+
+class _Gzip:
+    def __init__(self, level):
+        self._c = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data):
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data=b''):
+        return self._c.compress(data) + self._c.flush()
+
+
+class _Brotli:
+    def __init__(self, quality):
+        self._c = brotli.Compressor(quality=quality)
+
+    def chunk(self, data):
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self, data=b''):
+        return self._c.process(data) + self._c.finish()
+
+
+def _header(headers, name):
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _without(headers, *names):
+    names = {n.lower() for n in names}
+    return [(k, v) for k, v in headers if k.lower() not in names]
+
+
+def _add_vary(headers):
+    vary = _header(headers, 'Vary')
+    if vary is None:
+        return headers + [('Vary', 'Accept-Encoding')]
+    if 'accept-encoding' in vary.lower() or vary.strip() == '*':
+        return headers
+    return _without(headers, 'Vary') + [('Vary', f'{vary}, Accept-Encoding')]
+
+
+class CompressionMiddleware:
+    """Compress text-like responses for clients that accept gzip or br."""
+
+    def __init__(self, app, min_size=1024, gzip_level=6, brotli_quality=5):
+        self.app = app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoding(self, environ):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return None
+        accept = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        br = accept.quality('br') if brotli is not None else 0
+        gzip = accept.quality('gzip')
+        # The client's preference wins; br only on a tie (it's smaller).
+        if br > 0 and br >= gzip:
+            return 'br'
+        if gzip > 0:
+            return 'gzip'
+        return None
+
+    def _compressor(self, encoding):
+        if encoding == 'br':
+            return _Brotli(self.brotli_quality)
+        return _Gzip(self.gzip_level)
+
+    def _plan(self, status, headers, encoding):
+        """(mode, headers): mode is None (send as is), 'whole' or 'stream'."""
+        mimetype = (_header(headers, 'Content-Type') or '').split(';')[0].strip().lower()
+        if not mimetype.startswith(COMPRESSIBLE_TYPES) or mimetype in SKIP_TYPES:
+            return None, headers
+        headers = _add_vary(headers)
+        if (encoding is None or status[:3] in _SKIP_STATUS
+                or _header(headers, 'Content-Encoding') is not None
+                or 'no-transform' in (_header(headers, 'Cache-Control') or '')):
+            return None, headers
+        length = _header(headers, 'Content-Length')
+        if length is not None:
+            try:
+                if int(length) < self.min_size:
+                    return None, headers
+            except ValueError:
+                return None, headers
+        etag = _header(headers, 'ETag')
+        headers = _without(headers, 'Content-Length', 'ETag') + [('Content-Encoding', encoding)]
+        if etag and not etag.startswith('W/'):
+            # The bytes differ from the identity body the strong tag names.
+            headers.append(('ETag', 'W/' + etag))
+        return ('whole' if length is not None else 'stream'), headers
+
+    def __call__(self, environ, start_response):
+        encoding = self._encoding(environ)
+        state = {}
+
+        def _start(status, headers, exc_info=None):
+            if state.get('late'):
+                # start_response from inside the body iterator: too late to
+                # wrap the body, so the response goes out as is.
+                return start_response(status, headers, exc_info)
+            mode, headers = self._plan(status, list(headers), encoding)
+            state['mode'] = mode
+            if mode == 'whole':
+                # Sent once the body's compressed size is known.
+                state['start'] = (status, headers, exc_info)
+                state['written'] = []
+                return state['written'].append
+            if mode == 'stream':
+                compressor = state['compressor'] = self._compressor(encoding)
+                write = start_response(status, headers, exc_info)
+                return lambda data: write(compressor.chunk(data))
+            return start_response(status, headers, exc_info)
+
+        body = self.app(environ, _start)
+        if 'mode' not in state:
+            state['late'] = True
+            return body
+        if state['mode'] == 'whole':
+            return self._whole(body, state, encoding, start_response)
+        if state['mode'] == 'stream':
+            return self._stream(body, state['compressor'])
+        return body
+
+    def _whole(self, body, state, encoding, start_response):
+        try:
+            data = b''.join(state['written']) + b''.join(body)
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+        status, headers, exc_info = state['start']
+        data = self._compressor(encoding).finish(data)
+        start_response(status, headers + [('Content-Length', str(len(data)))], exc_info)
+        return [data]
+
+    def _stream(self, body, compressor):
+        try:
+            for data in body:
+                if data:
+                    yield compressor.chunk(data)
+            yield compressor.finish()
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
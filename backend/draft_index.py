@@ -0,0 +1,126 @@
+"""Draft / published listing without downloading every draft.
+
+/api/list-drafts and /api/list-published used to download and json.loads every
+full draft in the bucket just to show month, year, step and who saved it last,
+so the listing got slower with every issue ever made.
+
+The index lives on the objects themselves: every draft is uploaded with a
+small custom-metadata entry (INDEX_KEY) holding those fields. Listing is then
+one list_blobs call, because the listing response already includes each
+object's metadata. The index travels with the object. A save rewrites it
+together with the content, copy_blob (publish) carries it over, and a delete
+removes it, so there is no separate manifest to keep in step.
+
+Self-healing: an object with no index entry, or one written under an older
+INDEX_VERSION, is downloaded once while listing (drafts from before this
+change, or a blob written by some other tool). Its fields are patched back
+onto it, guarded by if_generation_match so a concurrent save always wins, and
+later listings are back to metadata only. Unreadable objects are skipped, as
+before. Those reads (and a full rebuild) go through a BulkBlobReader when one
+is given, so a bucket full of old drafts heals concurrently.
+
+Never imports app.py; the bucket is passed in.
+"""
+
+import json
+
+from backend.json_blobs import download_json
+
+INDEX_KEY = 'draft-index'
+INDEX_VERSION = 1
+INDEX_FIELDS = ('month', 'year', 'currentStep', 'lastSavedBy', 'lastSavedAt')
+
+
+def index_metadata(draft):
+    """Custom metadata to upload with `draft` (set as blob.metadata)."""
+    entry = {k: draft.get(k) for k in INDEX_FIELDS}
+    entry['v'] = INDEX_VERSION
+    return {INDEX_KEY: json.dumps(entry, separators=(',', ':'))}
+
+
+def _entry(blob):
+    """The blob's index entry, or None if it is missing or outdated."""
+    raw = (blob.metadata or {}).get(INDEX_KEY)
+    if not raw:
+        return None
+    try:
+        entry = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or entry.get('v') != INDEX_VERSION:
+        return None
+    return entry
+
+
+class DraftIndex:
+    """list() a prefix of the drafts bucket from object metadata alone."""
+
+    def __init__(self, bucket, reader=None, log=print):
+        self._bucket = bucket
+        self._reader = reader
+        self._log = log
+
+    def list(self, prefix, label='DRAFT LIST'):
+        """[{filename, generation, month, year, currentStep, lastSavedBy,
+        lastSavedAt}] for every readable .json under `prefix`, newest save
+        first."""
+        out, unindexed = [], []
+        for blob in self._bucket().list_blobs(prefix=prefix):
+            if not blob.name.endswith('.json'):
+                continue
+            entry = _entry(blob)
+            if entry is None:
+                unindexed.append(blob)
+                continue
+            out.append(self._row(blob, entry))
+        for blob, entry in self._heal_all(unindexed, label):
+            if entry is not None:
+                out.append(self._row(blob, entry))
+        out.sort(key=lambda d: d.get('lastSavedAt') or '', reverse=True)
+        return out
+
+    def rebuild(self, prefix, label='DRAFT INDEX'):
+        """Re-derive every entry under `prefix` from the content, including
+        ones that look current. Returns {'indexed': n, 'skipped': n}."""
+        blobs = [b for b in self._bucket().list_blobs(prefix=prefix) if b.name.endswith('.json')]
+        counts = {'indexed': 0, 'skipped': 0}
+        for _, entry in self._heal_all(blobs, label):
+            counts['indexed' if entry is not None else 'skipped'] += 1
+        return counts
+
+    def _heal_all(self, blobs, label):
+        """[(blob, entry or None)] for each blob, read concurrently when a
+        reader was given."""
+        if self._reader is None:
+            return [(blob, self._heal(blob, label)) for blob in blobs]
+        return [(blob, entry) for blob, entry, _ in
+                self._reader.map(lambda blob: self._heal(blob, label), blobs)]
+
+    @staticmethod
+    def _row(blob, entry):
+        row = {k: entry.get(k) for k in INDEX_FIELDS}
+        row['filename'] = blob.name
+        row['generation'] = str(blob.generation)
+        return row
+
+    def _heal(self, blob, label):
+        """Read one unindexed draft and write its index entry back."""
+        try:
+            data = download_json(blob)
+        except Exception as e:
+            # One corrupt/partial object must not blank the whole list.
+            self._log(f"[{label}] Skipping unreadable {blob.name}: {e}")
+            return None
+        if not isinstance(data, dict):
+            self._log(f"[{label}] Skipping {blob.name}: not a draft object")
+            return None
+        metadata = index_metadata(data)
+        try:
+            blob.metadata = dict(blob.metadata or {}, **metadata)
+            blob.patch(if_generation_match=blob.generation)
+            self._log(f"[{label}] Indexed {blob.name}")
+        except Exception as e:
+            # Lost a race with a save (which wrote its own entry) or no
+            # permission to patch: the listing is still right this time.
+            self._log(f"[{label}] Could not index {blob.name}: {e}")
+        return json.loads(metadata[INDEX_KEY])
@@ -0,0 +1,216 @@
+"""Draft reads, writes and field-level patches against GCS.
+
+The builder autosaves on every step change, and save_draft used to receive and
+upload the entire editor state each time, whatever had actually changed.
+patch() takes just the changed top-level fields instead:
+
+    {"baseGeneration": 1712..., "set": {"updates": [...]}, "unset": ["game"]}
+
+The client's version number is the GCS object generation it last saw. The
+patch is applied to the stored draft only if that is still the current
+generation. The read is pinned to that generation and the upload carries
+if_generation_match, so two editors can't silently overwrite each other
+between the read and the write. Either race surfaces as DraftConflict, with
+the generation the caller should rebase on.
+
+GCS has no partial object writes, so the object itself is still rewritten.
+That rewrite stays inside Google's network; what scales with the edit is the
+autosave request. The builder compacts by sending a full snapshot every
+few patches (and after any conflict), which re-baselines it against the
+stored copy.
+
+Versions. The generation is also the version token for whole-draft saves:
+write(if_generation_match=...) refuses to overwrite a draft that another
+editor (or an auto-build) saved since the caller loaded it, and the endpoint
+answers 409 with the server copy. Older generations are kept by GCS Object
+Versioning on the drafts bucket, so history() can list them from object
+metadata alone (each generation carries its own listing entry), read() can
+fetch any of them for a diff, and restore() copies one back on top. Turn
+versioning on and bound it with the lifecycle rules in
+gcs-drafts-lifecycle.json:
+
+    gcloud storage buckets update gs://<drafts bucket> --versioning \
+        --lifecycle-file=gcs-drafts-lifecycle.json
+
+Without versioning, history() reports versioning_enabled=False and lists only
+the live copy.
+
+Every write goes through write(), which stamps the listing entry from
+backend/draft_index.py and stores the JSON gzipped (backend/json_blobs.py).
+Never imports app.py; the bucket is passed in.
+"""
+
+import json
+
+from backend.draft_index import index_metadata, INDEX_KEY
+from backend.json_blobs import upload_json, download_json
+
+try:
+    from google.api_core import exceptions as gcloud_exceptions
+except ImportError:  # pragma: no cover - google-cloud-storage is in requirements
+    gcloud_exceptions = None
+
+# Fields that decide which object a draft lives in; a patch can't move it.
+RESERVED_FIELDS = ('month', 'year', 'lastSavedBy', 'lastSavedAt')
+
+
+class DraftConflict(Exception):
+    """The stored draft moved past the caller's base generation."""
+
+    def __init__(self, generation):
+        super().__init__('Draft was changed by another save')
+        self.generation = generation
+
+
+class DraftNotFound(Exception):
+    pass
+
+
+class InvalidPatch(ValueError):
+    pass
+
+
+def apply_patch(draft, set_fields=None, unset_fields=None):
+    """Return a copy of `draft` with top-level `set_fields` replaced and
+    `unset_fields` removed. Raises InvalidPatch on a malformed patch."""
+    set_fields = set_fields or {}
+    unset_fields = unset_fields or []
+    if not isinstance(set_fields, dict) or not isinstance(unset_fields, list):
+        raise InvalidPatch("'set' must be an object and 'unset' a list")
+    if not all(isinstance(k, str) for k in unset_fields):
+        raise InvalidPatch("'unset' must list field names")
+    touched = set(set_fields) | set(unset_fields)
+    blocked = touched.intersection(RESERVED_FIELDS)
+    if blocked:
+        raise InvalidPatch(f"Can't patch {', '.join(sorted(blocked))}")
+    out = dict(draft)
+    out.update(set_fields)
+    for key in unset_fields:
+        out.pop(key, None)
+    return out
+
+
+class DraftStore:
+    """Drafts as JSON objects in the drafts bucket."""
+
+    def __init__(self, bucket, log=print):
+        self._bucket = bucket
+        self._log = log
+        self._versioning = None     # bucket setting, looked up once
+
+    def read(self, name, generation=None):
+        """(draft, generation) for the live object, or for an older
+        `generation` of it. Raises DraftNotFound."""
+        if generation:
+            blob = self._bucket().blob(name, generation=int(generation))
+            try:
+                return download_json(blob), int(generation)
+            except _not_found() as e:
+                raise DraftNotFound(name) from e
+        blob = self._bucket().get_blob(name)
+        if blob is None:
+            raise DraftNotFound(name)
+        return download_json(blob, if_generation_match=blob.generation), blob.generation
+
+    def history(self, name):
+        """Every retained generation of `name`, newest first:
+        ({generation, live, lastSavedBy, lastSavedAt, currentStep, size},
+        versioning_enabled). No object downloads."""
+        bucket = self._bucket()
+        versions = []
+        for blob in bucket.list_blobs(prefix=name, versions=True):
+            if blob.name != name:
+                continue
+            try:
+                entry = json.loads((blob.metadata or {}).get(INDEX_KEY) or '{}')
+            except ValueError:
+                entry = {}
+            versions.append({
+                'generation': str(blob.generation),
+                'live': getattr(blob, 'time_deleted', None) is None,
+                'lastSavedBy': entry.get('lastSavedBy'),
+                'lastSavedAt': entry.get('lastSavedAt'),
+                'currentStep': entry.get('currentStep'),
+                'size': blob.size,
+            })
+        versions.sort(key=lambda v: int(v['generation']), reverse=True)
+        # Only the newest generation can be live; a deleted draft has none.
+        for v in versions[1:]:
+            v['live'] = False
+        return versions, self._versioning_enabled(bucket)
+
+    def restore(self, name, generation, if_generation_match=None):
+        """Make an older generation the live draft again (a server-side copy;
+        the current copy stays in history). Returns the new generation."""
+        bucket = self._bucket()
+        source = bucket.blob(name, generation=int(generation))
+        try:
+            restored = bucket.copy_blob(source, bucket, name, source_generation=int(generation),
+                                        if_generation_match=if_generation_match)
+        except _precondition_failed() as e:
+            raise DraftConflict(self._generation(name)) from e
+        except _not_found() as e:
+            raise DraftNotFound(name) from e
+        return restored.generation
+
+    def write(self, name, draft, if_generation_match=None):
+        """Upload `draft` with its listing entry. Returns the new generation.
+        With if_generation_match (0 = must not exist yet), raises
+        DraftConflict when the object has moved on."""
+        blob = self._bucket().blob(name)
+        blob.metadata = index_metadata(draft)
+        try:
+            upload_json(blob, draft, if_generation_match=if_generation_match)
+        except _precondition_failed() as e:
+            raise DraftConflict(self._generation(name)) from e
+        return blob.generation
+
+    def patch(self, name, base_generation, set_fields=None, unset_fields=None, stamp=None):
+        """Apply a field-level patch on top of `base_generation`.
+        `stamp` fields (lastSavedBy / lastSavedAt) are set by the server.
+        Returns (draft, generation)."""
+        blob = self._bucket().get_blob(name)
+        if blob is None:
+            raise DraftNotFound(name)
+        if str(blob.generation) != str(base_generation):
+            raise DraftConflict(blob.generation)
+        try:
+            draft = download_json(blob, if_generation_match=blob.generation)
+        except _precondition_failed() as e:
+            raise DraftConflict(self._generation(name)) from e
+        draft = apply_patch(draft, set_fields, unset_fields)
+        draft.update(stamp or {})
+        return draft, self.write(name, draft, if_generation_match=blob.generation)
+
+    def _generation(self, name):
+        blob = self._bucket().get_blob(name)
+        return blob.generation if blob is not None else None
+
+    def _versioning_enabled(self, bucket):
+        if self._versioning is None:
+            try:
+                bucket.reload()
+                self._versioning = bool(bucket.versioning_enabled)
+            except Exception as e:
+                self._log(f"[DRAFT] Could not read bucket versioning setting: {e}")
+                return None
+        return self._versioning
+
+
+def diff_fields(old, new):
+    """Top-level fields that differ between two drafts (for history views)."""
+    keys = set(old) | set(new)
+    keys.difference_update(('lastSavedAt', 'lastSavedBy'))
+    return sorted(k for k in keys if old.get(k) != new.get(k))
+
+
+def _precondition_failed():
+    if gcloud_exceptions is None:  # pragma: no cover
+        return ()
+    return gcloud_exceptions.PreconditionFailed
+
+
+def _not_found():
+    if gcloud_exceptions is None:  # pragma: no cover
+        return ()
+    return gcloud_exceptions.NotFound
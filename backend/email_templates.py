@@ -0,0 +1,183 @@
+"""Pre-compiled newsletter email templates.
+
+render_email used to open templates/briteside-*.html on every call and run a
+regex substitution with a lambda per placeholder over ~21KB of markup. Here each
+template is parsed ONCE into a flat list of literal segments plus the indexes
+of its {{PLACEHOLDER}} slots, so rendering is a list copy, a handful of slot
+assignments and a single ''.join.
+
+Semantics match the old single-pass re.sub exactly:
+- a value containing a literal "{{TOKEN}}" is never re-expanded (values are
+  dropped into slots, the template is never rescanned);
+- unknown placeholders are left in the output untouched;
+- host-relative asset paths (the logo) are made absolute with the request's
+  base URL, in the template markup only — never inside substituted values.
+
+With hot_reload on (local dev), each lookup stats the file and recompiles it
+when its mtime changes, so template edits show up without a restart. An
+optional `transform` runs over the file text before it is compiled (app.py
+uses it to fingerprint /static/ URLs).
+
+SectionCache memoizes the server-built HTML fragments that fill those slots
+(birthday rows, spotlight tables, update photo blocks, ...) keyed by a hash of
+each section's own inputs plus the template name, so a preview re-render after
+a one-field edit rebuilds only the section that changed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# Slot key for the request base URL. Not a \w name, so no template
+# placeholder can collide with it.
+_BASE_URL_SLOT = ':base_url'
+
+
+class CompiledTemplate:
+    """One template, split into literal parts and fillable slots."""
+
+    def __init__(self, text, absolute_paths=()):
+        parts = []
+        slots = []      # (index into parts, placeholder name)
+
+        def _add_literal(literal):
+            # Split out each host-relative path so the base URL can be
+            # slotted in front of it at render time.
+            for path in absolute_paths:
+                if path in literal:
+                    chunks = literal.split(path)
+                    for i, chunk in enumerate(chunks):
+                        if i:
+                            slots.append((len(parts), _BASE_URL_SLOT))
+                            parts.append('')
+                            parts.append(path)
+                        if chunk:
+                            _add_literal(chunk)
+                    return
+            if literal:
+                parts.append(literal)
+
+        pieces = _PLACEHOLDER_RE.split(text)
+        for i, piece in enumerate(pieces):
+            if i % 2 == 0:
+                _add_literal(piece)
+            else:
+                slots.append((len(parts), piece))
+                parts.append('{{' + piece + '}}')   # default: left untouched
+
+        self._parts = parts
+        self._slots = slots
+        self.placeholders = frozenset(name for _, name in slots if name != _BASE_URL_SLOT)
+        self.size = len(text)
+
+    def render(self, values, base_url=''):
+        """Fill every slot from `values` (unknown names keep their
+        {{NAME}} text) and join."""
+        parts = self._parts[:]
+        for idx, name in self._slots:
+            if name == _BASE_URL_SLOT:
+                parts[idx] = base_url
+            else:
+                value = values.get(name)
+                if value is not None:
+                    parts[idx] = value
+        return ''.join(parts)
+
+
+class TemplateRegistry:
+    """The allowed email templates, compiled at startup.
+
+    get(name) returns the CompiledTemplate or raises FileNotFoundError (for a
+    name that isn't registered or whose file is missing)."""
+
+    def __init__(self, directory, names, absolute_paths=(), hot_reload=False, transform=None,
+                 log=print):
+        self.directory = directory
+        self.names = tuple(names)
+        self._absolute_paths = tuple(absolute_paths)
+        self._transform = transform or (lambda text: text)
+        self._hot_reload = hot_reload
+        self._log = log
+        self._lock = threading.Lock()
+        self._compiled = {}     # name -> (mtime, CompiledTemplate)
+        for name in self.names:
+            try:
+                self._compile(name)
+            except OSError as e:
+                self._log(f"[WARNING] Email template '{name}' not loaded: {e}")
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _compile(self, name):
+        path = self.path(name)
+        mtime = os.path.getmtime(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            compiled = CompiledTemplate(self._transform(f.read()), self._absolute_paths)
+        with self._lock:
+            self._compiled[name] = (mtime, compiled)
+        return compiled
+
+    def get(self, name):
+        if name not in self.names:
+            raise FileNotFoundError(self.path(name))
+        entry = self._compiled.get(name)
+        if entry is None:
+            # Missing at startup (or removed): retry so a restored file heals.
+            return self._compile(name)
+        if self._hot_reload:
+            try:
+                mtime = os.path.getmtime(self.path(name))
+            except OSError:
+                return entry[1]
+            if mtime != entry[0]:
+                self._log(f"[TEMPLATES] Reloading changed template '{name}'")
+                return self._compile(name)
+        return entry[1]
+
+
+class SectionCache:
+    """Thread-safe LRU of rendered email fragments with per-section counters.
+
+    fragment() keys on (section, template, sha1 of the builder's arguments), so
+    builders must be pure functions of their arguments and must return
+    immutable values (strings / tuples) since hits are shared."""
+
+    def __init__(self, max_entries=512):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._counts = {}       # section -> [hits, misses]
+
+    @staticmethod
+    def _digest(args):
+        raw = json.dumps(args, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def fragment(self, section, template, build, *args):
+        """Return (value, hit): the cached build(*args) or a fresh one."""
+        key = (section, template, self._digest(args))
+        with self._lock:
+            counts = self._counts.setdefault(section, [0, 0])
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                counts[0] += 1
+                return self._entries[key], True
+        value = build(*args)
+        with self._lock:
+            counts[1] += 1
+            self._entries[key] = value
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value, False
+
+    def hit_rate(self, section):
+        with self._lock:
+            hits, misses = self._counts.get(section, (0, 0))
+        total = hits + misses
+        return round(hits / total, 3) if total else None
@@ -0,0 +1,95 @@
+"""orjson behind Flask's jsonify and the GCS JSON documents.
+
+Every API response went through Flask's DefaultJSONProvider (stdlib
+json.dumps, with sort_keys and ensure_ascii). Stored drafts went through
+plain json.dumps in backend/json_blobs.py. Some of those payloads are
+large: a full draft from load_draft, the rendered newsletter html from
+render-email, feed pages with their reaction email lists. orjson serializes
+them several times faster.
+
+The output stays what clients already get:
+  - keys are sorted and the separators are compact, as before;
+  - dates, datetimes and Firestore timestamps (DatetimeWithNanoseconds, a
+    datetime subclass) become the same RFC 822 strings Flask produced.
+    OPT_PASSTHROUGH_DATETIME keeps orjson from writing ISO 8601 instead;
+  - UUID, Decimal, dataclasses and __html__ objects fall back to Flask's
+    own default hook.
+orjson writes UTF-8 where the stdlib wrote \\u escapes. That is the same JSON
+once parsed.
+
+Anything orjson refuses (ints wider than 64 bits, say; NaN and Infinity on
+the way in) is retried with the stdlib, so no payload that serialized or
+parsed before now fails, and a wide int parses to the same int as before.
+Without orjson installed, everything uses the stdlib.
+
+Never imports app.py.
+"""
+
+import json
+import re
+
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json only
+    orjson = None
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    _SORTED = _OPTIONS | orjson.OPT_SORT_KEYS
+
+# 19 digits covers every int past the int64/uint64 range orjson parses exactly
+_LONG_DIGITS_STR = re.compile(r'[0-9]{19}')
+_LONG_DIGITS_BYTES = re.compile(rb'[0-9]{19}')
+
+
+def dumps(obj, sort_keys=False):
+    """Compact UTF-8 JSON bytes for `obj`."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_SORTED if sort_keys else _OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(obj, default=_default, sort_keys=sort_keys, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    """Parse JSON text or bytes. What orjson rejects but the stdlib accepts
+    (NaN, Infinity) is parsed by the stdlib, and so is text with a run of 19+
+    digits: orjson reads ints outside 64 bits as lossy floats instead of
+    failing, so anything that might be one skips it."""
+    if orjson is not None and not _long_digits(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _long_digits(data):
+    pattern = _LONG_DIGITS_STR if isinstance(data, str) else _LONG_DIGITS_BYTES
+    return pattern.search(data) is not None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the work. Calls with extra
+    json.dumps arguments (indent, cls, ...) still go to the stdlib."""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)    # indented, for debugging
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj, sort_keys=self.sort_keys) + b'\n',
+                                        mimetype=self.mimetype)
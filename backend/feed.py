@@ -318,34 +318,35 @@ def run_seed():
     today = _deps['now']()
     month, day, year = today.month, today.day, today.year
     created = {'birthday': 0, 'anniversary': 0}
-
-    for emp in _deps['list_employees']():
-        if emp.get('active') is False:
-            continue
-        email = (emp.get('email') or '').strip().lower()
-        if not email:
-            continue
-        name = emp.get('name') or email.split('@')[0]
-
-        if _as_int(emp.get('birthday_month')) == month and _as_int(emp.get('birthday_day')) == day:
-            key = f'birthday-{email}-{year}'
-            if not _auto_post_exists(key):
-                _create_auto_post(
-                    'birthday', key,
-                    f"It's {name}'s birthday today! \U0001F382 Drop your wishes in the comments.")
-                created['birthday'] += 1
-
-        if _as_int(emp.get('anniversary_month')) == month and _as_int(emp.get('anniversary_day')) == day:
-            years = year - _as_int(emp.get('anniversary_year')) if _as_int(emp.get('anniversary_year')) else 0
-            if years <= 0:
-                continue  # started this year (or unknown start year): skip
-            key = f'anniversary-{email}-{year}'
-            if not _auto_post_exists(key):
-                label = '1 year' if years == 1 else f'{years} years'
-                _create_auto_post(
-                    'anniversary', key,
-                    f'{name} celebrates {label} at BriteCo today! \U0001F389 Congrats, {_first_name(name)}!')
-                created['anniversary'] += 1
+    index = _deps['roster_index']()
+
+    def _celebrants(emps):
+        for emp in emps:
+            if emp.get('active') is False:
+                continue
+            email = (emp.get('email') or '').strip().lower()
+            if email:
+                yield emp, email, emp.get('name') or email.split('@')[0]
+
+    for emp, email, name in _celebrants(index.birthdays_on(month, day)):
+        key = f'birthday-{email}-{year}'
+        if not _auto_post_exists(key):
+            _create_auto_post(
+                'birthday', key,
+                f"It's {name}'s birthday today! \U0001F382 Drop your wishes in the comments.")
+            created['birthday'] += 1
+
+    for emp, email, name in _celebrants(index.anniversaries_on(month, day)):
+        years = year - _as_int(emp.get('anniversary_year')) if _as_int(emp.get('anniversary_year')) else 0
+        if years <= 0:
+            continue  # started this year (or unknown start year): skip
+        key = f'anniversary-{email}-{year}'
+        if not _auto_post_exists(key):
+            label = '1 year' if years == 1 else f'{years} years'
+            _create_auto_post(
+                'anniversary', key,
+                f'{name} celebrates {label} at BriteCo today! \U0001F389 Congrats, {_first_name(name)}!')
+            created['anniversary'] += 1
 
     _log(f"[FEED] Seed ran: {created['birthday']} birthday, {created['anniversary']} anniversary post(s)")
     return created
@@ -713,7 +714,8 @@ def register_feed(app, deps):
     """Wire the feed blueprint into the Flask app.
 
     deps: firestore_client, get_current_user, is_editor, now_iso,
-          now (tz-aware datetime callable), safe_print, list_employees.
+          now (tz-aware datetime callable), safe_print, list_employees,
+          roster_index (month/day birthday + anniversary lookups).
     """
     _deps.update(deps)
     app.register_blueprint(feed_bp)
@@ -5,23 +5,29 @@ For content generation using Claude models
 
 import os
 import time
-from anthropic import Anthropic
+
+from backend.integrations.response_cache import cache_key
 
 
 class ClaudeClient:
     """Client for Claude API"""
 
-    def __init__(self, api_key=None):
-        """Initialize Claude client"""
+    def __init__(self, api_key=None, cache=None):
+        """Initialize Claude client (cache: optional ResponseCache)"""
         self.api_key = api_key or os.getenv('ANTHROPIC_API_KEY')
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment")
 
+        # Imported here, not at module level: the SDK is the slowest import in
+        # the app, and app.py only builds this client on first use.
+        from anthropic import Anthropic
+
         # timeout is in SECONDS for the Python SDK (default is 600s per attempt).
         # Cap it well under gunicorn's worker timeout and limit retries so a
         # stalled API call can't pin a worker for timeout x (max_retries + 1).
         self.client = Anthropic(api_key=self.api_key, timeout=90.0, max_retries=1)
         self.default_model = "claude-opus-4-5-20251101"  # Claude Opus 4.5
+        self.cache = cache
 
     def generate_content(
         self,
@@ -29,7 +35,10 @@ class ClaudeClient:
         system_prompt: str = None,
         temperature: float = 0.7,
         max_tokens: int = 2000,
-        model: str = None
+        model: str = None,
+        cache: bool = False,
+        fresh: bool = False,
+        cache_system: bool = True
     ) -> dict:
         """
         Generate content using Claude
@@ -40,14 +49,23 @@ class ClaudeClient:
             temperature: Creativity (0-1)
             max_tokens: Max response length
             model: Model to use (defaults to claude-3-5-sonnet)
+            cache: Serve/store this completion via self.cache
+            fresh: With cache, skip the lookup but store the new completion
+            cache_system: Mark the system prompt as an Anthropic prompt-cache prefix
 
         Returns:
-            dict with content, model, tokens, cost_estimate, latency_ms
+            dict with content, model, tokens, input_tokens (uncached),
+            cache_creation_input_tokens, cache_read_input_tokens,
+            output_tokens, cost_estimate, latency_ms, cached, cost_saved
         """
         start_time = time.time()
 
         model_name = model or self.default_model
 
+        key, hit = self._cache_lookup(cache, fresh, model_name, system_prompt, prompt, temperature, max_tokens)
+        if hit is not None:
+            return self._from_cache(hit, start_time)
+
         # Build messages
         messages = [{"role": "user", "content": prompt}]
 
@@ -56,13 +74,119 @@ class ClaudeClient:
             model=model_name,
             max_tokens=max_tokens,
             temperature=temperature,
-            system=system_prompt if system_prompt else "",
+            system=self._system(system_prompt, cache_system),
             messages=messages
         )
 
         end_time = time.time()
         latency_ms = int((end_time - start_time) * 1000)
 
+        result = self._result(response, model_name, latency_ms)
+        self._cache_store(key, result)
+        return result
+
+    def stream_content(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        model: str = None,
+        cache: bool = False,
+        fresh: bool = False,
+        cache_system: bool = True
+    ):
+        """
+        Streaming variant of generate_content
+
+        Yields ("delta", text) for each chunk of text as the model produces it,
+        then a single ("done", result), where result is the generate_content
+        dict plus first_token_ms (time to the first text chunk). A cache hit
+        arrives as one delta with the whole text.
+        """
+        start_time = time.time()
+        first_token_ms = None
+
+        model_name = model or self.default_model
+
+        key, hit = self._cache_lookup(cache, fresh, model_name, system_prompt, prompt, temperature, max_tokens)
+        if hit is not None:
+            result = self._from_cache(hit, start_time)
+            result["first_token_ms"] = result["latency_ms"]
+            if result["content"]:
+                yield "delta", result["content"]
+            yield "done", result
+            return
+
+        with self.client.messages.stream(
+            model=model_name,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=self._system(system_prompt, cache_system),
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            for text in stream.text_stream:
+                if not text:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = int((time.time() - start_time) * 1000)
+                yield "delta", text
+            response = stream.get_final_message()
+
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        result = self._result(response, model_name, latency_ms)
+        self._cache_store(key, result)
+        result["first_token_ms"] = first_token_ms
+        yield "done", result
+
+    @staticmethod
+    def _system(system_prompt, cache_system=True):
+        """System prompt for messages.create/stream.
+
+        The shared BriteSide system prompt opens every builder call, so it goes
+        out as a text block with an ephemeral cache_control breakpoint: after
+        the first call, requests within the cache window read it from the
+        prompt cache (billed at 0.1x input) instead of reprocessing it. Below
+        the model's minimum cacheable length the API simply doesn't cache."""
+        if not system_prompt:
+            return ""
+        if not cache_system:
+            return system_prompt
+        return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+    def _cache_lookup(self, cache, fresh, model_name, system_prompt, prompt, temperature, max_tokens):
+        """Return (key, cached record or None); key is None when not caching"""
+        if not cache or self.cache is None:
+            return None, None
+        key = cache_key(model_name, system_prompt, prompt, temperature, max_tokens)
+        if fresh:
+            self.cache.note_bypass()
+            return key, None
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key, result: dict):
+        # Empty content (e.g. a refusal) isn't worth replaying
+        if key is None or not result.get("content"):
+            return
+        cost = self._estimate_cost(result["model"], result["input_tokens"], result["output_tokens"],
+                                   result["cache_creation_input_tokens"], result["cache_read_input_tokens"])
+        self.cache.put(key, result, cost)
+
+    def _from_cache(self, record: dict, start_time: float) -> dict:
+        """A cached completion, re-labelled: nothing spent, original cost saved"""
+        result = dict(record["result"])
+        result.update({
+            "cached": True,
+            "cost_estimate": "$0.0000",
+            "cost_saved": f"${record.get('cost', 0.0):.4f}",
+            "latency_ms": int((time.time() - start_time) * 1000),
+        })
+        return result
+
+    def _result(self, response, model_name: str, latency_ms: int) -> dict:
+        """Shape a final Message into the dict generate_content returns"""
+
         # Extract content — guard against refusals (stop_reason 'refusal' can come
         # back with an empty content array) and non-text leading blocks, so we
         # never IndexError on response.content[0].
@@ -74,43 +198,56 @@ class ClaudeClient:
                 '',
             )
 
-        # Calculate tokens
-        input_tokens = response.usage.input_tokens
-        output_tokens = response.usage.output_tokens
-        total_tokens = input_tokens + output_tokens
+        # Calculate tokens. input_tokens excludes prompt-cache reads/writes,
+        # which the API reports (and bills) separately.
+        usage = response.usage
+        input_tokens = usage.input_tokens
+        output_tokens = usage.output_tokens
+        cache_write_tokens = getattr(usage, 'cache_creation_input_tokens', None) or 0
+        cache_read_tokens = getattr(usage, 'cache_read_input_tokens', None) or 0
+        total_tokens = input_tokens + cache_write_tokens + cache_read_tokens + output_tokens
 
         # Estimate cost
-        cost_estimate = self._estimate_cost(model_name, input_tokens, output_tokens)
+        cost_estimate = self._estimate_cost(model_name, input_tokens, output_tokens,
+                                            cache_write_tokens, cache_read_tokens)
 
         return {
             "content": content,
             "model": model_name,
             "tokens": total_tokens,
             "input_tokens": input_tokens,
+            "cache_creation_input_tokens": cache_write_tokens,
+            "cache_read_input_tokens": cache_read_tokens,
             "output_tokens": output_tokens,
             "cost_estimate": f"${cost_estimate:.4f}",
-            "latency_ms": latency_ms
+            "latency_ms": latency_ms,
+            "cached": False,
+            "cost_saved": "$0.0000"
         }
 
-    def _estimate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+    def _estimate_cost(self, model: str, input_tokens: int, output_tokens: int,
+                       cache_write_tokens: int = 0, cache_read_tokens: int = 0) -> float:
         """Estimate cost based on model pricing"""
 
         # Current Claude pricing per 1M tokens (input / output). Check "opus"
         # before the generic fallback so the default Opus model prices correctly.
         if "opus" in model.lower():
-            input_cost = (input_tokens / 1_000_000) * 5.00    # Opus 4.x: $5 / $25
-            output_cost = (output_tokens / 1_000_000) * 25.00
+            input_rate, output_rate = 5.00, 25.00     # Opus 4.x: $5 / $25
         elif "haiku" in model.lower():
-            input_cost = (input_tokens / 1_000_000) * 1.00    # Haiku 4.5: $1 / $5
-            output_cost = (output_tokens / 1_000_000) * 5.00
+            input_rate, output_rate = 1.00, 5.00      # Haiku 4.5: $1 / $5
         elif "sonnet" in model.lower():
-            input_cost = (input_tokens / 1_000_000) * 3.00    # Sonnet: $3 / $15
-            output_cost = (output_tokens / 1_000_000) * 15.00
+            input_rate, output_rate = 3.00, 15.00     # Sonnet: $3 / $15
         else:
-            input_cost = (input_tokens / 1_000_000) * 5.00
-            output_cost = (output_tokens / 1_000_000) * 25.00
+            input_rate, output_rate = 5.00, 25.00
+
+        # Prompt cache: 5-minute cache writes bill at 1.25x the input rate,
+        # cache reads at 0.1x.
+        input_cost = (input_tokens / 1_000_000) * input_rate
+        cache_write_cost = (cache_write_tokens / 1_000_000) * input_rate * 1.25
+        cache_read_cost = (cache_read_tokens / 1_000_000) * input_rate * 0.10
+        output_cost = (output_tokens / 1_000_000) * output_rate
 
-        return input_cost + output_cost
+        return input_cost + cache_write_cost + cache_read_cost + output_cost
 
     def search_web(self, query: str, max_results: int = 5) -> list:
         """
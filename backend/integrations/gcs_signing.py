@@ -0,0 +1,102 @@
+"""V4 signed PUT URLs so browsers upload media straight to GCS.
+
+/api/upload-media sends every media byte through a gunicorn thread. A signed
+URL lets the browser PUT the file to the bucket itself. The app only signs
+the URL beforehand and checks the object afterwards.
+
+The URL is bound to:
+  - one object name (media/{yyyy-mm}/{uuid}{ext}),
+  - the declared Content-Type (GCS rejects a PUT whose header differs),
+  - x-goog-content-length-range 0,<cap> (GCS rejects a larger body),
+  - x-goog-meta-* headers. They become object metadata, so the finalize
+    step can tell a signed upload (and its uploader) from older objects,
+  - x-goog-if-generation-match: 0, so the PUT only succeeds while no object
+    has that name. The URL creates the object once; it can't replace a file
+    finalize already approved. A consumed image upload is replaced by an
+    empty tombstone (not deleted) for the same reason.
+The URL expires after `ttl` seconds.
+
+Uploads that are never finalized would stay in the public bucket.
+sweep_signed_uploads() deletes them, and old tombstones, once they are past
+any use; POST /api/jobs/cleanup-uploads runs it from Cloud Scheduler. A
+bucket lifecycle rule can't do this: it can't tell these objects from
+published media by name or metadata.
+
+Signing. A service-account key file signs locally. On Cloud Run the
+metadata-server credentials have no private key, so the signature comes from
+the IAM signBlob API. The runtime service account needs "Service Account
+Token Creator" on itself for that.
+
+Browsers also need a CORS rule on the media bucket that allows PUT from the
+app origin (gcs-media-cors.json):
+
+    gcloud storage buckets update gs://<media bucket> --cors-file=gcs-media-cors.json
+
+Never imports app.py; the blob or bucket is passed in.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+# Flat objects directly under a month, i.e. signed uploads (and pre-rendition
+# media), not the media/{month}/{id}/ rendition sets.
+_UPLOADS_GLOB = 'media/*/*.*'
+
+
+def signed_upload(blob, content_type, max_size, metadata=None, ttl=900):
+    """(url, headers) for one browser PUT of `blob`. The browser must send
+    exactly these headers with the body."""
+    headers = {
+        'Content-Type': content_type,
+        'x-goog-content-length-range': f'0,{int(max_size)}',
+        'x-goog-if-generation-match': '0',
+    }
+    for key, value in (metadata or {}).items():
+        headers[f'x-goog-meta-{key}'] = str(value)
+    url = blob.generate_signed_url(
+        version='v4',
+        method='PUT',
+        expiration=timedelta(seconds=ttl),
+        content_type=content_type,
+        headers={k: v for k, v in headers.items() if k != 'Content-Type'},
+        **_signing_kwargs(blob.client),
+    )
+    return url, headers
+
+
+def sweep_signed_uploads(bucket, max_age, log=print):
+    """Delete signed uploads never finalized (metadata upload=signed) and
+    tombstones of consumed ones (upload=consumed) created more than `max_age`
+    seconds ago. Returns the number deleted."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+    deleted = 0
+    for blob in bucket.list_blobs(prefix='media/', match_glob=_UPLOADS_GLOB):
+        state = (blob.metadata or {}).get('upload')
+        if state not in ('signed', 'consumed') or blob.time_created is None or blob.time_created > cutoff:
+            continue
+        try:
+            # Only the object as listed: not one finalize has since patched
+            blob.delete(if_generation_match=blob.generation,
+                        if_metageneration_match=blob.metageneration)
+            deleted += 1
+        except Exception as e:   # finalized meanwhile, or already gone
+            log(f"[MEDIA] Could not delete stale upload {blob.name}: {e}")
+    if deleted:
+        log(f"[MEDIA] Deleted {deleted} stale signed upload(s)")
+    return deleted
+
+
+def _signing_kwargs(client):
+    """Credentials without a private key sign through IAM: pass the service
+    account and a fresh access token instead."""
+    from google.auth import credentials as ga_credentials
+    creds = getattr(client, '_credentials', None)
+    if creds is None or isinstance(creds, ga_credentials.Signing):
+        return {}
+    from google.auth.transport.requests import Request
+    # Metadata-server credentials only learn their real email on refresh.
+    if not creds.valid or getattr(creds, 'service_account_email', None) in (None, 'default'):
+        creds.refresh(Request())
+    return {
+        'service_account_email': creds.service_account_email,
+        'access_token': creds.token,
+    }
@@ -0,0 +1,139 @@
+"""Stream a request body into a GCS resumable upload session.
+
+/api/upload-media used to file.read() a video (up to 50MB) and then
+upload_from_string it, so every in-flight upload held the whole file in
+memory. With 16 request threads per instance that can reach 800MB.
+
+ResumableUpload sends the body on as it arrives. It PUTs fixed-size chunks
+(a multiple of 256KiB, as the resumable protocol requires) to a session URI
+from Blob.create_resumable_upload_session(). It counts bytes as they go and
+stops at the size cap. A capped or failed upload is cancelled, so no partial
+object is ever created: GCS only creates the object when the final chunk
+lands. Memory per upload is bounded by the chunk size.
+
+A chunk that fails with a connection error, 429 or 5xx is retried from
+whatever offset GCS reports as committed.
+
+Never imports app.py. The session URI authorizes itself, so a plain requests
+session is enough.
+"""
+
+import time
+
+import requests
+
+CHUNK_GRANULARITY = 256 * 1024
+_RETRIES = 3
+_TIMEOUT = 60
+
+
+class UploadTooLarge(Exception):
+    """The body went past the caller's size cap (the upload was cancelled)."""
+
+    def __init__(self, limit):
+        super().__init__(f'Upload exceeds {limit} bytes')
+        self.limit = limit
+
+
+def iter_chunks(stream, head=b'', read_size=64 * 1024):
+    """`head` (bytes already read, e.g. for MIME sniffing), then the rest of
+    `stream` in read_size pieces."""
+    if head:
+        yield head
+    while True:
+        data = stream.read(read_size)
+        if not data:
+            return
+        yield data
+
+
+class ResumableUpload:
+    """One resumable upload session, fed from an iterable of byte strings."""
+
+    def __init__(self, session_url, chunk_size=8 * CHUNK_GRANULARITY, http=None):
+        if chunk_size <= 0 or chunk_size % CHUNK_GRANULARITY:
+            raise ValueError(f'chunk_size must be a multiple of {CHUNK_GRANULARITY}')
+        self.session_url = session_url
+        self.chunk_size = chunk_size
+        self._http = http or requests
+        self.offset = 0
+
+    def upload(self, chunks, max_size=None):
+        """Send every chunk and finalize the object. Returns the object
+        resource GCS answers with. Raises UploadTooLarge past `max_size`."""
+        buffer = bytearray()
+        try:
+            for data in chunks:
+                buffer += data
+                if max_size is not None and self.offset + len(buffer) > max_size:
+                    raise UploadTooLarge(max_size)
+                while len(buffer) >= self.chunk_size:
+                    self._put(bytes(buffer[:self.chunk_size]), final=False)
+                    del buffer[:self.chunk_size]
+            return self._put(bytes(buffer), final=True)
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self):
+        """Cancel the session; GCS discards whatever it received."""
+        try:
+            self._http.delete(self.session_url, timeout=_TIMEOUT)
+        except Exception:
+            pass
+
+    def _put(self, data, final):
+        """PUT `data` at self.offset, resending any tail GCS didn't commit."""
+        attempt = 0
+        while True:
+            end = self.offset + len(data)
+            total = str(end) if final else '*'
+            span = f'{self.offset}-{end - 1}' if data else '*'
+            try:
+                r = self._http.put(self.session_url, data=data, timeout=_TIMEOUT,
+                                   headers={'Content-Range': f'bytes {span}/{total}'})
+            except requests.RequestException:
+                r = None
+            if r is not None and r.status_code in (200, 201):
+                self.offset = end
+                return r.json()
+            if r is not None and r.status_code == 308:
+                committed = _committed(r)
+                if committed < self.offset:
+                    raise requests.HTTPError(f'Resumable session lost bytes after {committed}')
+                progressed = committed > self.offset
+                data = data[committed - self.offset:]
+                self.offset = committed
+                if not data and not final:
+                    return None
+                if progressed:
+                    attempt = 0
+                    continue
+            if r is not None and 400 <= r.status_code < 500 and r.status_code != 429:
+                r.raise_for_status()
+            attempt += 1
+            if attempt >= _RETRIES:
+                status = r.status_code if r is not None else 'no response'
+                raise requests.ConnectionError(f'Resumable upload stuck at byte {self.offset} ({status})')
+            time.sleep(0.5 * 2 ** attempt)
+            # Ask GCS how much of the session it already has before resending.
+            data = self._resync(data)
+
+    def _resync(self, data):
+        try:
+            r = self._http.put(self.session_url, timeout=_TIMEOUT,
+                               headers={'Content-Range': 'bytes */*'})
+        except requests.RequestException:
+            return data
+        if r.status_code != 308:
+            return data
+        committed = _committed(r)
+        data = data[committed - self.offset:] if committed >= self.offset else data
+        self.offset = max(self.offset, committed)
+        return data
+
+
+def _committed(response):
+    """Bytes GCS has persisted, from a 308's Range header ("bytes=0-N")."""
+    rng = response.headers.get('Range')
+    return int(rng.rsplit('-', 1)[1]) + 1 if rng else 0
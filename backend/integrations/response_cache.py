@@ -0,0 +1,130 @@
+"""Content-addressed cache of Claude completions.
+
+Editors hit regenerate on the same inputs over and over, and each spotlight /
+rewrite / game call is a full Opus round trip. A completion is keyed by
+everything that determines it (model, a hash of the system prompt, the prompt,
+temperature and max_tokens) and kept in two tiers:
+
+- a small in-process LRU, for the same worker answering the same click;
+- an optional persistent store shared by every worker and instance
+  (FirestoreResponseStore: one doc per key in `ai_cache`).
+
+Both tiers honor the TTL. The Firestore doc also carries an `expire_at`
+timestamp, so a Firestore TTL policy on that field can purge old entries
+server-side.
+
+ClaudeClient consults the cache only when a caller opts in (cache=True), and
+fresh=True skips the lookup but still stores the new completion, so "give me a
+fresh one" replaces what later calls get. Hits and the dollars they saved are
+counted for /health.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+
+def cache_key(model, system_prompt, prompt, temperature, max_tokens):
+    system_hash = hashlib.sha256((system_prompt or '').encode('utf-8')).hexdigest()
+    raw = json.dumps([model, system_hash, prompt, temperature, max_tokens])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class FirestoreResponseStore:
+    """Persistent tier: one Firestore doc per cache key."""
+
+    def __init__(self, db, collection='ai_cache'):
+        self._db = db
+        self._collection = collection
+
+    def get(self, key):
+        snap = self._db.collection(self._collection).document(key).get()
+        return snap.to_dict() if snap.exists else None
+
+    def set(self, key, record):
+        self._db.collection(self._collection).document(key).set(record)
+
+
+class ResponseCache:
+    """Thread-safe LRU in front of an optional persistent store.
+
+    Records are {'result': <generate_content dict>, 'cost': float,
+    'expires_at': epoch seconds}."""
+
+    def __init__(self, store=None, max_entries=256, ttl=7 * 24 * 3600, log=print):
+        self._store = store
+        self._max_entries = max_entries
+        self._ttl = float(ttl)
+        self._log = log
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._stats = {'hits': 0, 'store_hits': 0, 'misses': 0, 'bypassed': 0,
+                       'store_errors': 0, 'dollars_saved': 0.0}
+
+    def get(self, key):
+        """Return the live record for `key`, or None."""
+        now = time.time()
+        with self._lock:
+            record = self._entries.get(key)
+            if record is not None:
+                if record['expires_at'] > now:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    self._stats['dollars_saved'] += record['cost']
+                    return record
+                del self._entries[key]
+
+        record = None
+        if self._store is not None:
+            try:
+                record = self._store.get(key)
+            except Exception as e:
+                self._log(f"[AI CACHE] Store read failed: {e}")
+                with self._lock:
+                    self._stats['store_errors'] += 1
+        with self._lock:
+            if record is None or record.get('expires_at', 0) <= now:
+                self._stats['misses'] += 1
+                return None
+            self._remember(key, record)
+            self._stats['hits'] += 1
+            self._stats['store_hits'] += 1
+            self._stats['dollars_saved'] += record.get('cost', 0.0)
+        return record
+
+    def put(self, key, result, cost):
+        record = {'result': dict(result), 'cost': float(cost), 'expires_at': time.time() + self._ttl}
+        with self._lock:
+            self._remember(key, record)
+        if self._store is not None:
+            try:
+                self._store.set(key, dict(record, expire_at=datetime.fromtimestamp(record['expires_at'], timezone.utc)))
+            except Exception as e:
+                self._log(f"[AI CACHE] Store write failed: {e}")
+                with self._lock:
+                    self._stats['store_errors'] += 1
+
+    def note_bypass(self):
+        with self._lock:
+            self._stats['bypassed'] += 1
+
+    def _remember(self, key, record):
+        self._entries[key] = record
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        """Counters for /health. No I/O."""
+        with self._lock:
+            out = dict(self._stats)
+            lookups = out['hits'] + out['misses']
+            out['dollars_saved'] = round(out['dollars_saved'], 4)
+            out['hit_rate'] = round(out['hits'] / lookups, 3) if lookups else None
+            out['size'] = len(self._entries)
+            out['ttl_seconds'] = self._ttl
+            out['persistent'] = self._store is not None
+            return out
@@ -0,0 +1,237 @@
+"""Batched, concurrent newsletter delivery through the SendGrid v3 Mail Send API.
+
+send_newsletter used to build one Mail per recipient and call sg.send() for
+each in turn, so a company-wide send cost one sequential HTTPS round trip per
+person inside a single request bound by gunicorn's 120s timeout.
+
+Here recipients are packed into SendGrid personalizations, up to 1000 per API
+call (each personalization has its own `to`, so nobody sees anyone else's
+address). Batches are posted from a bounded thread pool over one pooled
+requests.Session.
+
+- 429 and 5xx responses are retried with exponential backoff plus jitter. The
+  wait honors Retry-After / X-RateLimit-Reset when SendGrid sends them.
+- A connect timeout is retried too (nothing reached SendGrid). Read timeouts
+  and dropped connections are NOT retried, because the batch may already have
+  been accepted. Those recipients are reported as failed rather than risking a
+  double send.
+- A 400 that names specific personalizations (e.g. one malformed address)
+  fails only those recipients; the rest of the batch is re-posted without
+  them. Any other 4xx fails the whole batch.
+- Retries stop at `deadline` seconds so the report comes back before the
+  worker timeout.
+
+The result is the same per-recipient report the serial loop produced: who was
+accepted, and a reason for everyone who wasn't.
+
+Like user_sync, this module never imports app.py. Credentials and settings are
+passed in, and it talks to SendGrid over plain HTTPS, so the sendgrid package
+isn't needed.
+"""
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parseaddr
+
+import requests as http_requests
+from requests.adapters import HTTPAdapter
+
+SENDGRID_API_BASE = 'https://api.sendgrid.com'
+MAX_PERSONALIZATIONS = 1000     # SendGrid's per-request limit
+
+_PERSONALIZATION_FIELD_RE = re.compile(r'^personalizations\.(\d+)\b')
+_ACCEPTED = (200, 201, 202)
+
+
+class DeliveryReport:
+    """Per-recipient outcome of one delivery.
+
+    `sent` lists accepted recipients; `failed` maps each rejected recipient to
+    a reason string. Both are filled in batch by batch (thread-safe)."""
+
+    def __init__(self, total):
+        self.total = total
+        self.sent = []
+        self.failed = {}
+        self.api_calls = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def _record(self, sent=(), failed=None, api_calls=0, retries=0):
+        with self._lock:
+            self.sent.extend(sent)
+            self.failed.update(failed or {})
+            self.api_calls += api_calls
+            self.retries += retries
+
+    @property
+    def sent_count(self):
+        return len(self.sent)
+
+    def errors(self):
+        """Failures as the "Failed for <recipient>: <reason>" lines the
+        endpoint has always returned, or None when everyone was accepted."""
+        if not self.failed:
+            return None
+        return [f"Failed for {r}: {reason}" for r, reason in self.failed.items()]
+
+
+def _address(recipient):
+    """'Name <a@b.co>' or 'a@b.co' -> SendGrid email object."""
+    name, email = parseaddr(recipient)
+    email = email or recipient
+    return {'email': email, 'name': name} if name else {'email': email}
+
+
+def _retry_after(resp):
+    """Seconds SendGrid asked us to wait, if it said."""
+    value = resp.headers.get('Retry-After')
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+    reset = resp.headers.get('X-RateLimit-Reset')
+    if reset:
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    return None
+
+
+def _rejected_indexes(resp):
+    """{personalization index: message} for the personalizations a 400
+    response blames; empty when the error is about the message as a whole."""
+    try:
+        errors = (resp.json() or {}).get('errors') or []
+    except ValueError:
+        return {}
+    blamed = {}
+    for err in errors:
+        match = _PERSONALIZATION_FIELD_RE.match(str(err.get('field') or ''))
+        if match:
+            blamed.setdefault(int(match.group(1)), err.get('message') or 'rejected')
+    return blamed
+
+
+class SendGridDelivery:
+    """Reusable delivery engine: one pooled HTTP session per worker process.
+
+    deliver() is safe to call from several request threads at once."""
+
+    def __init__(self, api_base=SENDGRID_API_BASE, batch_size=MAX_PERSONALIZATIONS,
+                 max_workers=4, max_retries=4, backoff=1.0, max_backoff=30.0,
+                 timeout=(5, 60), log=print):
+        self.api_base = api_base.rstrip('/')
+        self.batch_size = max(1, min(int(batch_size), MAX_PERSONALIZATIONS))
+        self.max_workers = max(1, int(max_workers))
+        self.max_retries = max(0, int(max_retries))
+        self.backoff = float(backoff)
+        self.max_backoff = float(max_backoff)
+        self.timeout = timeout
+        self._log = log
+
+        self._session = http_requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+    def batches(self, recipients):
+        return [recipients[i:i + self.batch_size]
+                for i in range(0, len(recipients), self.batch_size)]
+
+    def deliver(self, api_key, recipients, subject, html_content, from_email, from_name,
+                deadline=100.0, on_batch=None):
+        """Send `html_content` to every recipient; return a DeliveryReport.
+
+        on_batch(sent, failed), if given, is called from the pool as each batch
+        settles. `sent` is a list of recipients and `failed` a dict mapping
+        recipient -> reason."""
+        recipients = list(recipients)
+        report = DeliveryReport(len(recipients))
+        if not recipients:
+            return report
+        message = {
+            'from': {'email': from_email, 'name': from_name} if from_name else {'email': from_email},
+            'subject': subject,
+            'content': [{'type': 'text/html', 'value': html_content}],
+        }
+        headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json',
+        }
+        stop_at = time.monotonic() + deadline
+
+        def _run(batch_no, batch):
+            sent, failed, calls, retries = self._send_batch(batch, message, headers, stop_at)
+            report._record(sent, failed, calls, retries)
+            self._log(f"[SENDGRID] Batch {batch_no}: {len(sent)} accepted, {len(failed)} failed "
+                      f"({calls} call(s), {retries} retr{'y' if retries == 1 else 'ies'})")
+            if on_batch:
+                on_batch(sent, failed)
+
+        batches = self.batches(recipients)
+        workers = min(self.max_workers, len(batches))
+        if workers == 1:
+            for n, batch in enumerate(batches, 1):
+                _run(n, batch)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sendgrid') as pool:
+                for future in [pool.submit(_run, n, b) for n, b in enumerate(batches, 1)]:
+                    future.result()
+        return report
+
+    def _send_batch(self, batch, message, headers, stop_at):
+        """POST one batch, retrying transient failures.
+        Returns (sent, failed, api_calls, retries)."""
+        pending = list(batch)
+        failed = {}
+        calls = retries = attempt = 0
+        while pending:
+            payload = dict(message)
+            payload['personalizations'] = [{'to': [_address(r)]} for r in pending]
+            calls += 1
+            wait = None
+            try:
+                resp = self._session.post(f'{self.api_base}/v3/mail/send', json=payload,
+                                          headers=headers, timeout=self.timeout)
+            except http_requests.exceptions.ConnectTimeout as e:
+                reason = str(e)
+            except Exception as e:
+                # The request may have reached SendGrid; don't risk a double send.
+                failed.update((r, str(e)) for r in pending)
+                return [], failed, calls, retries
+            else:
+                if resp.status_code in _ACCEPTED:
+                    return pending, failed, calls, retries
+                reason = f'status {resp.status_code}'
+                if resp.status_code == 400:
+                    blamed = {i: m for i, m in _rejected_indexes(resp).items() if i < len(pending)}
+                    if not blamed:
+                        failed.update((r, reason) for r in pending)
+                        return [], failed, calls, retries
+                    for idx, msg in blamed.items():
+                        failed[pending[idx]] = f'{reason}: {msg}'
+                    pending = [r for i, r in enumerate(pending) if i not in blamed]
+                    continue
+                if resp.status_code != 429 and resp.status_code < 500:
+                    failed.update((r, reason) for r in pending)
+                    return [], failed, calls, retries
+                wait = _retry_after(resp)
+
+            # Transient: back off and try the same batch again.
+            if wait is None:
+                wait = self.backoff * (2 ** attempt) * (0.5 + random.random())
+            wait = min(wait, self.max_backoff)
+            attempt += 1
+            if attempt > self.max_retries or time.monotonic() + wait > stop_at:
+                failed.update((r, reason) for r in pending)
+                return [], failed, calls, retries
+            retries += 1
+            time.sleep(wait)
+        return [], failed, calls, retries
@@ -0,0 +1,56 @@
+"""JSON documents in GCS, stored gzip-compressed.
+
+Drafts, published issues and game answers used to be uploaded as raw
+json.dumps output. Draft JSON is highly repetitive (the same keys in every
+update, spotlight and birthday row), so gzip shrinks it severalfold.
+
+upload_json() stores the gzipped bytes with Content-Encoding: gzip and
+Content-Type: application/json. GCS decompressive transcoding then still
+serves plain JSON to any client that doesn't ask for gzip (gsutil cat, the
+console, older code). download_json() fetches the stored bytes as-is
+(raw_download), so the app's own reads carry the compressed size over the
+wire too. It decompresses when the bytes are gzip, which makes objects
+written before this change (plain JSON) read exactly as before. No migration
+is needed: an old object is rewritten compressed the next time it is saved.
+
+Serialization goes through backend/fast_json.py (orjson when installed).
+
+Used by backend/draft_store.py, backend/draft_index.py and app.py's game
+answer and published-issue routes. Never imports app.py.
+"""
+
+import gzip
+
+from backend import fast_json
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def encode_json(obj, compress=True):
+    """(bytes, content_encoding) for `obj`."""
+    raw = fast_json.dumps(obj)
+    if not compress:
+        return raw, None
+    return gzip.compress(raw, compresslevel=6, mtime=0), 'gzip'
+
+
+def decode_json(data):
+    """Parse stored bytes, gzipped or not."""
+    if data[:2] == GZIP_MAGIC:
+        data = gzip.decompress(data)
+    return fast_json.loads(data)
+
+
+def upload_json(blob, obj, compress=True, **kwargs):
+    """Upload `obj` to `blob` (extra kwargs, e.g. if_generation_match, go to
+    upload_from_string). Returns the number of bytes stored."""
+    data, encoding = encode_json(obj, compress)
+    blob.content_encoding = encoding
+    blob.upload_from_string(data, content_type='application/json', **kwargs)
+    return len(data)
+
+
+def download_json(blob, **kwargs):
+    """Read a JSON object written by upload_json or by the old plain
+    json.dumps uploads (extra kwargs go to download_as_bytes)."""
+    return decode_json(blob.download_as_bytes(raw_download=True, **kwargs))
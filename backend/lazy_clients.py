@@ -0,0 +1,101 @@
+"""Cloud clients and heavy optional modules, created on first use.
+
+app.py used to build everything at import: the Claude client (which imports
+the anthropic SDK, the largest import in the app), the GCS and Firestore
+clients (each resolves credentials and the project, over the metadata server
+on Cloud Run), then an IAM read on the media bucket and a Firestore query for
+the employee seed. A Cloud Run cold start waited on all of it before gunicorn
+answered its first request, even a request that used none of them.
+
+A LazyClient stands in for one of those objects under its old global name.
+The factory runs the first time the object is used, and only once per worker
+process. Concurrent first uses wait on a lock, and afterwards every use is a
+plain attribute read.
+
+  - `if not gcs_client:` works as before. Truth is "the factory gave a client".
+    Testing it runs the factory.
+  - gcs_client.bucket(...) and the like pass through to the real client.
+  - A factory that raises, or returns None, marks the client unavailable for
+    the life of the worker and logs the warning app.py used to print at
+    import. It is not retried. That matches the old once-per-worker attempt.
+  - status (and client_status()) never runs the factory, so /health can
+    report on a client without starting it.
+
+lazy_import() is the same thing for an optional module (python-magic, bs4).
+
+Never imports app.py.
+"""
+
+import importlib
+import threading
+
+_UNSET = object()
+
+
+class LazyClient:
+    """A thread-safe, build-once proxy for `factory()`."""
+
+    def __init__(self, name, factory, log=print):
+        # object.__setattr__ because __setattr__ below forwards to the client.
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_log', log)
+        object.__setattr__(self, '_lock', threading.Lock())
+        object.__setattr__(self, '_value', _UNSET)
+
+    def get(self):
+        """The client, built on first call; None if it is unavailable."""
+        value = self._value
+        if value is not _UNSET:
+            return value
+        with self._lock:
+            if self._value is _UNSET:
+                try:
+                    value = self._factory()
+                except Exception as e:
+                    self._log(f"[WARNING] {self._name} not available: {e}")
+                    value = None
+                else:
+                    if value is None:
+                        self._log(f"[WARNING] {self._name} not available")
+                    else:
+                        self._log(f"[OK] {self._name} initialized")
+                object.__setattr__(self, '_value', value)
+            return self._value
+
+    @property
+    def status(self):
+        """'ready', 'unavailable' or 'not initialized'. Never builds."""
+        value = self._value
+        if value is _UNSET:
+            return 'not initialized'
+        return 'ready' if value is not None else 'unavailable'
+
+    def __bool__(self):
+        return self.get() is not None
+
+    def __getattr__(self, attr):
+        # Only called for names not found on the proxy itself.
+        value = self.get()
+        if value is None:
+            raise AttributeError(f"{self._name} is not available (no attribute {attr!r})")
+        return getattr(value, attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self.get(), attr, value)
+
+    def __repr__(self):
+        return f"<LazyClient {self._name}: {self.status}>"
+
+
+def client_status(client):
+    """LazyClient.status, or for a plain object in its place (a client built
+    directly, a test fake, None): 'ready' unless it is None."""
+    if isinstance(client, LazyClient):
+        return client.status
+    return 'ready' if client is not None else 'unavailable'
+
+
+def lazy_import(name, module, log=print):
+    """A LazyClient for an optional module, imported on first use."""
+    return LazyClient(name, lambda: importlib.import_module(module), log=log)
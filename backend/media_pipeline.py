@@ -0,0 +1,257 @@
+"""Image optimization off the request thread, into responsive renditions.
+
+/api/upload-media used to decode, LANCZOS-resize and re-encode every photo on
+the gunicorn thread that received it. Those are CPU-bound Pillow calls, and a
+10MB phone photo holds the GIL long enough to stall the other threads in that
+worker, whatever they were doing.
+
+MediaJobs moves that work into a small process pool. The endpoint sniffs the
+output format from the image header (cheap, no pixel decode), so it knows the
+final object path up front. It answers at once with that URL marked pending.
+A per-worker thread hands the bytes to a pool process, and uploads the result
+to GCS when it comes back. The builder polls GET /api/media/status until the
+object exists.
+
+Renditions. One decode produces every width in RENDITION_WIDTHS, each as
+WebP plus a JPEG fallback (PNG when the image has transparency). They are
+stored side by side:
+
+    media/{yyyy-mm}/{id}/120.webp   120.jpg
+                         320.webp   320.jpg
+                         600.webp   600.jpg
+                         1200.webp  1200.jpg   <- primary: the URL clients keep
+
+A width is an upper bound, and images are never upscaled. Each rendition
+also keeps its height within twice its width, so a tall screenshot can't
+stay huge. Because the layout is fixed, rendition_url() can turn a stored
+primary URL into any other rendition with no lookup. The email renderer uses
+it to choose the smallest JPEG/PNG that covers each slot on a 2x display
+(email clients can't rely on WebP). The feed uses it for WebP srcsets.
+URLs that aren't rendition sets (older uploads, GIFs, videos, link images)
+pass through unchanged.
+
+An image Pillow can't handle is stored once, unchanged, as the primary,
+with metadata renditions=none. unrendered_url() then marks its URL with a
+query string: rendition_url() (and the builder's copy of it) only derive
+renditions from a bare set URL, so that image is always served as stored.
+
+The primary is uploaded last, so readiness is "the primary is in the bucket".
+A poll landing on another worker or instance still sees it. Failures are
+remembered per worker only, and reported only while the primary is absent.
+A second submit for a prefix that already has a job queued or running (a
+retried finalize) is dropped.
+
+Pool processes are spawned (not forked) on first use. Forking a worker that
+already runs gRPC/Firestore threads isn't safe. A spawned child re-imports
+the main module: under gunicorn that is a no-op, under `python app.py` each
+child runs app.py's setup once. A child that dies (e.g. an out-of-memory
+decode) breaks the pool; the next job starts a fresh one.
+
+Never imports app.py; the bucket is passed in. render_renditions runs in the
+child processes, so it only needs Pillow.
+"""
+
+import io
+import multiprocessing
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+RENDITION_WIDTHS = (120, 320, 600, 1200)
+PRIMARY_WIDTH = RENDITION_WIDTHS[-1]
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+NO_RENDITIONS = {'renditions': 'none'}    # metadata on a primary stored as uploaded
+_MAX_FAILURES_KEPT = 500
+
+# .../media/2026-10/<32 hex>/1200.jpg
+_RENDITION_URL = re.compile(r'^(.*/media/\d{4}-\d{2}/[0-9a-f]{32})/(\d+)\.(jpg|png|webp)$')
+
+
+def _has_alpha(img):
+    return img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+
+
+def output_format(file_bytes):
+    """(mime, ext) of the fallback renditions, read from the image header
+    alone. None if Pillow can't open it."""
+    try:
+        from PIL import Image
+        img = Image.open(io.BytesIO(file_bytes))
+    except Exception:
+        return None
+    return ('image/png', '.png') if _has_alpha(img) else ('image/jpeg', '.jpg')
+
+
+def rendition_names(ext):
+    """Object names in a rendition set, primary last."""
+    names = [f'{w}{suffix}' for w in RENDITION_WIDTHS for suffix in ('.webp', ext)]
+    names.remove(f'{PRIMARY_WIDTH}{ext}')
+    return names + [f'{PRIMARY_WIDTH}{ext}']
+
+
+def rendition_url(url, width, webp=False):
+    """The smallest rendition at least `width` px wide (the largest if none
+    is) of a rendition-set URL; any other URL is returned unchanged."""
+    m = _RENDITION_URL.match(url or '')
+    if not m:
+        return url
+    ext = m.group(3)
+    if webp:
+        ext = 'webp'
+    elif ext == 'webp':
+        ext = 'jpg'
+    w = next((w for w in RENDITION_WIDTHS if w >= width), PRIMARY_WIDTH)
+    return f'{m.group(1)}/{w}.{ext}'
+
+
+def unrendered_url(url, metadata):
+    """The URL to hand out for a stored primary: unchanged for a rendition
+    set, marked so no rendition is derived from it when the primary is the
+    original upload (see NO_RENDITIONS)."""
+    if (metadata or {}).get('renditions') == NO_RENDITIONS['renditions']:
+        return f'{url}?renditions=none'
+    return url
+
+
+def render_renditions(file_bytes):
+    """Decode once and encode every width as WebP plus JPEG (PNG if the
+    image has transparency), stripping EXIF. Returns [(name, bytes, mime)]
+    in rendition_names() order. Raises if Pillow can't decode it."""
+    from PIL import Image
+    img = Image.open(io.BytesIO(file_bytes))
+    img.load()
+    if _has_alpha(img):
+        img = img.convert('RGBA')
+        fmt, mime, ext, opts = 'PNG', 'image/png', '.png', {'optimize': True}
+    else:
+        img = img.convert('RGB')
+        fmt, mime, ext, opts = 'JPEG', 'image/jpeg', '.jpg', {
+            'quality': JPEG_QUALITY, 'optimize': True, 'progressive': True}
+
+    def encode(im, **kwargs):
+        out = io.BytesIO()
+        im.save(out, **kwargs)
+        return out.getvalue()
+
+    encoded = {}
+    # Largest first, each step resized from the one before.
+    for w in reversed(RENDITION_WIDTHS):
+        if img.width > w or img.height > 2 * w:
+            img = img.copy()
+            img.thumbnail((w, 2 * w), Image.LANCZOS)
+        encoded[f'{w}.webp'] = (encode(img, format='WEBP', quality=WEBP_QUALITY, method=4), 'image/webp')
+        encoded[f'{w}{ext}'] = (encode(img, format=fmt, **opts), mime)
+    return [(name, *encoded[name]) for name in rendition_names(ext)]
+
+
+class MediaJobs:
+    """Render-and-upload jobs for one worker process. With processes=0 the
+    rendering runs inline on the calling thread."""
+
+    def __init__(self, bucket, processes=2, uploaders=4, log=print):
+        self._bucket = bucket
+        self.processes = max(0, int(processes))
+        self._log = log
+        self._lock = threading.Lock()
+        self._procs = None          # created on first use, after gunicorn forks
+        self._threads = (ThreadPoolExecutor(max_workers=uploaders, thread_name_prefix='media')
+                         if self.processes else None)
+        self._failed = OrderedDict()
+        self._active = set()        # prefixes with a job queued or running
+
+    def submit(self, prefix, ext, data, mime, source=None):
+        """publish() in the background; a failure is kept for failure().
+        A prefix that already has a job queued or running is ignored (a
+        retried finalize), and None is returned."""
+        with self._lock:
+            if prefix in self._active:
+                self._log(f"[MEDIA] {prefix}/ already queued, ignoring duplicate")
+                return None
+            self._active.add(prefix)
+        return self._threads.submit(self._run, prefix, ext, data, mime, source)
+
+    def publish(self, prefix, ext, data, mime, source=None):
+        """Render `data` and upload the rendition set under `prefix`, primary
+        last. Returns (primary size in bytes, whether renditions were made);
+        if Pillow fails, the original alone is stored as the primary. With
+        `source` (an object in the bucket, e.g. a browser's signed upload),
+        the bytes are read from it unless `data` is given, and once the set is
+        stored it is replaced by an empty tombstone (metadata upload=consumed):
+        a one-shot signed URL can't recreate an object that still exists. The
+        upload sweep deletes tombstones later."""
+        bucket = self._bucket()
+        if data is None:
+            data = bucket.blob(source).download_as_bytes()
+        try:
+            renditions = self._render(data)
+        except Exception as e:
+            self._log(f"[MEDIA] Pillow optimize failed on {prefix}, storing the original only: {e}")
+            renditions = None
+        if renditions is None:
+            primary = bucket.blob(f'{prefix}/{PRIMARY_WIDTH}{ext}')
+            primary.metadata = dict(NO_RENDITIONS)
+            primary.upload_from_string(data, content_type=mime)
+            self._log(f"[MEDIA] Uploaded {prefix}/ (original only, {len(data)} bytes)")
+            rendered = False
+        else:
+            for name, body, body_mime in renditions:
+                bucket.blob(f'{prefix}/{name}').upload_from_string(body, content_type=body_mime)
+            rendered = True
+            self._log(f"[MEDIA] Uploaded {prefix}/ ({len(renditions)} renditions, "
+                      f"{sum(len(r[1]) for r in renditions)} bytes; "
+                      f"primary {len(renditions[-1][1])}, was {len(data)})")
+        if source:
+            try:
+                tombstone = bucket.blob(source)
+                tombstone.metadata = {'upload': 'consumed'}
+                tombstone.upload_from_string(b'', content_type='application/octet-stream')
+            except Exception as e:
+                self._log(f"[MEDIA] Could not replace upload {source} with a tombstone: {e}")
+        return (len(renditions[-1][1]) if rendered else len(data)), rendered
+
+    def failure(self, path):
+        """The error that stopped `path` from landing, if this worker saw one.
+        Only meaningful while `path` is absent: a later job may have stored it."""
+        with self._lock:
+            return self._failed.get(path)
+
+    def _run(self, prefix, ext, data, mime, source):
+        primary = f'{prefix}/{PRIMARY_WIDTH}{ext}'
+        try:
+            self.publish(prefix, ext, data, mime, source)
+            with self._lock:
+                self._failed.pop(primary, None)
+        except Exception as e:
+            self._log(f"[MEDIA] Upload of {prefix}/ failed: {e}")
+            with self._lock:
+                self._failed[primary] = str(e)
+                while len(self._failed) > _MAX_FAILURES_KEPT:
+                    self._failed.popitem(last=False)
+        finally:
+            with self._lock:
+                self._active.discard(prefix)
+
+    def _render(self, data):
+        if not self.processes:
+            return render_renditions(data)
+        try:
+            return self._pool().submit(render_renditions, data).result()
+        except BrokenProcessPool:
+            self._reset_pool()
+            raise
+
+    def _pool(self):
+        with self._lock:
+            if self._procs is None:
+                self._procs = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context('spawn'))
+            return self._procs
+
+    def _reset_pool(self):
+        with self._lock:
+            procs, self._procs = self._procs, None
+        if procs is not None:
+            procs.shutdown(wait=False)
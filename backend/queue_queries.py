@@ -0,0 +1,113 @@
+"""Server-side queries over the builder's submission queues.
+
+_list_collection used to stream every document in a queue collection and sort
+by created_at in Python, and auto-build then threw away everything that wasn't
+status 'new'. Queues only grow (used entries stay for the record), so each
+builder open read the whole history of the queue.
+
+Here the status filter, the Shout-out content type, the created_at ordering
+and the page size all go to Firestore, backed by the composite indexes in
+firestore.indexes.json (status + created_at on every queue, plus
+content_types + status + created_at and content_types + created_at, for a
+content type with no status filter, on culture_submissions):
+
+    docs, cursor = query_submissions(db, 'update_submissions', statuses=['new'], limit=50)
+    more, cursor = query_submissions(db, 'update_submissions', statuses=['new'], limit=50, cursor=cursor)
+
+Pages are ordered newest first, ties broken by document id, and the cursor is
+an opaque token for the last (created_at, id) returned. Resuming from it needs
+no extra read, and it still works after that document is deleted.
+
+Every queue doc is written with `status` and `created_at` (_submit_queue and
+the feed dual-write), so filtering and ordering on them server-side drops
+nothing the Python filter used to keep.
+
+Like the other backend modules this never imports app.py; the Firestore client
+is passed in.
+"""
+
+import base64
+import json
+
+DESCENDING = 'DESCENDING'   # google.cloud.firestore.Query.DESCENDING
+ORDER_FIELD = 'created_at'
+MAX_IN_VALUES = 30          # Firestore's limit for an 'in' filter
+# Queues with content_types composite indexes (firestore.indexes.json); a
+# content type filter anywhere else would fail with FAILED_PRECONDITION.
+CONTENT_TYPE_COLLECTIONS = frozenset({'culture_submissions'})
+
+
+class InvalidCursor(ValueError):
+    """The pagination token didn't come from query_submissions."""
+
+
+def encode_cursor(doc):
+    raw = json.dumps([doc.get(ORDER_FIELD, ''), doc['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+    if not isinstance(created_at, str) or not isinstance(doc_id, str) or not doc_id:
+        raise InvalidCursor('Invalid cursor')
+    return created_at, doc_id
+
+
+def _base_query(db, collection, statuses=None, content_type=None):
+    query = db.collection(collection)
+    statuses = list(statuses or [])
+    if len(statuses) > MAX_IN_VALUES:
+        raise ValueError(f'At most {MAX_IN_VALUES} statuses per query')
+    if len(statuses) == 1:
+        query = query.where('status', '==', statuses[0])
+    elif statuses:
+        query = query.where('status', 'in', statuses)
+    if content_type:
+        if collection not in CONTENT_TYPE_COLLECTIONS:
+            raise ValueError(f'{collection} has no content type filter')
+        query = query.where('content_types', 'array_contains', content_type)
+    return (query.order_by(ORDER_FIELD, direction=DESCENDING)
+                 .order_by('__name__', direction=DESCENDING))
+
+
+def query_submissions(db, collection, statuses=None, content_type=None, limit=None, cursor=None):
+    """One page of a queue, newest first, with each doc's id attached.
+
+    statuses: only docs whose status is one of these (None = any).
+    content_type: only docs whose content_types array contains it
+        (CONTENT_TYPE_COLLECTIONS only; ValueError elsewhere).
+    limit: page size (None = everything after the cursor).
+    cursor: the token a previous page returned.
+
+    Returns (docs, next_cursor). next_cursor is None on the last page.
+    Raises InvalidCursor for a token this function didn't produce."""
+    query = _base_query(db, collection, statuses, content_type)
+    if cursor:
+        created_at, doc_id = decode_cursor(cursor)
+        query = query.start_after({ORDER_FIELD: created_at,
+                                   '__name__': db.collection(collection).document(doc_id)})
+    if limit:
+        query = query.limit(limit)
+    docs = []
+    for snap in query.stream():
+        item = snap.to_dict() or {}
+        item['id'] = snap.id
+        docs.append(item)
+    next_cursor = encode_cursor(docs[-1]) if limit and len(docs) == limit else None
+    return docs, next_cursor
+
+
+def iter_submissions(db, collection, statuses=None, content_type=None, page_size=20):
+    """Yield docs page by page, so a caller that stops early (auto-build wants
+    the first five usable updates) only reads the pages it consumed."""
+    cursor = None
+    while True:
+        docs, cursor = query_submissions(db, collection, statuses, content_type,
+                                         limit=page_size, cursor=cursor)
+        yield from docs
+        if not cursor:
+            return
@@ -0,0 +1,328 @@
+"""Per-worker cache of the Firestore employee roster.
+
+Every roster read used to stream the whole `employees` collection. This module
+keeps one name-sorted snapshot per worker process and keeps it fresh two ways:
+
+- Listener mode (preferred): a Firestore on_snapshot watch on the collection
+  pushes every change, so reads are pure memory lookups and another Cloud Run
+  instance's write shows up here within a second or two.
+- Polling mode (fallback, when the watch can't start or has died, until it is
+  restarted on a read at least `ttl` seconds later): the snapshot
+  is trusted for `ttl` seconds, then revalidated against a single version-stamp
+  document (app_config/roster_version) that every roster write bumps. Only a
+  changed stamp triggers a full reload, so a quiet roster costs one doc read per
+  TTL instead of a collection scan per request.
+
+Writers call bump() after changing the roster so this worker drops its copy at
+once and other workers in polling mode see the new stamp.
+
+Values derived from the roster (RosterIndex, the month-keyed birthday and
+anniversary index below) are memoized per snapshot via derived(), so they are
+rebuilt only when the roster actually changes.
+
+Like user_sync, this module takes the Firestore client as an argument and never
+imports app.py; google.cloud is imported lazily (only for the version
+Increment) so the app still boots without it.
+"""
+
+import threading
+import time
+
+
+def _sort_key(emp):
+    return (emp.get('name') or '').lower()
+
+
+def _as_int(value):
+    """Coerce a month/day/year field to int; null / '' / bad input -> 0."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class RosterCache:
+    """Thread-safe, name-sorted roster snapshot with hit/miss/staleness counters.
+
+    get() returns a new list each call, but the employee dicts inside are shared
+    with the cache — callers must treat them as read-only (get a fresh record
+    via a direct document read before editing one)."""
+
+    def __init__(self, db, collection, version_doc=('app_config', 'roster_version'),
+                 ttl=30.0, listen=True, log=print):
+        self._db = db
+        self._collection = collection
+        self._version_doc = version_doc
+        self._ttl = float(ttl)
+        self._listen = listen
+        self._log = log
+
+        self._lock = threading.RLock()
+        self._snapshot = None       # list of employee dicts, name-sorted
+        self._version = None        # last version stamp seen (polling mode)
+        self._loaded_at = 0.0       # monotonic time the snapshot was built
+        self._checked_at = 0.0      # monotonic time the snapshot was last validated
+        self._dirty = False
+        self._watch = None
+        self._watch_started = False
+        self._watch_retry_at = 0.0  # monotonic time a failed/dead watch may restart
+        self._listener_ready = False
+        self._derived = {}          # name -> (snapshot it was built from, value)
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stale_served': 0,
+            'version_checks': 0,
+            'listener_events': 0,
+            'invalidations': 0,
+            'load_errors': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Listener
+    # ------------------------------------------------------------------
+
+    def _ensure_listener(self):
+        """Start the on_snapshot watch unless one is running; only one thread
+        gets to start it. A watch that failed to start or died is retried no
+        sooner than `ttl` seconds later, polling meanwhile."""
+        if not self._listen:
+            return
+        with self._lock:
+            if self._watch_started or time.monotonic() < self._watch_retry_at:
+                return
+            self._watch_started = True
+        try:
+            watch = self._db.collection(self._collection).on_snapshot(self._on_snapshot)
+        except Exception as e:
+            self._listener_down(f"[ROSTER] Listener unavailable, polling every {self._ttl:.0f}s: {e}")
+            return
+        with self._lock:
+            self._watch = watch
+        self._log(f"[ROSTER] Listening for changes on '{self._collection}'")
+
+    def _listener_down(self, message):
+        """Back to polling; the next read after the retry delay restarts the
+        watch. The dead watch is dropped, not unsubscribed: its thread may be
+        waiting on our lock."""
+        with self._lock:
+            self._watch = None
+            self._listener_ready = False
+            self._watch_started = False
+            self._watch_retry_at = time.monotonic() + self._ttl
+        self._log(message)
+
+    def _on_snapshot(self, docs, changes, read_time):
+        """Watch callback (runs on the Firestore watch thread)."""
+        employees = [d.to_dict() for d in docs if d.exists]
+        employees.sort(key=_sort_key)
+        with self._lock:
+            self._snapshot = employees
+            self._loaded_at = self._checked_at = time.monotonic()
+            self._dirty = False
+            self._listener_ready = True
+            self._stats['listener_events'] += 1
+
+    def _listener_healthy(self):
+        if not self._listener_ready or self._watch is None:
+            return False
+        try:
+            if self._watch.is_active:
+                return True
+        except Exception:
+            pass
+        # The watch stopped streaming (RPC error, network drop). Fall back to
+        # polling rather than serving a snapshot nobody is updating anymore.
+        self._listener_down('[ROSTER] Listener stopped, falling back to polling')
+        return False
+
+    # ------------------------------------------------------------------
+    # Loading / validation
+    # ------------------------------------------------------------------
+
+    def _version_ref(self):
+        return self._db.collection(self._version_doc[0]).document(self._version_doc[1])
+
+    def _read_version(self):
+        self._stats['version_checks'] += 1
+        snap = self._version_ref().get()
+        return (snap.to_dict() or {}).get('version', 0) if snap.exists else 0
+
+    def _load(self):
+        # Read the stamp BEFORE the scan: a write that lands mid-scan bumps it
+        # past what we record, so the next check reloads instead of trusting a
+        # snapshot that may have missed the write.
+        version = self._read_version()
+        docs = self._db.collection(self._collection).stream()
+        employees = [d.to_dict() for d in docs if d.exists]
+        employees.sort(key=_sort_key)
+        return employees, version
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def _fresh(self):
+        """Return the validated internal snapshot list (not a copy)."""
+        self._ensure_listener()
+        with self._lock:
+            now = time.monotonic()
+            if self._listener_healthy() and not self._dirty:
+                self._stats['hits'] += 1
+                return self._snapshot
+
+            if self._snapshot is not None and not self._dirty:
+                if now - self._checked_at < self._ttl:
+                    self._stats['hits'] += 1
+                    return self._snapshot
+                try:
+                    if self._read_version() == self._version:
+                        self._checked_at = now
+                        self._stats['hits'] += 1
+                        return self._snapshot
+                except Exception as e:
+                    self._log(f'[ROSTER] Version check failed (serving cached roster): {e}')
+                    self._stats['stale_served'] += 1
+                    return self._snapshot
+
+            self._stats['misses'] += 1
+            try:
+                employees, version = self._load()
+            except Exception:
+                self._stats['load_errors'] += 1
+                if self._snapshot is None:
+                    raise
+                self._stats['stale_served'] += 1
+                self._log('[ROSTER] Reload failed, serving the last good roster')
+                return self._snapshot
+            self._snapshot = employees
+            self._version = version
+            self._loaded_at = self._checked_at = time.monotonic()
+            self._dirty = False
+            return employees
+
+    def get(self):
+        """Return the roster, name-sorted. Raises the underlying Firestore error
+        only when there is no snapshot at all to fall back on."""
+        return list(self._fresh())
+
+    def derived(self, name, build):
+        """Return build(roster), memoized until the roster snapshot changes.
+        Raises like get()."""
+        snapshot = self._fresh()
+        with self._lock:
+            entry = self._derived.get(name)
+            if entry is not None and entry[0] is snapshot:
+                return entry[1]
+        value = build(snapshot)
+        with self._lock:
+            self._derived[name] = (snapshot, value)
+        return value
+
+    def invalidate(self):
+        """Drop this worker's copy; the next get() reloads."""
+        with self._lock:
+            self._dirty = True
+            self._stats['invalidations'] += 1
+
+    def bump(self):
+        """Record a roster write: invalidate locally and advance the shared
+        version stamp so polling workers elsewhere reload too. Never raises."""
+        self.invalidate()
+        try:
+            from google.cloud import firestore
+            self._version_ref().set({'version': firestore.Increment(1)}, merge=True)
+        except Exception as e:
+            self._log(f'[ROSTER] Could not bump roster version: {e}')
+
+    def stats(self):
+        """Counters and freshness for /health. No I/O."""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            listening = bool(self._listener_ready and self._watch is not None)
+            out = dict(self._stats)
+            out.update({
+                'mode': 'listener' if listening else 'polling',
+                'size': len(self._snapshot) if self._snapshot is not None else 0,
+                'age_seconds': round(time.monotonic() - self._loaded_at, 1) if self._snapshot is not None else None,
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else None,
+                'ttl_seconds': self._ttl,
+            })
+            return out
+
+
+class RosterIndex:
+    """Birthday and anniversary lookups keyed by month (and month+day), built
+    once per roster snapshot so month queries cost O(matches) instead of a
+    scan plus per-row coercion on every request.
+
+    Month queries return the row shapes the builder endpoints have always
+    returned, as fresh dicts the caller may keep or modify."""
+
+    def __init__(self, employees):
+        self._birthdays = {}       # month -> [(emp, row)], sorted by day then name
+        self._anniversaries = {}   # month -> [(emp, row, start year)], same order
+        self._birthdays_on = {}    # (month, day) -> [emp]
+        self._anniversaries_on = {}
+        for emp in employees:      # roster arrives name-sorted
+            b_month = _as_int(emp.get('birthday_month'))
+            b_day = _as_int(emp.get('birthday_day'))
+            if 1 <= b_month <= 12:
+                self._birthdays.setdefault(b_month, []).append((emp, {
+                    'name': emp.get('name', ''),
+                    'email': emp.get('email', ''),
+                    'department': emp.get('department', ''),
+                    'title': emp.get('title', ''),
+                    'birthday_day': b_day,
+                    'birthday_month': b_month,
+                    'image_url': emp.get('photo_url', ''),
+                }))
+                self._birthdays_on.setdefault((b_month, b_day), []).append(emp)
+
+            a_month = _as_int(emp.get('anniversary_month'))
+            a_day = _as_int(emp.get('anniversary_day'))
+            if 1 <= a_month <= 12:
+                a_year = _as_int(emp.get('anniversary_year'))
+                self._anniversaries.setdefault(a_month, []).append((emp, {
+                    'name': emp.get('name', ''),
+                    'email': emp.get('email', ''),
+                    'department': emp.get('department', ''),
+                    'title': emp.get('title', ''),
+                    'anniversary_day': a_day,
+                    'anniversary_month': a_month,
+                    'anniversary_year': a_year,
+                    'image_url': emp.get('photo_url', ''),
+                }, a_year))
+                self._anniversaries_on.setdefault((a_month, a_day), []).append(emp)
+
+        # Stable sorts keep name order within a day.
+        for rows in self._birthdays.values():
+            rows.sort(key=lambda r: r[1]['birthday_day'])
+        for rows in self._anniversaries.values():
+            rows.sort(key=lambda r: r[1]['anniversary_day'])
+
+    def birthdays(self, month):
+        """Active employees with a birthday in `month`, sorted by day."""
+        return [dict(row) for emp, row in self._birthdays.get(month, ())
+                if emp.get('active', True)]
+
+    def anniversaries(self, month, current_year):
+        """Active employees with a work anniversary in `month`, sorted by day.
+        `years` is current_year - start year (0 when the start year is unknown)."""
+        out = []
+        for emp, row, start_year in self._anniversaries.get(month, ()):
+            if not emp.get('active', True):
+                continue
+            item = dict(row)
+            item['years'] = (current_year - start_year) if start_year else 0
+            out.append(item)
+        return out
+
+    def birthdays_on(self, month, day):
+        """Raw employee records whose birthday is month/day (any active state)."""
+        return list(self._birthdays_on.get((month, day), ()))
+
+    def anniversaries_on(self, month, day):
+        """Raw employee records whose work anniversary is month/day."""
+        return list(self._anniversaries_on.get((month, day), ()))
@@ -0,0 +1,358 @@
+"""Background newsletter send jobs, persisted in Firestore.
+
+A blocking /api/send-newsletter holds a gunicorn thread for the whole fan-out
+and dies with the request when it runs past the worker timeout. In job mode the
+endpoint only records the job and returns; a per-worker thread pool drains it,
+and the editor polls GET /api/send-newsletter/<job_id> for progress.
+
+Layout:
+
+    send_jobs/{job_id}                   subject, html, sender, status, lease
+    send_jobs/{job_id}/chunks/{00000}    recipients, status, sent, failed
+
+A chunk is the unit of acknowledgement: it goes out as one SendGrid call, and
+its status moves pending -> sending -> sent | failed. Claiming a chunk
+(pending -> sending) is a Firestore transaction, so two workers can never both
+post the same recipients.
+
+Crash recovery:
+- The worker running a job holds a lease on the job doc and renews it after
+  every chunk.
+- A job whose lease has expired is resumed by whichever worker notices it
+  first. That happens when someone polls its status, or when the resume sweep
+  runs (startup and POST /api/jobs/resume-sends).
+- The resuming worker sends only chunks still `pending`.
+- A chunk left `sending` (its worker died, or its SendGrid call raised) may
+  or may not have reached SendGrid, so it is NOT re-sent. Its recipients are reported as unconfirmed
+  failures, and an editor can re-send to just those people.
+
+Background threads only make progress while the instance has CPU. On Cloud Run
+that means CPU-always-allocated, or the status polling keeping the instance
+warm, which the builder UI does while a send is in flight.
+
+Like roster_cache, this module takes its clients as arguments and never imports
+app.py. google.cloud is imported lazily, for transactions only.
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING, SENDING, SENT, FAILED = 'pending', 'sending', 'sent', 'failed'
+QUEUED, RUNNING, DONE = 'queued', 'running', 'done'
+
+_UNCONFIRMED = 'Interrupted mid-send; delivery unconfirmed (not retried to avoid duplicates)'
+_MAX_ERRORS_SHOWN = 200
+_BATCH_WRITE_LIMIT = 400        # Firestore allows 500 writes per batch
+
+
+class SendJobs:
+    """Create, run, resume and report on send jobs for one worker process."""
+
+    def __init__(self, db, delivery, api_key_fn, collection='send_jobs', chunk_size=250,
+                 workers=2, lease_seconds=180, chunk_deadline=60.0, log=print):
+        self._db = db
+        self._delivery = delivery
+        self._api_key_fn = api_key_fn
+        self._collection = collection
+        self._chunk_size = max(1, min(int(chunk_size), delivery.batch_size))
+        self._lease_seconds = float(lease_seconds)
+        self._chunk_deadline = float(chunk_deadline)
+        self._log = log
+
+        self._owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}'
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix='send-job')
+        self._lock = threading.Lock()
+        self._active = set()    # job ids queued or running in this process
+
+    # ------------------------------------------------------------------
+    # Firestore helpers
+    # ------------------------------------------------------------------
+
+    def _job_ref(self, job_id):
+        return self._db.collection(self._collection).document(job_id)
+
+    def _chunks(self, job_id):
+        return [(c.reference, c.to_dict() or {})
+                for c in self._job_ref(job_id).collection('chunks').order_by('index').stream()]
+
+    @staticmethod
+    def _transactional(fn):
+        from google.cloud import firestore
+        return firestore.transactional(fn)
+
+    def _lease_expired(self, job):
+        # Our own lapsed lease counts too (a run that left a chunk to another
+        # worker keeps the lease); _submit skips jobs already running here.
+        return float(job.get('lease_until') or 0) < time.time()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def create(self, recipients, subject, html_content, from_email, from_name,
+               created_by='', created_at=''):
+        """Persist a job and queue it on this worker. Returns the job id."""
+        recipients = list(recipients)
+        job_ref = self._db.collection(self._collection).document()
+        chunks = [recipients[i:i + self._chunk_size]
+                  for i in range(0, len(recipients), self._chunk_size)]
+
+        # Chunks first, job doc last: a job doc is never visible (or
+        # resumable) without its full recipient list.
+        batch, writes = self._db.batch(), 0
+        for index, chunk in enumerate(chunks):
+            batch.set(job_ref.collection('chunks').document(f'{index:05d}'), {
+                'index': index,
+                'recipients': chunk,
+                'status': PENDING,
+                'sent': [],
+                'failed': [],
+            })
+            writes += 1
+            if writes >= _BATCH_WRITE_LIMIT:
+                batch.commit()
+                batch, writes = self._db.batch(), 0
+        batch.set(job_ref, {
+            'status': QUEUED,
+            'subject': subject,
+            'html': html_content,
+            'from_email': from_email,
+            'from_name': from_name,
+            'total': len(recipients),
+            'chunk_count': len(chunks),
+            'created_at': created_at,
+            'created_by': created_by,
+            'started_at': None,
+            'finished_at': None,
+            'lease_owner': None,
+            'lease_until': 0,
+        })
+        batch.commit()
+
+        self._log(f"[SEND] Job {job_ref.id} queued: {len(recipients)} recipient(s) in {len(chunks)} chunk(s)")
+        self._submit(job_ref.id)
+        return job_ref.id
+
+    def status(self, job_id):
+        """Progress report for a job, or None if it doesn't exist. Resumes the
+        job here if its runner has gone away."""
+        snap = self._job_ref(job_id).get()
+        if not snap.exists:
+            return None
+        job = snap.to_dict() or {}
+        chunks = self._chunks(job_id)
+
+        sent_count = 0
+        failures = []
+        pending_count = in_flight = 0
+        last_finished = None
+        for _, chunk in chunks:
+            sent_count += len(chunk.get('sent') or [])
+            failures.extend(chunk.get('failed') or [])
+            if chunk.get('status') == PENDING:
+                pending_count += len(chunk.get('recipients') or [])
+            elif chunk.get('status') == SENDING:
+                in_flight += len(chunk.get('recipients') or [])
+            if chunk.get('finished_at'):
+                last_finished = max(last_finished or 0, chunk['finished_at'])
+
+        resumed = False
+        if job.get('status') in (QUEUED, RUNNING) and self._lease_expired(job):
+            resumed = self._submit(job_id)
+
+        total = job.get('total') or 0
+        started = job.get('started_at')
+        now = time.time()
+        elapsed = ((job.get('finished_at') or now) - started) if started else 0.0
+        active_span = (last_finished - started) if (started and last_finished) else 0.0
+        throughput = (sent_count / active_span) if active_span > 0 else None
+        remaining = pending_count + in_flight
+        return {
+            'job_id': job_id,
+            'status': job.get('status'),
+            'done': job.get('status') == DONE,
+            'subject': job.get('subject', ''),
+            'created_at': job.get('created_at', ''),
+            'created_by': job.get('created_by', ''),
+            'total_recipients': total,
+            'sent_count': sent_count,
+            'failed_count': len(failures),
+            'pending_count': pending_count,
+            'in_flight_count': in_flight,
+            'progress': round((total - remaining) / total, 3) if total else 1.0,
+            'elapsed_seconds': round(elapsed, 1),
+            'throughput_per_sec': round(throughput, 1) if throughput else None,
+            'eta_seconds': round(remaining / throughput, 1) if (throughput and remaining) else None,
+            'errors': [f"Failed for {f.get('recipient')}: {f.get('reason')}"
+                       for f in failures[:_MAX_ERRORS_SHOWN]] or None,
+            'resumed': resumed,
+        }
+
+    def resume_stale(self):
+        """Pick up queued/running jobs whose runner has gone away. Returns the
+        ids submitted on this worker."""
+        resumed = []
+        for status in (QUEUED, RUNNING):
+            for snap in self._db.collection(self._collection).where('status', '==', status).stream():
+                if self._lease_expired(snap.to_dict() or {}) and self._submit(snap.id):
+                    resumed.append(snap.id)
+        if resumed:
+            self._log(f"[SEND] Resuming {len(resumed)} interrupted job(s): {', '.join(resumed)}")
+        return resumed
+
+    def start_resume_sweep(self):
+        """Run resume_stale() on the job pool (worker startup), logging
+        rather than raising on failure."""
+        def _sweep():
+            try:
+                self.resume_stale()
+            except Exception as e:
+                self._log(f"[SEND] Resume sweep failed: {e}")
+        self._pool.submit(_sweep)
+
+    # ------------------------------------------------------------------
+    # Runner
+    # ------------------------------------------------------------------
+
+    def _submit(self, job_id):
+        with self._lock:
+            if job_id in self._active:
+                return False
+            self._active.add(job_id)
+        self._pool.submit(self._run, job_id)
+        return True
+
+    def _claim_job(self, job_id):
+        """Take (or renew) the job's lease. Returns the job dict, or None when
+        the job is finished or another live worker holds it."""
+        ref = self._job_ref(job_id)
+
+        def _claim(transaction):
+            snap = ref.get(transaction=transaction)
+            if not snap.exists:
+                return None
+            job = snap.to_dict() or {}
+            if job.get('status') == DONE:
+                return None
+            if job.get('lease_owner') not in (None, self._owner) and float(job.get('lease_until') or 0) >= time.time():
+                return None
+            now = time.time()
+            transaction.update(ref, {
+                'status': RUNNING,
+                'lease_owner': self._owner,
+                'lease_until': now + self._lease_seconds,
+                'started_at': job.get('started_at') or now,
+            })
+            return job
+
+        return self._transactional(_claim)(self._db.transaction())
+
+    def _renew_lease(self, job_id):
+        try:
+            self._job_ref(job_id).update({'lease_until': time.time() + self._lease_seconds})
+        except Exception as e:
+            self._log(f"[SEND] Job {job_id}: lease renewal failed: {e}")
+
+    def _claim_chunk(self, ref):
+        def _claim(transaction):
+            snap = ref.get(transaction=transaction)
+            if not snap.exists or (snap.to_dict() or {}).get('status') != PENDING:
+                return False
+            transaction.update(ref, {'status': SENDING, 'owner': self._owner, 'started_at': time.time()})
+            return True
+
+        return self._transactional(_claim)(self._db.transaction())
+
+    def _settle_chunk(self, ref, sent, failed, status=None):
+        ref.update({
+            'status': status or (SENT if sent else FAILED),
+            'sent': sent,
+            'failed': [{'recipient': r, 'reason': reason} for r, reason in failed.items()],
+            'finished_at': time.time(),
+        })
+
+    def _run(self, job_id):
+        try:
+            job = self._claim_job(job_id)
+            if job is None:
+                return
+            api_key = self._api_key_fn()
+            chunks = self._chunks(job_id)
+
+            # A chunk still `sending` was interrupted if it is ours (nothing of
+            # this job is in flight here, see _active: its settle write must
+            # have failed) or was claimed over a lease ago. A younger one may
+            # still be in flight on the worker we took the lease from.
+            stale_before = time.time() - self._lease_seconds
+            for ref, chunk in chunks:
+                if chunk.get('status') == SENDING and (
+                        chunk.get('owner') == self._owner
+                        or float(chunk.get('started_at') or 0) < stale_before):
+                    self._settle_chunk(ref, [], {r: _UNCONFIRMED for r in chunk.get('recipients') or []},
+                                       status=FAILED)
+                    self._log(f"[SEND] Job {job_id}: chunk {chunk.get('index')} was interrupted mid-send; "
+                              f"{len(chunk.get('recipients') or [])} recipient(s) marked unconfirmed")
+
+            def _send(item):
+                ref, chunk = item
+                if not self._claim_chunk(ref):
+                    return
+                recipients = chunk.get('recipients') or []
+                if not api_key:
+                    self._settle_chunk(ref, [], {r: 'SendGrid API key not configured' for r in recipients})
+                    return
+                try:
+                    report = self._delivery.deliver(
+                        api_key, recipients, job.get('subject', ''), job.get('html', ''),
+                        job.get('from_email', ''), job.get('from_name', ''),
+                        deadline=self._chunk_deadline,
+                    )
+                except Exception as e:
+                    # Some of the chunk may have gone out: settle it as
+                    # unconfirmed rather than leave it `sending`.
+                    self._log(f"[SEND] Job {job_id}: chunk {chunk.get('index')} failed mid-send: {e}")
+                    self._settle_chunk(ref, [], {r: _UNCONFIRMED for r in recipients}, status=FAILED)
+                else:
+                    self._settle_chunk(ref, report.sent, report.failed)
+                self._renew_lease(job_id)
+
+            pending = [(ref, c) for ref, c in chunks if c.get('status') == PENDING]
+            with ThreadPoolExecutor(max_workers=self._delivery.max_workers,
+                                    thread_name_prefix='send-chunk') as pool:
+                for future in [pool.submit(_send, item) for item in pending]:
+                    future.result()
+
+            sent_count = failed_count = 0
+            for _, chunk in self._chunks(job_id):
+                if chunk.get('status') in (PENDING, SENDING):
+                    # Claimed elsewhere (a worker we took the lease from is
+                    # still finishing). Leave the job running and keep our
+                    # lease: the next status poll re-checks once it lapses,
+                    # which gives that worker time to settle its chunk.
+                    return
+                sent_count += len(chunk.get('sent') or [])
+                failed_count += len(chunk.get('failed') or [])
+            self._job_ref(job_id).update({
+                'status': DONE,
+                'sent_count': sent_count,
+                'failed_count': failed_count,
+                'finished_at': time.time(),
+                'lease_owner': None,
+                'lease_until': 0,
+            })
+            self._log(f"[SEND] Job {job_id} done: {sent_count}/{job.get('total', 0)} sent, {failed_count} failed")
+        except Exception as e:
+            # Release the lease so the next poll or sweep resumes from the
+            # last settled chunk rather than waiting out the lease.
+            self._log(f"[SEND] Job {job_id} stopped: {e}")
+            try:
+                self._job_ref(job_id).update({'lease_owner': None, 'lease_until': 0})
+            except Exception:
+                pass
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
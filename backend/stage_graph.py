@@ -0,0 +1,109 @@
+"""Run a request's independent I/O stages concurrently, in dependency order.
+
+auto_build_newsletter used to do its Firestore reads, the Claude joke and the
+GCS upload one after another, so the build took the sum of every round trip.
+StageGraph runs each stage on a shared thread pool as soon as the stages it
+depends on have finished, and times every stage for the response.
+
+A stage can carry a deadline (seconds from the start of run()) and a fallback
+value. When the deadline passes first, the graph moves on with the fallback and
+the late call is left to finish on its pool thread, with its result discarded.
+Because a stage is only submitted once its inputs are ready, no pool thread
+ever blocks waiting on another stage, so a shared bounded pool can't deadlock
+however many requests use it at once.
+"""
+
+import threading
+import time
+
+_NO_FALLBACK = object()
+
+
+class StageGraph:
+    """One run's stages. add() them, then run() once."""
+
+    def __init__(self, pool, log=print):
+        self._pool = pool
+        self._log = log
+        self._stages = {}       # name -> (fn, deps, deadline, fallback)
+
+    def add(self, name, fn, deps=(), deadline=None, fallback=_NO_FALLBACK):
+        """fn is called with the results of `deps`, in order. With a fallback,
+        an exception or a missed deadline yields the fallback instead of
+        failing the run (a deadline requires a fallback)."""
+        for dep in deps:
+            if dep not in self._stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        if deadline is not None and fallback is _NO_FALLBACK:
+            raise ValueError(f"Stage '{name}' has a deadline but no fallback")
+        self._stages[name] = (fn, tuple(deps), deadline, fallback)
+        return self
+
+    def run(self):
+        """Execute every stage. Returns (results, timings): results maps name to
+        value; timings maps name to {'ms': int, 'status': 'ok' | 'timeout' |
+        'error' | 'skipped'}. Re-raises the first error from a stage without a
+        fallback (after everything not downstream of it has finished)."""
+        start = time.monotonic()
+        changed = threading.Condition(threading.RLock())
+        results, timings, errors = {}, {}, {}
+        done = set()
+
+        def _ready(name):
+            return name not in done and all(d in done for d in self._stages[name][1])
+
+        def _settle(name, status, started, value=None, error=None):
+            with changed:
+                if name in done:
+                    return      # already settled (the deadline fallback won)
+                done.add(name)
+                timings[name] = {'ms': int((time.monotonic() - started) * 1000), 'status': status}
+                if error is not None:
+                    errors.setdefault(name, error)
+                else:
+                    results[name] = value
+                changed.notify_all()
+                for other, (_, deps, _, _) in self._stages.items():
+                    if name in deps and _ready(other):
+                        failed = next((errors[d] for d in deps if d in errors), None)
+                        if failed is not None:
+                            _settle(other, 'skipped', time.monotonic(), error=failed)
+                        else:
+                            self._pool.submit(_run_stage, other, [results[d] for d in deps])
+
+        def _run_stage(name, args):
+            fn, _, _, fallback = self._stages[name]
+            t0 = time.monotonic()
+            try:
+                value = fn(*args)
+            except Exception as e:
+                if fallback is _NO_FALLBACK:
+                    _settle(name, 'error', t0, error=e)
+                else:
+                    self._log(f"[STAGES] '{name}' failed, using fallback: {e}")
+                    _settle(name, 'error', t0, value=fallback)
+                return
+            _settle(name, 'ok', t0, value=value)
+
+        with changed:
+            for name, (_, deps, _, _) in self._stages.items():
+                if not deps:
+                    self._pool.submit(_run_stage, name, [])
+
+            while len(done) < len(self._stages):
+                now = time.monotonic() - start
+                next_deadline = None
+                for name, (_, _, deadline, fallback) in self._stages.items():
+                    if deadline is None or name in done:
+                        continue
+                    if deadline <= now:
+                        self._log(f"[STAGES] '{name}' missed its {deadline:g}s deadline, using fallback")
+                        _settle(name, 'timeout', start, value=fallback)
+                    elif next_deadline is None or deadline < next_deadline:
+                        next_deadline = deadline
+                if len(done) < len(self._stages):
+                    changed.wait(None if next_deadline is None else next_deadline - now)
+
+        if errors:
+            raise next(iter(errors.values()))
+        return results, timings
@@ -0,0 +1,88 @@
+"""Content-hashed URLs for files under static/.
+
+/static/<path> used to be served with Flask's defaults: no max-age, so every
+email client re-fetched the logo on every open and every page load revalidated
+it. StaticAssets hashes each file under static/ once at startup and gives it a
+fingerprinted name, with a short content hash before the extension:
+
+    /static/briteco-logo-white.png  ->  /static/briteco-logo-white.3f9a2c1b0d4e.png
+
+rewrite() swaps plain /static/... references in markup (the SPA shell, the
+email templates) for those names. A fingerprinted URL can never change
+content, so it is served with Cache-Control: public, max-age=31536000,
+immutable and a strong ETag (the full SHA-256), and repeat loads cost no bytes.
+
+Sent emails and archived issues keep whatever URL they were rendered with. So
+the plain name still works (with the ETag, revalidated each time). A
+fingerprint from an older deploy also still works: it serves the current file,
+but without the immutable header, because those bytes don't match the hash.
+
+Never imports app.py.
+"""
+
+import hashlib
+import os
+import re
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+_HASH_LEN = 12
+_FINGERPRINT_RE = re.compile(r'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[^./]+)?$' % _HASH_LEN)
+
+
+def _fingerprinted(rel_path, digest):
+    root, ext = os.path.splitext(rel_path)
+    return f'{root}.{digest[:_HASH_LEN]}{ext}'
+
+
+class StaticAssets:
+    """The static/ directory, hashed at startup."""
+
+    def __init__(self, directory, url_prefix='/static/', log=print):
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self._digests = {}      # rel path -> sha256 hex
+        self._names = {}        # fingerprinted rel path -> rel path
+        for base, _dirs, files in os.walk(directory):
+            for filename in files:
+                full = os.path.join(base, filename)
+                rel = os.path.relpath(full, directory).replace(os.sep, '/')
+                try:
+                    with open(full, 'rb') as f:
+                        digest = hashlib.sha256(f.read()).hexdigest()
+                except OSError as e:
+                    log(f"[WARNING] Static asset '{rel}' not hashed: {e}")
+                    continue
+                self._digests[rel] = digest
+                self._names[_fingerprinted(rel, digest)] = rel
+        # Longest first, so no path is rewritten inside a longer one.
+        self._rewrites = sorted(self._digests, key=len, reverse=True)
+        log(f"[STATIC] Fingerprinted {len(self._digests)} asset(s) under {directory}")
+
+    def url(self, rel_path):
+        """The fingerprinted URL of a static file (the plain one if unknown)."""
+        digest = self._digests.get(rel_path)
+        name = _fingerprinted(rel_path, digest) if digest else rel_path
+        return self.url_prefix + name
+
+    def rewrite(self, text):
+        """`text` with every plain /static/... reference fingerprinted."""
+        for rel in self._rewrites:
+            plain = self.url_prefix + rel
+            if plain in text:
+                text = re.sub(re.escape(plain) + r'(?![\w.-])', self.url(rel), text)
+        return text
+
+    def resolve(self, name):
+        """(rel path, strong ETag, immutable) for a requested name under the
+        prefix, or None if no such file was hashed."""
+        rel = self._names.get(name)
+        if rel is not None:
+            return rel, self._digests[rel], True
+        if name in self._digests:
+            return name, self._digests[name], False
+        m = _FINGERPRINT_RE.match(name)
+        if m:
+            rel = m.group('stem') + (m.group('ext') or '')
+            if rel in self._digests:
+                return rel, self._digests[rel], False    # fingerprint from an older deploy
+        return None
@@ -0,0 +1,91 @@
+"""Micro-benchmark: serving the SPA shell (GET /).
+
+Reports requests/sec and bytes on the wire for:
+
+  before  open + read index.html, str.replace the user script in front of
+          </head>, send it uncompressed (the old _serve_app)
+  after   the cached AppShell join, plain and gzip-spliced
+
+Both go through the Flask test client with a signed-in dev user, so routing,
+the auth gate and response building are included. Every gzip body is checked
+to decompress to exactly the plain page.
+
+Usage (from the repo root):
+    python benchmarks/bench_app_shell.py [--seconds 3]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DEV_AUTH_MODE', 'true')   # skip OAuth for the test client
+
+import app  # noqa: E402
+from flask import Response  # noqa: E402
+
+
+def _rate(fn, seconds):
+    fn()  # warm up
+    n = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        n += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return n / elapsed
+
+
+class _LegacyShell:
+    """Stand-in for app.app_shell that renders the old way."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def render(self, insert, gzip=False):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        return Response(html.replace('</head>', insert + '</head>', 1)).get_data(), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--seconds', type=float, default=3.0, help='time per measurement')
+    args = parser.parse_args()
+
+    client = app.app.test_client()
+    plain = {'Accept-Encoding': 'identity'}
+    gz = {'Accept-Encoding': 'gzip, deflate, br'}
+
+    cached = app.app_shell
+    app.app_shell = _LegacyShell(cached.path)
+    try:
+        legacy = client.get('/', headers=gz)
+        before = _rate(lambda: client.get('/', headers=gz), args.seconds)
+    finally:
+        app.app_shell = cached
+
+    page = client.get('/', headers=plain)
+    packed = client.get('/', headers=gz)
+    assert page.data == legacy.data
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(packed.data) == page.data
+    assert page.data.count(b'window.AUTH_USER = ') == 1
+
+    after_plain = _rate(lambda: client.get('/', headers=plain), args.seconds)
+    after_gzip = _rate(lambda: client.get('/', headers=gz), args.seconds)
+
+    print("GET / (test client, signed-in dev user)")
+    print(f"  before  read + replace     : {before:>8,.0f} req/sec  {len(legacy.data):>9,} bytes")
+    print(f"  after   cached, identity   : {after_plain:>8,.0f} req/sec  {len(page.data):>9,} bytes"
+          f"  ({after_plain / before:.1f}x)")
+    print(f"  after   cached, gzip       : {after_gzip:>8,.0f} req/sec  {len(packed.data):>9,} bytes"
+          f"  ({after_gzip / before:.1f}x, {100 * (1 - len(packed.data) / len(legacy.data)):.0f}% fewer bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Measure: response bytes with the compression middleware.
+
+Reports bytes on the wire, ratio and requests/sec per Accept-Encoding for:
+
+  render-email  POST /api/render-email with a full issue (the rendered
+                newsletter HTML inside JSON)
+  feed page     a 50-post GET /api/feed/posts body (payloads.feed_page),
+                served through the same app and middleware
+
+identity is the old behaviour. br is only measured when the `brotli` package
+is installed. Every compressed body is checked to decode to the identity
+JSON.
+
+Usage (from the repo root):
+    python benchmarks/bench_compression.py [--seconds 2]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DEV_AUTH_MODE', 'true')   # skip OAuth for the test client
+
+import app  # noqa: E402
+from backend.compression import brotli  # noqa: E402
+from payloads import full_issue, feed_page  # noqa: E402
+
+ENCODINGS = ['identity', 'gzip'] + (['br'] if brotli is not None else [])
+
+
+def _rate(fn, seconds):
+    fn()  # warm up
+    n = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        n += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return n / elapsed
+
+
+def _decode(response):
+    encoding = response.headers.get('Content-Encoding')
+    if encoding == 'gzip':
+        return gzip.decompress(response.data)
+    if encoding == 'br':
+        return brotli.decompress(response.data)
+    return response.data
+
+
+def _report(label, call, seconds):
+    print(label)
+    base = None
+    for encoding in ENCODINGS:
+        response = call({'Accept-Encoding': encoding})
+        body = json.loads(_decode(response))
+        assert body['success'], body
+        size = len(response.data)
+        base = base or size
+        rate = _rate(lambda: call({'Accept-Encoding': encoding}), seconds)
+        print(f"  {encoding:<9}: {size:>9,} bytes  ({base / size:>4.1f}x smaller)  {rate:>7,.0f} req/sec")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--seconds', type=float, default=2.0, help='time per measurement')
+    args = parser.parse_args()
+
+    page = feed_page(50)
+    # The real endpoint needs Firestore; serve the same body through the app.
+    app.app.add_url_rule('/bench/feed-page', 'bench_feed_page', lambda: app.jsonify(page))
+    client = app.app.test_client()
+    issue = full_issue()
+
+    _report("POST /api/render-email (full issue)",
+            lambda headers: client.post('/api/render-email', json=issue, headers=headers),
+            args.seconds)
+    _report("GET /api/feed/posts (50 posts)",
+            lambda headers: client.get('/bench/feed-page', headers=headers),
+            args.seconds)
+
+
+if __name__ == '__main__':
+    main()
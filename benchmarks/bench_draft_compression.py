@@ -0,0 +1,92 @@
+"""Measure: stored size of drafts with and without gzip.
+
+Reports, per object and in total, the raw json.dumps size (what used to be
+stored and downloaded) against the gzipped size upload_json() now stores,
+plus encode/decode time per object.
+
+  payloads  the benchmark issue from payloads.py (always runs)
+  bucket    every drafts/ and published/ object in the drafts bucket, read
+            with the app's own download_json (only with --bucket; needs
+            credentials, and only reads)
+
+Old plain objects and already-compressed ones are both measured by their
+decoded JSON, so the numbers hold before and after the migration.
+
+Usage (from the repo root):
+    python benchmarks/bench_draft_compression.py [--bucket]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.json_blobs import encode_json, decode_json, download_json  # noqa: E402
+from config.briteside_config import GCS_CONFIG  # noqa: E402
+from payloads import full_issue  # noqa: E402
+
+
+def _measure(obj, runs=20):
+    raw, _ = encode_json(obj, compress=False)
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        packed, _ = encode_json(obj)
+    enc_ms = (time.perf_counter() - t0) * 1000 / runs
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        decode_json(packed)
+    dec_ms = (time.perf_counter() - t0) * 1000 / runs
+    assert decode_json(packed) == decode_json(raw)
+    return len(raw), len(packed), enc_ms, dec_ms
+
+
+def _report(label, rows):
+    raw = sum(r[0] for r in rows)
+    packed = sum(r[1] for r in rows)
+    print(label)
+    print(f"  objects : {len(rows):,}")
+    print(f"  raw     : {raw:>12,} bytes")
+    print(f"  gzip    : {packed:>12,} bytes  ({raw / max(packed, 1):.1f}x smaller, "
+          f"{100 * (1 - packed / max(raw, 1)):.0f}% less stored and downloaded)")
+    print(f"  encode  : {sum(r[2] for r in rows) / len(rows):.2f} ms/object")
+    print(f"  decode  : {sum(r[3] for r in rows) / len(rows):.2f} ms/object\n")
+
+
+def _bucket_rows(prefix):
+    from google.cloud import storage
+    bucket = storage.Client().bucket(GCS_CONFIG['drafts_bucket'])
+    rows = []
+    for blob in bucket.list_blobs(prefix=prefix):
+        if not blob.name.endswith('.json'):
+            continue
+        try:
+            rows.append(_measure(download_json(blob), runs=3))
+        except Exception as e:
+            print(f"  skipping {blob.name}: {e}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--bucket', action='store_true', help='also measure the real drafts archive')
+    args = parser.parse_args()
+
+    draft = dict(full_issue(), currentStep=5, lastSavedBy='editor@brite.co',
+                 lastSavedAt='2026-10-01T12:00:00')
+    _report("Benchmark issue (payloads.full_issue)", [_measure(draft)])
+
+    if args.bucket:
+        for prefix in ('drafts/', 'published/'):
+            rows = _bucket_rows(prefix)
+            if rows:
+                _report(f"gs://{GCS_CONFIG['drafts_bucket']}/{prefix}", rows)
+            else:
+                print(f"No objects under {prefix}\n")
+
+
+if __name__ == '__main__':
+    main()
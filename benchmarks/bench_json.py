@@ -0,0 +1,86 @@
+"""Micro-benchmark: JSON serialization, stdlib vs orjson (backend/fast_json.py).
+
+For realistic payloads, reports serializations/sec for:
+
+  jsonify   Flask's DefaultJSONProvider.response (before) against
+            FastJSONProvider.response (after): sorted keys, compact
+  storage   json.dumps + encode (the old json_blobs.encode_json body) against
+            fast_json.dumps, i.e. what save_draft, auto-build and
+            save_game_answer upload before gzip
+  parse     json.loads against fast_json.loads (load_draft, get_json)
+
+Payloads: a full draft (payloads.full_issue plus builder state), the
+/api/render-email response (rendered html inside JSON), and a 50-post feed
+page. Each "after" output is checked to parse back to the "before" value.
+
+Usage (from the repo root):
+    python benchmarks/bench_json.py [--seconds 1]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DEV_AUTH_MODE', 'true')   # skip OAuth for the test client
+
+import app  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from backend import fast_json  # noqa: E402
+from backend.fast_json import FastJSONProvider  # noqa: E402
+from payloads import full_issue, feed_page  # noqa: E402
+
+
+def _rate(fn, seconds):
+    fn()  # warm up
+    n = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        n += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return n / elapsed
+
+
+def _row(label, before, after, seconds):
+    b = _rate(before, seconds)
+    a = _rate(after, seconds)
+    print(f"  {label:<9}: {b:>9,.0f} -> {a:>9,.0f} /sec  ({a / b:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--seconds', type=float, default=1.0, help='time per measurement')
+    args = parser.parse_args()
+
+    issue = full_issue()
+    html = app.app.test_client().post('/api/render-email', json=issue).get_json()['html']
+    payloads = [
+        ('Full draft', dict(issue, currentStep=5, lastSavedBy='editor@brite.co',
+                            lastSavedAt='2026-10-01T12:00:00-05:00')),
+        ('render-email response', {'success': True, 'html': html}),
+        ('Feed page (50 posts)', feed_page(50)),
+    ]
+
+    stdlib = DefaultJSONProvider(app.app)
+    fast = FastJSONProvider(app.app)
+    with app.app.app_context():
+        for label, obj in payloads:
+            old = stdlib.response(obj).get_data()
+            new = fast.response(obj).get_data()
+            assert json.loads(old) == json.loads(new)
+            print(f"{label} ({len(old):,} bytes)")
+            _row('jsonify', lambda: stdlib.response(obj), lambda: fast.response(obj), args.seconds)
+            _row('storage', lambda: json.dumps(obj).encode('utf-8'), lambda: fast_json.dumps(obj),
+                 args.seconds)
+            _row('parse', lambda: json.loads(old), lambda: fast_json.loads(old), args.seconds)
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""Benchmark: submission-queue reads against the Firestore emulator.
+
+Seeds 50,000 queue docs (update + culture submissions, ~2% still 'new', a third
+of culture entries tagged Shout-out, created_at spread over five years), then
+times the builder's reads:
+
+  builder panel   before: stream the whole collection, sort + filter in Python
+                  after:  status='new' ordered by created_at in Firestore
+  auto-build      before: same full read, then the first 5 usable updates
+                  after:  iter_submissions paging until 5 are found
+  shout-outs      before: full culture read, filter status + content type
+                  after:  status + array_contains pushed down
+  one page        ?limit=50 through the cursor API, first page and the next
+
+Needs the emulator, which doesn't enforce composite indexes; production
+queries need the ones in firestore.indexes.json:
+    gcloud emulators firestore start --host-port=localhost:8181
+    FIRESTORE_EMULATOR_HOST=localhost:8181 python benchmarks/bench_queue_queries.py
+
+Seeding goes to bench_* collections and is skipped when they are already full
+(--reseed forces it).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.queue_queries import query_submissions, iter_submissions  # noqa: E402
+
+UPDATES = 'bench_update_submissions'
+CULTURE = 'bench_culture_submissions'
+CULTURE_TYPES = ['Shout-out', 'Media with own caption', 'Educational/informational link', 'Other']
+
+
+def _seed(db, total, reseed):
+    if not reseed and len(list(db.collection(UPDATES).limit(1).stream())):
+        print("Using the existing bench_* collections (--reseed to rebuild)\n")
+        return
+    rng = random.Random(7)
+    start = datetime(2021, 10, 1)
+    batch, pending = db.batch(), 0
+    t0 = time.perf_counter()
+    for i in range(total):
+        created = (start + timedelta(minutes=rng.randrange(5 * 365 * 24 * 60))).isoformat()
+        status = 'new' if rng.random() < 0.02 else rng.choice(['used', 'archived', 'approved'])
+        if i % 2:
+            ref = db.collection(UPDATES).document()
+            doc = {'summary': f'Update {i}\n\nBody text for update {i}. ' * 3, 'files': [],
+                   'submitted_by': f'user{i % 120}@brite.co', 'status': status, 'created_at': created}
+        else:
+            ref = db.collection(CULTURE).document()
+            doc = {'content': f'Culture post {i} ' * 6,
+                   'content_types': ['Shout-out'] if rng.random() < 0.33 else [rng.choice(CULTURE_TYPES[1:])],
+                   'files': [], 'submitted_by': f'user{i % 120}@brite.co',
+                   'status': status, 'created_at': created}
+        batch.set(ref, doc)
+        pending += 1
+        if pending == 500:
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+    print(f"Seeded {total:,} docs in {time.perf_counter() - t0:.1f}s\n")
+
+
+def _legacy_list(db, collection):
+    """The pre-query-layer _list_collection, verbatim."""
+    out = []
+    for d in db.collection(collection).stream():
+        item = d.to_dict() or {}
+        item['id'] = d.id
+        out.append(item)
+    out.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+    return out
+
+
+def _same(a, b):
+    """Same docs in the same created_at order (ties may be ordered either way:
+    the query breaks them by id, the legacy sort by stream order)."""
+    return ([d.get('created_at') for d in a] == [d.get('created_at') for d in b]
+            and {d['id'] for d in a} == {d['id'] for d in b})
+
+
+def _time(fn, runs):
+    samples, result = [], None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), result
+
+
+def _row(label, before, after):
+    (b_ms, b_n), (a_ms, a_n) = before, after
+    print(label)
+    print(f"  before  : {b_ms:>9,.1f} ms  ({b_n:,} docs read)")
+    print(f"  after   : {a_ms:>9,.1f} ms  ({a_n:,} docs read)  ({b_ms / a_ms:.0f}x)\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--docs', type=int, default=50_000, help='queue docs to seed')
+    parser.add_argument('--runs', type=int, default=5, help='timed runs per measurement (median)')
+    parser.add_argument('--reseed', action='store_true', help='rebuild the bench collections')
+    args = parser.parse_args()
+
+    if not os.environ.get('FIRESTORE_EMULATOR_HOST'):
+        sys.exit("Set FIRESTORE_EMULATOR_HOST (this benchmark never touches a real project).")
+    from google.cloud import firestore
+    db = firestore.Client(project=os.environ.get('GOOGLE_CLOUD_PROJECT', 'brite-side-bench'))
+    _seed(db, args.docs, args.reseed)
+    full = {c: len(list(db.collection(c).select([]).stream())) for c in (UPDATES, CULTURE)}
+
+    def panel_before():
+        return [s for s in _legacy_list(db, UPDATES) if (s.get('status') or 'new') == 'new']
+
+    def panel_after():
+        return query_submissions(db, UPDATES, ['new'])[0]
+
+    b_ms, b = _time(panel_before, args.runs)
+    a_ms, a = _time(panel_after, args.runs)
+    assert _same(a, b), 'query layer disagrees with the legacy read'
+    _row(f"Builder panel (GET /api/submissions/update?status=new, {len(a)} open)",
+         (b_ms, full[UPDATES]), (a_ms, len(a)))
+
+    def first_five(docs):
+        out = []
+        for sub in docs:
+            if (sub.get('status') or 'new') == 'new' and sub.get('summary'):
+                out.append(sub)
+                if len(out) >= 5:
+                    break
+        return out
+
+    b_ms, _ = _time(lambda: first_five(_legacy_list(db, UPDATES)), args.runs)
+    read = []
+
+    def auto_after():
+        read.clear()
+        return first_five(read.append(s) or s for s in iter_submissions(db, UPDATES, ['new'], page_size=10))
+
+    a_ms, _ = _time(auto_after, args.runs)
+    _row("Auto-build updates (first 5 open)", (b_ms, full[UPDATES]), (a_ms, len(read)))
+
+    def shout_before():
+        return [s for s in _legacy_list(db, CULTURE)
+                if (s.get('status') or 'new') == 'new' and 'Shout-out' in (s.get('content_types') or [])]
+
+    b_ms, b = _time(shout_before, args.runs)
+    a_ms, a = _time(lambda: query_submissions(db, CULTURE, ['new'], content_type='Shout-out')[0], args.runs)
+    assert _same(a, b), 'shout-out query disagrees with the legacy read'
+    _row(f"Open shout-outs ({len(a)})", (b_ms, full[CULTURE]), (a_ms, len(a)))
+
+    def two_pages():
+        page, cursor = query_submissions(db, UPDATES, limit=50)
+        more, _ = query_submissions(db, UPDATES, limit=50, cursor=cursor)
+        return page + more
+
+    b_ms, b = _time(lambda: _legacy_list(db, UPDATES)[:100], args.runs)
+    a_ms, pages = _time(two_pages, args.runs)
+    assert [d['created_at'] for d in pages] == [d['created_at'] for d in b], 'pages out of order'
+    assert len({d['id'] for d in pages}) == len(pages), 'cursor repeated a doc'
+    _row("Two 50-doc pages via cursor (all statuses)", (b_ms, full[UPDATES]), (a_ms, len(pages)))
+
+
+if __name__ == '__main__':
+    main()
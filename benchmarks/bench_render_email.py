@@ -0,0 +1,127 @@
+"""Micro-benchmark: newsletter email rendering.
+
+Renders a full issue (5 updates, 3 spotlights, 20 birthdays, game, shout-outs)
+and reports renders/sec for:
+
+  template stage  before: open the file + logo str.replace + regex re.sub
+                  after:  the pre-compiled template's single ''.join
+  end to end      POST /api/render-email through the Flask test client, with
+                  the legacy template stage swapped in (before) and the
+                  compiled registry (after)
+  preview edit    re-render after changing one update's body, with the
+                  section cache disabled (before) and warm (after)
+
+Usage (from the repo root):
+    python benchmarks/bench_render_email.py [--seconds 3]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DEV_AUTH_MODE', 'true')   # skip OAuth for the test client
+
+import app  # noqa: E402
+from payloads import full_issue  # noqa: E402
+
+
+def _rate(fn, seconds):
+    fn()  # warm up
+    n = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        n += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return n / elapsed
+
+
+def _legacy_render(path, replacements, base_url):
+    """The pre-compilation render_email template stage, verbatim."""
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    html = html.replace('/static/briteco-logo-white.png', f'{base_url}/static/briteco-logo-white.png')
+    return re.sub(r'\{\{(\w+)\}\}', lambda m: replacements.get(m.group(1), m.group(0)), html)
+
+
+class _LegacyTemplates:
+    """Stand-in for app.email_templates that renders the old way."""
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    def path(self, name):
+        return self._registry.path(name)
+
+    def get(self, name):
+        path = self.path(name)
+        return type('LegacyTemplate', (), {
+            'render': staticmethod(lambda values, base_url='': _legacy_render(path, values, base_url)),
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--seconds', type=float, default=3.0, help='time per measurement')
+    args = parser.parse_args()
+
+    client = app.app.test_client()
+    payload = full_issue()
+    resp = client.post('/api/render-email', json=payload)
+    html = resp.get_json()['html']
+    print(f"Full issue renders to {len(html):,} chars of HTML\n")
+
+    # Values sized like a real issue for the template-stage comparison.
+    template = app.email_templates.get(app.DEFAULT_EMAIL_TEMPLATE)
+    values = {name: 'x' * 400 for name in template.placeholders}
+    base_url = 'https://briteside.example.com'
+    path = app.email_templates.path(app.DEFAULT_EMAIL_TEMPLATE)
+    # Same output, apart from the logo's fingerprinted URL (backend/static_assets.py).
+    legacy = app.static_assets.rewrite(_legacy_render(path, values, base_url))
+    assert legacy == template.render(values, base_url=base_url)
+
+    before = _rate(lambda: _legacy_render(path, values, base_url), args.seconds)
+    after = _rate(lambda: template.render(values, base_url=base_url), args.seconds)
+    print("Template stage (per render)")
+    print(f"  before  file read + re.sub : {before:>10,.0f} renders/sec")
+    print(f"  after   compiled join      : {after:>10,.0f} renders/sec  ({after / before:.1f}x)\n")
+
+    compiled = app.email_templates
+    app.email_templates = _LegacyTemplates(compiled)
+    try:
+        e2e_before = _rate(lambda: client.post('/api/render-email', json=payload), args.seconds)
+    finally:
+        app.email_templates = compiled
+    e2e_after = _rate(lambda: client.post('/api/render-email', json=payload), args.seconds)
+    print("End to end (POST /api/render-email, full issue, test client)")
+    print(f"  before                     : {e2e_before:>10,.0f} renders/sec")
+    print(f"  after                      : {e2e_after:>10,.0f} renders/sec  ({e2e_after / e2e_before:.2f}x)\n")
+
+    # A preview session: the editor re-renders after each keystroke in one
+    # update, so every other section's inputs are unchanged.
+    edits = iter(range(10 ** 9))
+
+    def _edit_and_render():
+        payload['updates'][0]['body'] = f"Edited body, revision {next(edits)}"
+        client.post('/api/render-email', json=payload)
+
+    warm = app.email_sections
+    app.email_sections = app.SectionCache(max_entries=0)   # every lookup misses
+    try:
+        edit_before = _rate(_edit_and_render, args.seconds)
+    finally:
+        app.email_sections = warm
+    edit_after = _rate(_edit_and_render, args.seconds)
+    print("Preview re-render after a one-field edit (section cache)")
+    print(f"  before  all sections built : {edit_before:>10,.0f} renders/sec")
+    print(f"  after   changed one only   : {edit_after:>10,.0f} renders/sec  ({edit_after / edit_before:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
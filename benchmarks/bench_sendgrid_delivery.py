@@ -0,0 +1,143 @@
+"""Benchmark + check: newsletter delivery against a local fake SendGrid.
+
+Starts a fake v3 Mail Send server on 127.0.0.1 (every call takes --latency
+seconds), points SENDGRID_API_BASE at it, and posts to /api/send-newsletter
+through the Flask test client:
+
+  before  one API call per recipient, one at a time (the old sg.send() loop;
+          SendGridDelivery with batch_size=1, max_workers=1)
+  after   the configured engine: up to 1000 personalizations per call,
+          posted concurrently
+
+The "after" run also injects the failures the engine has to absorb: a 429
+with Retry-After, a 503, and a 400 naming one malformed address. It then
+checks that every valid recipient was accepted exactly once and that only
+the malformed one is reported as failed.
+
+Usage (from the repo root):
+    python benchmarks/bench_sendgrid_delivery.py [--recipients 2000] [--latency 0.02]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DEV_AUTH_MODE', 'true')   # skip OAuth for the test client
+
+API_KEY = 'bench-key'
+
+
+class FakeSendGrid(ThreadingHTTPServer):
+    """Records accepted recipients; `faults` is a list of statuses (429, 503)
+    returned, in order, for the next calls."""
+
+    daemon_threads = True
+
+    def __init__(self, latency):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.accepted = []
+        self.calls = 0
+        self.faults = []
+
+    def reset(self, faults=()):
+        with self.lock:
+            self.accepted, self.calls, self.faults = [], 0, list(faults)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self.headers.get('Authorization') != f'Bearer {API_KEY}':
+            return self._reply(401, {'errors': [{'message': 'bad key'}]})
+        time.sleep(server.latency)
+        with server.lock:
+            server.calls += 1
+            fault = server.faults.pop(0) if server.faults else None
+        if fault == 429:
+            return self._reply(429, {'errors': [{'message': 'rate limited'}]}, {'Retry-After': '0.05'})
+        if fault:
+            return self._reply(fault, {'errors': [{'message': 'unavailable'}]})
+        emails = [p['to'][0]['email'] for p in body['personalizations']]
+        bad = [i for i, e in enumerate(emails) if '@' not in e]
+        if bad:
+            return self._reply(400, {'errors': [
+                {'field': f'personalizations.{i}.to.0.email', 'message': 'Invalid email'} for i in bad]})
+        with server.lock:
+            server.accepted.extend(emails)
+        self._reply(202, None)
+
+    def _reply(self, status, obj, headers=None):
+        data = b'' if obj is None else json.dumps(obj).encode('utf-8')
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--recipients', type=int, default=2000, help='recipients per send')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds per fake API call')
+    args = parser.parse_args()
+
+    server = FakeSendGrid(args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ['SENDGRID_API_BASE'] = f'http://127.0.0.1:{server.server_port}'
+    os.environ['SENDGRID_API_KEY'] = API_KEY
+
+    import app
+    from backend.integrations.sendgrid_delivery import SendGridDelivery
+
+    client = app.app.test_client()
+    recipients = [f'reader{i}@brite.co' for i in range(args.recipients)]
+
+    def send(rcpts):
+        start = time.perf_counter()
+        body = client.post('/api/send-newsletter',
+                           json={'recipients': rcpts, 'subject': 'Bench', 'html': '<p>hi</p>'}).get_json()
+        return body, time.perf_counter() - start
+
+    batched = app.newsletter_delivery
+    batched.backoff = 0.05
+    app.newsletter_delivery = SendGridDelivery(api_base=os.environ['SENDGRID_API_BASE'],
+                                               batch_size=1, max_workers=1, log=lambda *a: None)
+    try:
+        server.reset()
+        body, before = send(recipients)
+        before_calls = server.calls
+        assert body['sent_count'] == len(recipients), body
+    finally:
+        app.newsletter_delivery = batched
+
+    server.reset(faults=[429, 503])
+    body, after = send(recipients + ['not-an-email'])
+    assert sorted(server.accepted) == sorted(recipients), 'a valid recipient was lost or sent twice'
+    assert body['sent_count'] == len(recipients), body
+    assert len(body['errors'] or []) == 1 and 'not-an-email' in body['errors'][0], body['errors']
+
+    print(f"POST /api/send-newsletter, {len(recipients):,} recipients, {args.latency * 1000:.0f} ms per API call")
+    print(f"  before  one call per recipient : {before:>7.2f} s  {before_calls:>6,} API calls")
+    print(f"  after   batched + concurrent   : {after:>7.2f} s  {server.calls:>6,} API calls"
+          f"  ({before / after:.0f}x; with a 429, a 503 and one bad address injected)")
+    print("  every valid recipient accepted exactly once; only the bad address reported failed")
+    os._exit(0)   # daemon pools
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Startup benchmark: import app -> first response, in a fresh process.
+
+A Cloud Run cold start runs `import app` in a new worker and then answers
+the request that woke it. Each run here starts a new Python process that:
+
+  1. imports app (timed from before the import),
+  2. answers GET /health through the Flask test client (the first response).
+
+Two modes, each run --runs times, median reported:
+
+  lazy   the app as shipped: no cloud client is built during import
+  eager  the old startup work, done after the import and before the first
+         response: build the Claude, GCS and Firestore clients, run the
+         bootstrap (media bucket IAM check + employee seed), and import
+         anthropic, sendgrid, PIL, bs4/lxml and magic
+
+Without credentials, eager's client constructors fail. They fail only after
+probing for credentials (on a laptop, the GCE metadata server), and that
+probing is part of what a cold start paid. The timings here include it.
+Both modes keep the sandbox's DEV_AUTH_MODE and environment.
+
+Usage (from the repo root):
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = r'''
+import json, os, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+if sys.argv[1] == 'eager':
+    import importlib
+    for client in (app.claude_client, app.gcs_client, app.firestore_client):
+        client.get()
+    app.run_bootstrap()
+    for module in ('anthropic', 'sendgrid', 'PIL.Image', 'bs4', 'lxml.etree', 'magic'):
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+response = app.app.test_client().get('/health')
+assert response.status_code == 200
+done = time.perf_counter()
+sys.stdout.write('\n' + json.dumps({'import': imported - start, 'first': done - start}) + '\n')
+sys.stdout.flush()
+os._exit(0)   # don't wait on pool / listener threads
+'''
+
+
+def _run(mode):
+    env = dict(os.environ)
+    env.setdefault('DEV_AUTH_MODE', 'true')   # skip OAuth for the test client
+    out = subprocess.run([sys.executable, '-c', _CHILD, mode], cwd=ROOT, env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                         text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes per mode')
+    args = parser.parse_args()
+
+    _run('lazy')   # warm the OS file cache and the .pyc files
+    results = {}
+    for mode in ('eager', 'lazy'):
+        runs = [_run(mode) for _ in range(args.runs)]
+        results[mode] = {key: statistics.median(r[key] for r in runs) for key in ('import', 'first')}
+
+    eager, lazy = results['eager'], results['lazy']
+    print(f"import app -> first response (GET /health), median of {args.runs} fresh processes")
+    print(f"  eager (old startup)  : first response {eager['first'] * 1000:>8,.0f} ms"
+          f"  (import {eager['import'] * 1000:,.0f} ms + client setup and heavy imports)")
+    print(f"  lazy                 : first response {lazy['first'] * 1000:>8,.0f} ms"
+          f"  (import {lazy['import'] * 1000:,.0f} ms; {eager['first'] / lazy['first']:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
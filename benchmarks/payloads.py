@@ -0,0 +1,111 @@
+"""Realistic request payloads shared by the benchmarks in this directory."""
+
+PHOTO = 'https://storage.googleapis.com/brite-side-media/media/2026-10/{}.jpg'
+
+
+def full_issue(month='October', month_num=10, year=2026):
+    """A full /api/render-email body: 5 updates, 3 spotlights, 20 birthdays,
+    anniversaries, a game and shout-outs."""
+    birthdays = [
+        {
+            'name': f'Employee Number{i}',
+            'email': f'employee.number{i}@brite.co',
+            'department': 'Underwriting' if i % 2 else 'Marketing',
+            'birthday_day': (i % 28) + 1,
+            'month_num': month_num if i < 16 else month_num % 12 + 1,
+            'image_url': PHOTO.format(f'bday{i}') if i % 3 else '',
+        }
+        for i in range(20)
+    ]
+    spotlights = [
+        {
+            'name': f'Spotlight Person{i}',
+            'title': 'Senior Underwriter',
+            'blurb': 'Keeps every policy sparkling and every claim on track. ' * 3,
+            'fun_facts': 'Has visited 30 countries & owns 4 cats <3',
+            'image_url': PHOTO.format(f'spot{i}'),
+            'qa': [{'q': f'Question {n}?', 'a': f'Answer {n} with some detail.'} for n in range(3)],
+        }
+        for i in range(3)
+    ]
+    updates = [
+        {
+            'title': f'Company update {i}',
+            'body': 'We shipped a thing.\nIt was great & everyone helped.\n' * 4,
+            'from': f'Author {i}',
+            'photos': [PHOTO.format(f'upd{i}-{p}') for p in range(i % 4)],
+            'photo_positions': [40, 50, 60],
+        }
+        for i in range(5)
+    ]
+    return {
+        'month': month,
+        'month_num': month_num,
+        'year': year,
+        'template': 'briteside-email.html',
+        'joke': 'Why did the diamond go to school?|To get a little more brilliant.',
+        'birthdays': birthdays,
+        'birthday_headings': {'primary': '', 'secondary': ''},
+        'anniversaries': [
+            {'name': f'Veteran {i}', 'department': 'Claims', 'years': i + 1,
+             'anniversary_day': i + 3, 'anniversary_month': month_num, 'image_url': ''}
+            for i in range(4)
+        ],
+        'anniversaries_enabled': True,
+        'spotlight': spotlights[0],
+        'spotlights': spotlights,
+        'updates': updates,
+        'updates_enabled': True,
+        'shoutouts': [{'text': f'Huge thanks to team {i} for the launch!', 'from': f'Fan {i}'}
+                      for i in range(6)],
+        'shoutouts_enabled': True,
+        'special_section': {'title': 'Open enrollment', 'body': 'Pick your plans by Friday.'},
+        'welcome_hires': [{'name': 'New Hire', 'role': 'Engineer', 'fun_fact': 'Juggles'}],
+        'welcome_enabled': True,
+        'game': {
+            'content': '<strong>1.</strong> What is the hardest gem?<br><strong>2.</strong> Birthstone for May?',
+            'image_url': PHOTO.format('game'),
+            'previous_answer': 'Diamond',
+        },
+        'media': {
+            'enabled': True, 'type': 'news', 'header': 'In the news', 'intro_text': 'Read this',
+            'og': {'title': 'BriteCo in the press', 'description': 'A great article. ' * 10,
+                   'site_name': 'News Site', 'image': PHOTO.format('og'),
+                   'url': 'https://example.com/article'},
+        },
+    }
+
+
+def feed_page(n=50):
+    """A GET /api/feed/posts body with `n` posts, shaped like list_posts'."""
+    categories = ('shoutout', 'team_update', 'culture', 'general')
+    posts = []
+    for i in range(n):
+        rich = i % 3 == 0
+        posts.append({
+            'id': f'post{i:04d}abcdefghij',
+            'author_email': f'employee.number{i % 17}@brite.co',
+            'author_name': f'Employee Number{i % 17}',
+            'kind': 'rich' if rich else 'quick',
+            'title': f'Post title {i}' if rich else '',
+            'body': ('Huge thanks to the claims team for turning around the backlog this week! '
+                     'Coffee is on me.') * (1 + i % 3),
+            'media': [PHOTO.format(f'feed{i}-{p}') for p in range(i % 4)] if rich else [],
+            'link_card': {'url': 'https://example.com/article', 'title': 'BriteCo in the press',
+                          'description': 'A great article. ' * 5, 'image': PHOTO.format('og')}
+            if i % 7 == 0 else None,
+            'category': categories[i % len(categories)],
+            'reactions': {'👏': [f'employee.number{r}@brite.co' for r in range(i % 5)]},
+            'comment_count': i % 6,
+            'queue_ref': {'collection': 'shoutouts', 'id': f'q{i}'} if i % 4 == 0 else None,
+            'auto_key': None,
+            'created_at': f'2026-10-{1 + i % 28:02d}T{i % 24:02d}:15:00+00:00',
+            'updated_at': f'2026-10-{1 + i % 28:02d}T{i % 24:02d}:15:00+00:00',
+            'used_in_issue': i % 8 == 0,
+        })
+    return {
+        'success': True,
+        'posts': posts,
+        'has_more': True,
+        'viewer': {'email': 'editor@brite.co', 'is_editor': True},
+    }